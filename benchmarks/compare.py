@@ -0,0 +1,59 @@
+"""
+Compare benchmark results (see `run.py`) across commits.
+
+Usage:
+    python benchmarks/compare.py benchmarks/results/essays-1k-<old>.json benchmarks/results/essays-1k-<new>.json
+
+The first file is the baseline: each stage (and tagging rule) is listed with its time in every file and the speedup of
+the last file over the baseline.
+"""
+
+# Standard Library
+import sys
+import json
+import argparse
+from typing import List
+
+
+def _speedup(old: float, new: float) -> str:
+    return f"{old / new:.2f}x" if old and new else "-"
+
+
+def compare(results: List[dict]) -> str:
+    """
+    Return a table comparing benchmark results (the first one being the baseline).
+    """
+    names = [(x["environment"].get("commit") or "unknown")[:10] + ("+" if x["environment"].get("dirty") else "") for x in results]
+    lines = [f"{'corpus':<26}" + "".join(f"{x['benchmark']['corpus']:>14}" for x in results)]
+    lines.append(f"{'commit':<26}" + "".join(f"{x:>14}" for x in names) + f"{'speedup':>10}")
+
+    def section(title, key):
+        lines.append(title)
+        seen = list(dict.fromkeys(name for x in results for name in x.get(key, {})))
+        for name in seen:
+            values = [x.get(key, {}).get(name, {}).get("seconds") for x in results]
+            cells = "".join(f"{x:>12.4f} s" if x is not None else f"{'-':>14}" for x in values)
+            lines.append(f"  {name:<24}{cells}{_speedup(values[0], values[-1]):>10}")
+
+    section("stages", "stages")
+    section("rules", "rules")
+    rss = [x.get("peak_rss_mb") for x in results]
+    lines.append(f"{'peak RSS (MB)':<26}" + "".join(f"{x if x is not None else '-':>14}" for x in rss))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare TAASSC benchmark results.")
+    parser.add_argument("results", nargs="+", help="results JSON files (the first one is the baseline)")
+    args = parser.parse_args()
+    results = []
+    for filename in args.results:
+        with open(filename) as inf:
+            results.append(json.load(inf))
+    if len({(x["benchmark"]["n_docs"], x["benchmark"]["n_chars"], x["benchmark"]["seed"]) for x in results}) > 1:
+        sys.stderr.write("Warning: the results are not from the same corpus.\n")
+    print(compare(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Synthetic scaled corpora for the benchmarks.
+
+Documents are built from the sentences of the sample texts (`data/test_files`), drawn at random (with a fixed seed)
+until each document reaches its target length, and split into paragraphs. The vocabulary is that of the sample texts,
+so the corpora exercise the tagging rules as learner essays do, at any number of documents and document lengths.
+"""
+
+# Standard Library
+import os
+import re
+import glob
+import json
+import random
+from typing import List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DIR = os.path.join(ROOT_DIR, "data", "test_files")
+
+# Named corpus sizes, as (number of documents, characters per document)
+PRESETS = {
+    "smoke": (50, 2000),
+    "essays-1k": (1000, 2000),
+    "essays-10k": (10000, 2000),
+    "essays-100k": (100000, 2000),
+    "reports": (20, 100000),
+    "reports-1m": (5, 1000000),
+}
+
+# Sentences per paragraph
+PARAGRAPH_SENTENCES = 8
+
+
+def sample_sentences(directory: str = SAMPLE_DIR) -> List[str]:
+    """
+    Return the sentences of the sample texts.
+    """
+    sentences = []
+    for filename in sorted(glob.glob(os.path.join(directory, "*.txt"))):
+        with open(filename, encoding="utf-8") as inf:
+            text = " ".join(inf.read().split())
+        sentences += [x for x in re.split(r"(?<=[.!?])\s+", text) if x]
+    return sentences
+
+
+def make_document(
+        sentences: List[str],
+        n_chars: int,
+        rng: random.Random
+    ) -> str:
+    """
+    Return a document of about `n_chars` characters made of random sentences.
+    """
+    paragraphs = []
+    paragraph = []
+    length = 0
+    while length < n_chars:
+        sentence = rng.choice(sentences)
+        paragraph.append(sentence)
+        length += len(sentence) + 1
+        if len(paragraph) == PARAGRAPH_SENTENCES:
+            paragraphs.append(" ".join(paragraph))
+            paragraph = []
+    if paragraph:
+        paragraphs.append(" ".join(paragraph))
+    return "\n".join(paragraphs)
+
+
+def make_corpus(
+        directory: str,
+        n_docs: int,
+        n_chars: int,
+        seed: int = 0
+    ) -> List[str]:
+    """
+    Write a synthetic corpus to a folder (unless it is already there) and return its files.\n
+    ---
+    ### Args
+    - `directory` (`str`): the corpus folder.
+    - `n_docs` (`int`): the number of documents.
+    - `n_chars` (`int`): the length of each document (in characters).
+    - `seed` (`int`): the random seed.\n
+    ---
+    ### Returns
+    - `List[str]`: the document files.
+    """
+    spec = {"n_docs": n_docs, "n_chars": n_chars, "seed": seed}
+    spec_path = os.path.join(directory, "corpus.json")
+    filenames = [os.path.join(directory, f"{i:06d}.txt") for i in range(n_docs)]
+    if os.path.exists(spec_path):
+        with open(spec_path) as inf:
+            if json.load(inf) == spec and all(os.path.exists(x) for x in filenames):
+                return filenames
+
+    os.makedirs(directory, exist_ok=True)
+    sentences = sample_sentences()
+    rng = random.Random(seed)
+    for filename in filenames:
+        with open(filename, "w", encoding="utf-8") as outf:
+            outf.write(make_document(sentences, n_chars, rng))
+    with open(spec_path, "w") as outf:
+        json.dump(spec, outf)
+    return filenames
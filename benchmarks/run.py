@@ -0,0 +1,352 @@
+"""
+Benchmark suite: per-stage timings of the analysis pipeline on synthetic scaled corpora (see `corpus.py`).
+
+Stages:
+- `import`, `load_resources`: importing the package and loading the word lists (in a fresh interpreter).
+- `model_load`: loading the spaCy model.
+- `prepare`: reading, cleaning and splitting the texts into chunks.
+- `parse`: parsing the chunks with `nlp.pipe`.
+- `tables`: building the token tables of the parsed chunks (`DocTables`).
+- `tagging`: applying the tagging rules and counting the features (`_count_tables`), as `LGR_Analysis` does.
+- `mattr`: the moving-average type-token ratio of each document.
+- `indices`: finishing the indices of each document (`_analyze_counts`, MATTR included).
+- `output_xml`, `output_vertical`: writing the tagged texts.
+- `calcFromXml`, `rescore`: reading the `xml` outputs back (tag counts only, and all the indices with `LGR_Rescore`).
+
+The time of each tagging rule is also measured on the first `--rule-docs` chunks, with the rule timing of the
+profiler (see `taassc.profiling`, the rule times include some timer overhead). Each stage reports its time, documents per second and tokens
+per second; the run also reports its peak resident memory. Results are written as JSON (to `benchmarks/results` by
+default, named after the corpus and commit), to be compared across commits with `compare.py`.
+
+Usage:
+    python benchmarks/run.py --preset essays-1k --model en_core_web_sm
+    python benchmarks/run.py --docs 200 --chars 50000 --output bench.json
+"""
+
+# Standard Library
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+# Benchmark the checkout rather than an installed copy
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+# Local Modules
+import corpus
+import taassc as lgr
+from taassc import profiling
+from taassc import taassc as lgr_module
+
+logger = logging.getLogger('TAASSC')
+
+# Number of fresh interpreters timed for the import stages (the fastest is kept)
+IMPORT_RUNS = 3
+
+_IMPORT_CODE = """
+import time, json
+t0 = time.perf_counter()
+import taassc
+t1 = time.perf_counter()
+taassc.load_resources()
+t2 = time.perf_counter()
+print(json.dumps([t1 - t0, t2 - t1]))
+"""
+
+
+class Stages:
+    """
+    Accumulated time, documents and tokens of each stage.
+    """
+    def __init__(self) -> None:
+        self.totals = {}
+
+    def add(
+            self,
+            name: str,
+            seconds: float,
+            docs: int = 0,
+            tokens: int = 0
+        ) -> None:
+        total = self.totals.setdefault(name, [0.0, 0, 0])
+        total[0] += seconds
+        total[1] += docs
+        total[2] += tokens
+
+    def report(self) -> Dict[str, dict]:
+        report = {}
+        for name, (seconds, docs, tokens) in self.totals.items():
+            report[name] = {"seconds": round(seconds, 6)}
+            if docs:
+                report[name]["docs"] = docs
+                report[name]["docs_per_sec"] = round(docs / seconds, 3) if seconds else None
+            if tokens:
+                report[name]["tokens"] = tokens
+                report[name]["tokens_per_sec"] = round(tokens / seconds, 1) if seconds else None
+        return report
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Return the peak resident memory of the process (in MB), if available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def measure_import(stages: Stages) -> None:
+    """
+    Time importing the package and loading the word lists in fresh interpreters.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])))
+    runs = []
+    for _ in range(IMPORT_RUNS):
+        result = subprocess.run([sys.executable, "-c", _IMPORT_CODE], env=env, capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    stages.add("import", min(x[0] for x in runs))
+    stages.add("load_resources", min(x[1] for x in runs))
+
+
+def time_rules(tables_list: List[lgr.DocTables]) -> Dict[str, dict]:
+    """
+    Time each tagging rule (and the bulk complexity counts) on a list of token tables.
+    """
+    indices = lgr.load_resources()["index_list"]
+    with profiling.profile(profiling.Profiler(rules=True)) as profiler:
+        for tables in tables_list:
+            lgr_module._count_tables(tables, indices, lgr.tag_categories, True)
+    report = profiler.report()
+
+    totals = {name: (x["seconds"], x["calls"]) for name, x in report["rules"].items()}
+    if "complexity" in report["stages"]:
+        totals["complexity_counts"] = (report["stages"]["complexity"]["seconds"], report["stages"]["complexity"]["calls"])
+    total = sum(seconds for seconds, _ in totals.values()) or 1.0
+    return {
+        name: {"seconds": round(seconds, 6), "calls": calls, "share": round(seconds / total, 4)}
+        for name, (seconds, calls) in sorted(totals.items(), key=lambda x: -x[1][0])
+    }
+
+
+def run_benchmark(
+        filenames: List[str],
+        workdir: str,
+        model: str,
+        batch_size: Optional[int],
+        chunk_chars: int,
+        rule_docs: int
+    ) -> dict:
+    """
+    Run all the stages on a corpus and return the report.\n
+    ---
+    ### Args
+    - `filenames` (`List[str]`): the corpus files.
+    - `workdir` (`str`): the folder of the `xml` and `vertical` outputs.
+    - `model` (`str`): the spaCy model (see `load_model`).
+    - `batch_size` (`int`): the number of chunks parsed per batch (defaults to the model setting).
+    - `chunk_chars` (`int`): the maximum length of the parsed chunks (see `split_text`).
+    - `rule_docs` (`int`): the number of chunks on which each tagging rule is timed.\n
+    ---
+    ### Returns
+    - `dict`: the stage timings, corpus totals, rule timings and peak memory.
+    """
+    stages = Stages()
+    measure_import(stages)
+    indices = lgr.load_resources()["index_list"]
+
+    start = time.perf_counter()
+    nlp = lgr.load_model(model)
+    stages.add("model_load", time.perf_counter() - start)
+    rss_after_model = peak_rss_mb()
+
+    for kind in ("xml", "vertical"):
+        os.makedirs(os.path.join(workdir, kind), exist_ok=True)
+
+    prepare_time = [0.0]
+    def chunks():
+        for filename in filenames:
+            start = time.perf_counter()
+            with open(filename, encoding="utf-8", errors="ignore") as inf:
+                text = lgr.clean_text(inf.read())
+            pieces = lgr.split_text(text, chunk_chars)
+            prepare_time[0] += time.perf_counter() - start
+            for i, piece in enumerate(pieces, 1):
+                yield piece, (filename, len(text), i == len(pieces))
+
+    totals = {"docs": 0, "chunks": 0, "tokens": 0, "words": 0, "chars": 0}
+    rule_tables = []
+    xml_files = []
+    parts = []
+    doc_tokens = 0
+    documents = nlp.pipe(chunks(), batch_size=batch_size, as_tuples=True)
+    while True:
+        start = time.perf_counter()
+        prepared = prepare_time[0]
+        try:
+            document, (filename, n_chars, last) = next(documents)
+        except StopIteration:
+            break
+        # The texts are read and split as the pipe pulls them
+        stages.add("parse", time.perf_counter() - start - (prepare_time[0] - prepared), tokens=len(document))
+        totals["chunks"] += 1
+        doc_tokens += len(document)
+
+        start = time.perf_counter()
+        tables = lgr.DocTables(document)
+        stages.add("tables", time.perf_counter() - start, tokens=len(document))
+        if len(rule_tables) < rule_docs:
+            rule_tables.append(tables)
+
+        start = time.perf_counter()
+        parts.append(lgr_module._count_tables(tables, indices, lgr.tag_categories, True))
+        stages.add("tagging", time.perf_counter() - start, tokens=len(document))
+        if not last:
+            continue
+
+        lemma_text = [x for part in parts for x in part["lemma_text"]]
+        start = time.perf_counter()
+        lgr.mattr(lemma_text)
+        stages.add("mattr", time.perf_counter() - start, 1, len(lemma_text))
+
+        start = time.perf_counter()
+        result = lgr_module._analyze_counts(parts, True)
+        stages.add("indices", time.perf_counter() - start, 1, doc_tokens)
+
+        name = os.path.splitext(os.path.basename(filename))[0]
+        xml_file = os.path.join(workdir, "xml", name + ".xml")
+        start = time.perf_counter()
+        lgr.output_xml(result["tagged_text"], xml_file)
+        stages.add("output_xml", time.perf_counter() - start, 1, doc_tokens)
+        start = time.perf_counter()
+        lgr.output_vertical(result["tagged_text"], os.path.join(workdir, "vertical", name + ".tsv"), ordered_output="full")
+        stages.add("output_vertical", time.perf_counter() - start, 1, doc_tokens)
+        xml_files.append((xml_file, doc_tokens))
+
+        totals["docs"] += 1
+        totals["tokens"] += doc_tokens
+        totals["words"] += result["nwords"]
+        totals["chars"] += n_chars
+        parts = []
+        doc_tokens = 0
+
+    stages.add("prepare", prepare_time[0], totals["docs"])
+    # Per-document stages count the documents, and the parse stages the chunks
+    for name in ("parse", "tables", "tagging"):
+        stages.add(name, 0.0, totals["docs"])
+
+    for xml_file, tokens in xml_files:
+        start = time.perf_counter()
+        lgr.calcFromXml(xml_file, indices)
+        stages.add("calcFromXml", time.perf_counter() - start, 1, tokens)
+        start = time.perf_counter()
+        lgr.LGR_Rescore(xml_file, indices)
+        stages.add("rescore", time.perf_counter() - start, 1, tokens)
+
+    return {
+        "corpus": totals,
+        "stages": stages.report(),
+        "rules": time_rules(rule_tables),
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_rss_mb_after_model": rss_after_model,
+    }
+
+
+def environment(model: str) -> dict:
+    """
+    Return the environment of a run: commit, versions and machine.
+    """
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    import spacy
+
+    nlp = lgr.load_model(model)
+    with open(os.path.join(ROOT_DIR, "VERSION")) as inf:
+        version = inf.read().strip()
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "taassc": version,
+        "python": platform.python_version(),
+        "spacy": spacy.__version__,
+        "model": f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}",
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the TAASSC analysis pipeline on a synthetic corpus.")
+    parser.add_argument("--preset", choices=sorted(corpus.PRESETS), default="smoke", help="named corpus size")
+    parser.add_argument("--docs", type=int, help="number of documents (overrides the preset)")
+    parser.add_argument("--chars", type=int, help="characters per document (overrides the preset)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "taassc-bench"), help="folder of the generated corpora")
+    parser.add_argument("-m", "--model", default=lgr.DEFAULT_MODEL, help="spaCy model")
+    parser.add_argument("-b", "--batch-size", type=int, help="chunks parsed per batch")
+    parser.add_argument("--chunk-chars", type=int, default=lgr.DEFAULT_CHUNK_CHARS, help="maximum length of the parsed chunks")
+    parser.add_argument("--rule-docs", type=int, default=200, help="chunks on which each tagging rule is timed")
+    parser.add_argument("-o", "--output", help="results JSON file (default: benchmarks/results/<corpus>-<commit>.json)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='[%(asctime)s][%(name)s][%(levelname)s] %(message)s')
+
+    n_docs, n_chars = corpus.PRESETS[args.preset]
+    n_docs = args.docs or n_docs
+    n_chars = args.chars or n_chars
+    name = args.preset if args.docs is None and args.chars is None else f"{n_docs}x{n_chars}"
+    filenames = corpus.make_corpus(os.path.join(args.corpus_dir, f"corpus-{n_docs}x{n_chars}-{args.seed}"), n_docs, n_chars, args.seed)
+
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    workdir = tempfile.mkdtemp(prefix="taassc-bench-out-")
+    try:
+        report = run_benchmark(filenames, workdir, args.model, args.batch_size, args.chunk_chars, args.rule_docs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    env = environment(args.model)
+    results = {
+        "benchmark": {
+            "corpus": name, "n_docs": n_docs, "n_chars": n_chars, "seed": args.seed, "model": args.model,
+            "batch_size": args.batch_size, "chunk_chars": args.chunk_chars, "rule_docs": args.rule_docs,
+        },
+        "environment": env,
+        "started": started.isoformat(timespec="seconds"),
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        **report,
+    }
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"{name}-{(env['commit'] or 'unknown')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as outf:
+        json.dump(results, outf, indent=2)
+        outf.write("\n")
+
+    print(f"{name}: {results['corpus']['docs']} docs, {results['corpus']['tokens']} tokens, peak RSS {results['peak_rss_mb']} MB")
+    for stage, timing in results["stages"].items():
+        rates = " ".join(f"{timing[x]:>12} {x.replace('_per_sec', '/s')}" for x in ("docs_per_sec", "tokens_per_sec") if timing.get(x))
+        print(f"  {stage:<16} {timing['seconds']:>10.3f} s {rates}")
+    print(f"Results written to '{output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -73,9 +73,10 @@ def full_data_analysis(folder, output_base_dir):
 
 # Main function to run all analyses
 def main():
-    # Specify the input and output directories here
-    DATA_DIR = "data/test_files"
-    OUTPUT_DIR = "data/output"
+    # Specify the input and output directories here (relative to the repository root)
+    ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    DATA_DIR = os.path.join(ROOT_DIR, "data", "test_files")
+    OUTPUT_DIR = os.path.join(ROOT_DIR, "data", "output")
 
     sample_output_dir = os.path.join(OUTPUT_DIR, "sample_data")
     full_output_dir = os.path.join(OUTPUT_DIR, "full_data")
@@ -1,5 +1,8 @@
 # Standard Library
+import os
+import importlib.util
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 
 
 def read_file(filename):
@@ -11,6 +14,15 @@ def load_requirements(filename:str='requirements.txt') -> None:
     with open(filename, 'r') as file:
         return [line.strip() for line in file if line and not line.startswith("#")]
 
+# Ship the compiled word lists as a package resource
+class BuildPyWithLexicon(build_py):
+    def run(self):
+        super().run()
+        spec = importlib.util.spec_from_file_location('_taassc_lexicon', os.path.join('src', 'taassc', 'lexicon.py'))
+        lexicon = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(lexicon)
+        lexicon.build_bundle('data', os.path.join(self.build_lib, 'taassc', 'lexicon.pickle'))
+
 version = read_file('VERSION')
 license_text = read_file('LICENSE')
 long_description = read_file('README.md')
@@ -28,12 +40,16 @@ setup(
     packages = find_packages(where='src', include=['taassc']),
     package_dir = {'': 'src'},
     install_requires = requirements,
+    extras_require = {'zstd': ['zstandard'], 'parquet': ['pyarrow']},
+    entry_points = {'console_scripts': ['taassc = taassc.cli:main']},
     classifiers = [
         'Operating System :: OS Independent',
         'Programming Language :: Python :: 3.10'
     ],
     python_requires = '>=3.10',
     include_package_data = True,
+    package_data = {'taassc': ['lexicon.pickle']},
+    cmdclass = {'build_py': BuildPyWithLexicon},
     zip_safe = False,
     license = license_text,
     data_files = [('', ['README.md', 'LICENSE', 'VERSION'])],
@@ -4,6 +4,17 @@ Copyright © 2024- Coherency S.r.l
 
 # Local Modules
 from .taassc import *
+from .cache import ParseCache
+from .manifest import RunManifest
+from .tagged import TaggedText
+from .tagindex import TagIndex
+from .profiling import Profiler
+from . import taassc as _taassc
+
+
+def __getattr__(name: str):
+    # Lazily loaded resources (e.g. `nlp`, `noun_dict`, `index_list`)
+    return getattr(_taassc, name)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,218 @@
+"""
+On-disk cache of spaCy parses, keyed by the hash of the cleaned text.
+
+Each parsed document is stored as a single-document `DocBin` file under a folder identifying the model
+(language, name, version and pipeline components), so that re-tagging a corpus after changing a word list or a rule
+does not require parsing it again. The cache is bounded in size: the least recently used documents are evicted first.
+A parse that cannot be stored (e.g. on a full disk) is logged and skipped: the cache never fails an analysis.
+"""
+
+# Standard Library
+import os
+import hashlib
+import logging
+import tempfile
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger('TAASSC')
+
+DEFAULT_CACHE_SIZE = 5 * 1024 ** 3
+# Age after which a temporary file is considered left over by an interrupted write (in seconds)
+STALE_TMP_SECONDS = 3600
+
+
+class ParseCache:
+    """
+    On-disk cache of spaCy parses.\n
+    ---
+    ### Args
+    - `directory` (`str`): the cache folder.
+    - `max_bytes` (`int`): the maximum size of the cache (`None` for no limit).
+    """
+    def __init__(
+            self,
+            directory: str,
+            max_bytes: Optional[int] = DEFAULT_CACHE_SIZE
+        ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._model_keys = {}
+
+    def __getstate__(self) -> dict:
+        # Sent to worker processes: the size estimate and model keys are rebuilt there
+        return {"directory": self.directory, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def model_key(self, nlp) -> str:
+        """
+        Return the folder name identifying a pipeline (language, name, version and components).
+        """
+        key = self._model_keys.get(id(nlp))
+        if key is None:
+            meta = nlp.meta
+            components = hashlib.sha1(",".join(nlp.pipe_names).encode("utf-8")).hexdigest()[:8]
+            key = f"{meta.get('lang', 'xx')}_{meta.get('name', 'model')}-{meta.get('version', '0')}-{components}"
+            self._model_keys[id(nlp)] = key
+        return key
+
+    def path(
+            self,
+            text: str,
+            nlp
+        ) -> str:
+        """
+        Return the cache file of a (cleaned) text parsed by a pipeline.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, self.model_key(nlp), digest[:2], digest + ".spacy")
+
+    def get(
+            self,
+            text: str,
+            nlp
+        ) -> Any:
+        """
+        Return the cached parse of a (cleaned) text, or `None`.
+        """
+        from spacy.tokens import DocBin
+
+        path = self.path(text, nlp)
+        try:
+            with open(path, "rb") as inf:
+                data = inf.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            document = next(DocBin().from_bytes(data).get_docs(nlp.vocab))
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache file '%s': %s", path, e)
+            self.misses += 1
+            return None
+        if document.text != text:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return document
+
+    def put(
+            self,
+            text: str,
+            document,
+            nlp
+        ) -> None:
+        """
+        Store the parse of a (cleaned) text, evicting old entries if the cache is full.\n
+        Write errors are logged and the parse is not stored.
+        """
+        from spacy.tokens import DocBin
+
+        path = self.path(text, nlp)
+        doc_bin = DocBin(store_user_data=False)
+        doc_bin.add(document)
+        data = doc_bin.to_bytes()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        except OSError as e:
+            logger.warning("Could not write cache file '%s': %s", path, e)
+            return
+        try:
+            with os.fdopen(fd, "wb") as outf:
+                outf.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            _remove(tmp_path)
+            logger.warning("Could not write cache file '%s': %s", path, e)
+            return
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+        if self.max_bytes is not None:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self.evict()
+
+    def _entries(self) -> list:
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".spacy"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        """
+        Return the total size of the cached parses (in bytes).
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """
+        Remove the least recently used parses until the cache is below `target_bytes` (90% of `max_bytes` by default).\n
+        Temporary files left over by interrupted writes are removed too.\n
+        ---
+        ### Returns
+        - `int`: the number of removed parses.
+        """
+        target_bytes = int(self.max_bytes * 0.9) if target_bytes is None else target_bytes
+        self._remove_stale_tmp()
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, file_size, path in entries:
+            if size <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= file_size
+            removed += 1
+        self._size = size
+        logger.info(f"Evicted {removed} parses from cache '{self.directory}'.")
+        return removed
+
+    def _remove_stale_tmp(self) -> None:
+        # Recent temporary files may be writes in progress (e.g. in other worker processes)
+        cutoff = time.time() - STALE_TMP_SECONDS
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    if os.stat(path).st_mtime < cutoff:
+                        os.remove(path)
+                except OSError:
+                    continue
+
+    def clear(self) -> None:
+        """
+        Remove all the cached parses.
+        """
+        self.evict(0)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,289 @@
+"""
+Command-line interface (`taassc`, or `python -m taassc`).
+
+Subcommands:
+- `analyze`: analyze text files and write the results CSV (and `xml`/`vertical`/`table` outputs), see `LGR_Full`.
+- `rescore` (or `rescore-from-xml`): compute the results CSV from saved `xml`/`vertical` outputs, see `LGR_Rescore_Full`.
+- `tmle-xml`: analyze TMLE xml texts, see `LGR_XML`.
+- `serve`: serve analyses over HTTP, see `taassc.server`.
+
+Inputs are files, folders (whose files matching `--pattern` are used), glob patterns, or `@list` files holding one
+path per line. Results written to a `.parquet`, `.arrow` or `.feather` file are columnar (see `taassc.results`). A progress line with the documents and words per second is printed to stderr. With `--profile` and
+`--metrics`, the stage and rule timings are written as JSON and Prometheus text (see `taassc.profiling`).
+"""
+
+# Standard Library
+import os
+import sys
+import glob
+import time
+import logging
+import argparse
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger('TAASSC')
+
+# Seconds between two progress lines when stderr is not a terminal (e.g. in a nightly job log)
+LOG_PROGRESS_INTERVAL = 30.0
+
+
+def expand_inputs(
+        inputs: List[str],
+        pattern: str
+    ) -> List[str]:
+    """
+    Expand input arguments into a list of files.\n
+    ---
+    ### Args
+    - `inputs` (`List[str]`): files, folders, glob patterns or `@list` files (one path per line).
+    - `pattern` (`str`): the pattern of the files to use in folders.\n
+    ---
+    ### Returns
+    - `List[str]`: the files, in argument order (sorted within folders and patterns).
+    """
+    files = []
+    for item in inputs:
+        if item.startswith("@"):
+            with open(item[1:]) as inf:
+                files += [x.strip() for x in inf if x.strip()]
+        elif os.path.isdir(item):
+            files += sorted(glob.glob(os.path.join(item, pattern)))
+        elif any(x in item for x in "*?["):
+            files += sorted(glob.glob(item, recursive=True))
+        else:
+            files.append(item)
+    return files
+
+
+class ProgressLine:
+    """
+    Progress of a corpus run, printed as a single updated line on a terminal (or as periodic lines otherwise).\n
+    Used as the `progress` callback of `LGR_Full`, `LGR_Rescore_Full` and `LGR_XML`.\n
+    ---
+    ### Args
+    - `total` (`int`): the number of files.
+    - `words_column` (`int`): the CSV column holding the number of words (`nwords`), if any.
+    - `stream`: the output stream (stderr by default).
+    - `interval` (`float`): the minimum time between two updates (in seconds).
+    """
+    def __init__(
+            self,
+            total: int,
+            words_column: Optional[int] = None,
+            stream = None,
+            interval: Optional[float] = None
+        ) -> None:
+        self.total = total
+        self.words_column = words_column
+        self.stream = stream or sys.stderr
+        self.terminal = self.stream.isatty()
+        self.interval = interval if interval is not None else 0.2 if self.terminal else LOG_PROGRESS_INTERVAL
+        self.started = time.monotonic()
+        self.last = 0.0
+        self.docs = 0
+        self.words = 0
+        self.failed = 0
+
+    def __call__(
+            self,
+            filename: str,
+            row: Optional[List[str]],
+            error: Optional[str]
+        ) -> None:
+        self.docs += 1
+        self.failed += error is not None
+        if row is not None and self.words_column is not None:
+            try:
+                self.words += int(float(row[self.words_column]))
+            except (IndexError, ValueError):
+                pass
+        now = time.monotonic()
+        if now - self.last >= self.interval or self.docs == self.total:
+            self.last = now
+            self._print(now)
+
+    def line(self, now: Optional[float] = None) -> str:
+        """
+        Return the progress line.
+        """
+        elapsed = max((now or time.monotonic()) - self.started, 1e-9)
+        rate = self.docs / elapsed
+        eta = (self.total - self.docs) / rate if rate else 0
+        line = f"{self.docs}/{self.total} docs | {rate:.1f} docs/s"
+        if self.words_column is not None:
+            line += f" | {self.words / elapsed:.0f} words/s"
+        if self.failed:
+            line += f" | {self.failed} failed"
+        return line + f" | elapsed {_duration(elapsed)} | ETA {_duration(eta)}"
+
+    def _print(self, now: float) -> None:
+        if self.terminal:
+            self.stream.write("\r\033[K" + self.line(now))
+        else:
+            self.stream.write(self.line(now) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        """
+        End the progress line.
+        """
+        if self.terminal and self.docs:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def _duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def _run(
+        function,
+        filenames: List[str],
+        words_column: Optional[int],
+        options: argparse.Namespace,
+        *args,
+        **kwargs
+    ) -> int:
+    """
+    Run a corpus function with a progress line (and profiling), and return the exit status (1 if some files failed).
+    """
+    from . import profiling
+
+    if not filenames:
+        logger.error("No input files.")
+        return 1
+    progress = None if options.quiet else ProgressLine(len(filenames), words_column)
+    profiler = profiling.enable() if options.profile or options.metrics else None
+    if profiler is not None and options.jobs > 1:
+        logger.warning("Worker processes are not profiled: run with -j 1 for a full profile.")
+    try:
+        failed = function(filenames, *args, progress=progress, **kwargs)
+    finally:
+        if progress is not None:
+            progress.close()
+        if profiler is not None:
+            profiling.disable()
+            if options.profile:
+                profiler.write_json(options.profile)
+            if options.metrics:
+                with open(options.metrics, "w") as outf:
+                    outf.write(profiler.prometheus())
+    for filename, error in failed.items():
+        sys.stderr.write(f"Failed: {filename}: {error}\n")
+    return 1 if failed else 0
+
+
+def _analyze(args: argparse.Namespace) -> int:
+    from . import taassc
+    from .cache import ParseCache
+    from .manifest import RunManifest
+
+    indices = taassc.load_resources()["index_list"]
+    outdir = args.outdir or os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(outdir, exist_ok=True)
+    manifest = RunManifest(args.manifest) if args.manifest else None
+    try:
+        return _run(
+            taassc.LGR_Full, expand_inputs(args.inputs, args.pattern), 1 + indices.index("nwords"), args,
+            args.output, outdirname=outdir, output=args.formats, batch_size=args.batch_size, n_process=args.jobs,
+            model=args.model, cache=ParseCache(args.cache) if args.cache else None, vertical_extension=args.vertical_extension,
+            vertical_header=args.vertical_header, manifest=manifest, chunk_chars=args.chunk_chars
+        )
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+
+def _rescore(args: argparse.Namespace) -> int:
+    from . import taassc
+
+    indices = taassc.load_resources()["index_list"]
+    return _run(taassc.LGR_Rescore_Full, expand_inputs(args.inputs, args.pattern), 1 + indices.index("nwords"), args, args.output, n_process=args.jobs)
+
+
+def _tmle_xml(args: argparse.Namespace) -> int:
+    from . import taassc
+
+    indices = taassc.load_resources()["index_list"]
+    refined = [x for x in indices if x not in taassc.TMLE_IGNORED_INDICES]
+    return _run(
+        taassc.LGR_XML, expand_inputs(args.inputs, args.pattern), 6 + refined.index("nwords"), args,
+        args.output, indices, taassc.tag_categories, n_process=args.jobs, model=args.model
+    )
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from .cache import ParseCache
+    from .server import serve
+
+    serve(args.host, args.port, args.max_batch_size, args.max_wait, args.model, cache=ParseCache(args.cache) if args.cache else None, profile=args.profile)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Return the argument parser of the `taassc` command.
+    """
+    from .taassc import DEFAULT_MODEL, DEFAULT_CHUNK_CHARS
+    from .server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT
+
+    parser = argparse.ArgumentParser(prog="taassc", description="Tool for the Automatic Analysis of Syntactic Sophistication and Complexity.")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="log more (-v: info, -vv: debug)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def corpus_parser(name: str, help: str, pattern: str, aliases: Sequence[str] = ()) -> argparse.ArgumentParser:
+        subparser = subparsers.add_parser(name, help=help, description=help, aliases=list(aliases))
+        subparser.add_argument("inputs", nargs="+", help="files, folders, glob patterns or @list files (one path per line)")
+        subparser.add_argument("-o", "--output", required=True, help="the results file (CSV, or Parquet/Arrow IPC if it ends with .parquet, .arrow or .feather)")
+        subparser.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes")
+        subparser.add_argument("--pattern", default=pattern, help=f"files to use in input folders (default: {pattern})")
+        subparser.add_argument("-q", "--quiet", action="store_true", help="do not print the progress line")
+        subparser.add_argument("--profile", help="write the stage and rule timings to this JSON file")
+        subparser.add_argument("--metrics", help="write the stage and rule timings to this Prometheus text file")
+        return subparser
+
+    analyze = corpus_parser("analyze", "Analyze text files.", "*.txt")
+    analyze.add_argument("-f", "--formats", nargs="+", choices=["xml", "vertical", "table"], default=[], help="tagged outputs to write (table: Parquet token tables)")
+    analyze.add_argument("--outdir", help="folder of the tagged outputs (default: the folder of the results file)")
+    analyze.add_argument("-m", "--model", default=DEFAULT_MODEL, help="spaCy model (sm, md, lg, trf or a model name/path)")
+    analyze.add_argument("-b", "--batch-size", type=int, help="texts parsed per batch")
+    analyze.add_argument("--cache", help="parse cache folder")
+    analyze.add_argument("--manifest", help="run manifest file, to resume or update a previous run")
+    analyze.add_argument("--vertical-extension", default=".tsv", help="extension of the vertical outputs (e.g. .tsv.gz)")
+    analyze.add_argument("--vertical-header", action="store_true", help="start the vertical outputs with column names")
+    analyze.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS, help="maximum length of the parsed chunks of long texts")
+    analyze.set_defaults(run=_analyze)
+
+    rescore = corpus_parser("rescore", "Compute the results from saved xml or (full) vertical outputs, without spaCy.", "*.xml", ["rescore-from-xml"])
+    rescore.set_defaults(run=_rescore)
+
+    tmle_xml = corpus_parser("tmle-xml", "Analyze TMLE xml texts.", "*.xml")
+    tmle_xml.add_argument("-m", "--model", default=DEFAULT_MODEL, help="spaCy model (sm, md, lg, trf or a model name/path)")
+    tmle_xml.set_defaults(run=_tmle_xml)
+
+    serve = subparsers.add_parser("serve", help="Serve analyses over HTTP.", description="Serve analyses over HTTP.")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("-m", "--model", default=DEFAULT_MODEL, help="spaCy model (sm, md, lg, trf or a model name/path)")
+    serve.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE, help="maximum number of texts per batch")
+    serve.add_argument("--max-wait", type=float, default=DEFAULT_MAX_WAIT, help="maximum time to wait for more requests (in seconds)")
+    serve.add_argument("--cache", help="parse cache folder")
+    serve.add_argument("--profile", action="store_true", help="profile the analyses (served on /metrics and /profile)")
+    serve.set_defaults(run=_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the `taassc` command.
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=[logging.WARNING, logging.INFO, logging.DEBUG][min(args.verbose, 2)],
+        format='[%(asctime)s][%(name)s][%(levelname)s] %(message)s')
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
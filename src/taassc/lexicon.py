@@ -0,0 +1,233 @@
+"""
+Compiled word lists used by the tagging rules.
+
+The tab-separated lists in `data/lists_LGR` are compiled once into frozensets, lemma -> class maps and reversed-suffix
+tries, and cached as a versioned binary bundle next to this module. The bundle is rebuilt automatically when one of
+the source files changes, and is used on its own when the source files are not available (e.g. in an installed package).
+
+Run `python -m taassc.lexicon [data_path] [bundle_path]` to (re)build the bundle.
+"""
+
+# Standard Library
+import os
+import sys
+import pickle
+import hashlib
+import logging
+import tempfile
+from typing import Dict, List, Optional, Iterable
+
+logger = logging.getLogger('TAASSC')
+
+# Bump when the compiled structures change
+LEXICON_FORMAT_VERSION = 1
+
+BUNDLE_PATH = os.environ.get(
+    "TAASSC_LEXICON_BUNDLE",
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), "lexicon.pickle"))
+
+# Source files (in `lists_LGR`)
+SOURCE_FILES = {
+    "semantic_noun": "semantic_class_noun.txt",
+    "semantic_verb": "semantic_class_verb.txt",
+    "semantic_adj": "semantic_class_adj.txt",
+    "semantic_adv": "semantic_class_adverb_5-25-20.txt",
+    "nominal_stop": "nom_stop_list_edited.txt",
+    "index_list": "LGR_index_list_5-26-20.txt",
+}
+
+# Nominalization suffixes, by length
+NOMINAL_SUFFIXES = {
+    6: frozenset(["nesses"]),
+    5: frozenset(["ician", "ities", "ances", "ences", "ments", "tions", "ships", "esses", "ettes", "hoods"]),
+    4: frozenset(["ance", "ence", "ment", "ness", "tion", "ship", "ette", "hood", "cies", "ries", "ants", "ents", "doms", "ings", "ages", "fuls", "isms", "ists", "ites", "lets", "eses", "ates"]),
+    3: frozenset(["ant", "ent", "dom", "ing", "ity", "ure", "age", "ese", "ess", "ful", "ism", "ist", "ite", "let", "als", "ees", "ers", "ors", "ate"]),
+    2: frozenset(["al", "cy", "ee", "er", "or", "ry"]),
+}
+PROPER_SUFFIXES = {
+    4: frozenset(["ians"]),
+    3: frozenset(["ian", "ans"]),
+    2: frozenset(["an"]),
+}
+
+
+class SuffixTrie:
+    """
+    Trie of reversed suffixes.\n
+    ---
+    ### Args
+    - `suffixes` (`Iterable[str]`): the suffixes.
+    """
+    def __init__(self, suffixes: Iterable[str] = ()) -> None:
+        self.root = {}
+        for suffix in suffixes:
+            node = self.root
+            for char in reversed(suffix):
+                node = node.setdefault(char, {})
+            node[""] = True
+
+    def match(
+            self,
+            word: str,
+            length: int
+        ) -> bool:
+        """
+        Check whether `word` ends with one of the suffixes, the suffix being shorter than `length`.\n
+        ---
+        ### Args
+        - `word` (`str`): the (lowercased) word.
+        - `length` (`int`): the length of the original word.
+        """
+        node = self.root
+        depth = 0
+        for char in reversed(word):
+            node = node.get(char)
+            if node is None:
+                return False
+            depth += 1
+            if "" in node and length > depth:
+                return True
+        return False
+
+
+def suffix_trie(suffixes_by_length: Dict[int, frozenset]) -> SuffixTrie:
+    """
+    Build a `SuffixTrie` from a `{length: suffixes}` table.
+    """
+    for length, suffixes in suffixes_by_length.items():
+        assert all(len(x) == length for x in suffixes), f"Suffixes of length {length} expected"
+    return SuffixTrie(x for suffixes in suffixes_by_length.values() for x in suffixes)
+
+
+def class_map(words_list: List[str]) -> dict:
+    """
+    Map each word of tab-separated `class<TAB>word<TAB>word...` lines to its class.
+    """
+    return {y: l[0] for x in words_list for l in [x.split("\t")] for y in l[1:]}
+
+
+def _source_stats(data_path: str) -> Optional[dict]:
+    stats = {}
+    for filename in SOURCE_FILES.values():
+        try:
+            stat = os.stat(os.path.join(data_path, "lists_LGR", filename))
+        except OSError:
+            return None
+        stats[filename] = (stat.st_size, stat.st_mtime_ns)
+    return stats
+
+
+def compile_lexicon(data_path: str) -> dict:
+    """
+    Compile the word lists in `data_path/lists_LGR`.\n
+    ---
+    ### Args
+    - `data_path` (`str`): the data folder.\n
+    ---
+    ### Returns
+    - `dict`: the raw lists, the class maps (`noun_dict`, `verb_dict`, ...), `nominal_stop`, the suffix tries and `lexicon_version`.
+    """
+    digest = hashlib.sha256(str(LEXICON_FORMAT_VERSION).encode("utf-8"))
+    lexicon = {}
+    for name, filename in SOURCE_FILES.items():
+        with open(os.path.join(data_path, "lists_LGR", filename), "rb") as inf:
+            data = inf.read()
+        digest.update(data)
+        lexicon[name] = data.decode("utf-8").split("\n")
+
+    semantic_verb = lexicon["semantic_verb"]
+    lexicon.update({
+        "noun_dict": class_map(lexicon["semantic_noun"]),
+        "verb_dict": class_map(semantic_verb[:7]),
+        "that_verb_dict": class_map(semantic_verb[7:11]),
+        "to_verb_dict": class_map(semantic_verb[11:16]),
+        "phrasal_verb_dict": class_map(semantic_verb[16:]),
+        "adj_dict": class_map(lexicon["semantic_adj"]),
+        "adv_dict": class_map(lexicon["semantic_adv"]),
+        "nominal_stop": frozenset(lexicon["nominal_stop"]),
+        "nominal_suffix_trie": suffix_trie(NOMINAL_SUFFIXES),
+        "proper_suffix_trie": suffix_trie(PROPER_SUFFIXES),
+        "lexicon_version": digest.hexdigest()[:16],
+    })
+    return lexicon
+
+
+# The bundle only holds built-in types (tries are stored as their nested dicts)
+_TRIES = ("nominal_suffix_trie", "proper_suffix_trie")
+
+def _read_bundle(bundle_path: str) -> Optional[dict]:
+    try:
+        with open(bundle_path, "rb") as inf:
+            bundle = pickle.load(inf)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get("format") != LEXICON_FORMAT_VERSION:
+        return None
+    for name in _TRIES:
+        trie = SuffixTrie()
+        trie.root = bundle["lexicon"][name]
+        bundle["lexicon"][name] = trie
+    return bundle
+
+
+def build_bundle(
+        data_path: str,
+        bundle_path: str = BUNDLE_PATH
+    ) -> dict:
+    """
+    Compile the word lists and write them to a bundle file.\n
+    ---
+    ### Args
+    - `data_path` (`str`): the data folder.
+    - `bundle_path` (`str`): the bundle file.\n
+    ---
+    ### Returns
+    - `dict`: the compiled lexicon.
+    """
+    stats = _source_stats(data_path)
+    lexicon = compile_lexicon(data_path)
+    bundle = {"format": LEXICON_FORMAT_VERSION, "stats": stats, "lexicon": {**lexicon, **{x: lexicon[x].root for x in _TRIES}}}
+    directory = os.path.dirname(os.path.abspath(bundle_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as outf:
+            pickle.dump(bundle, outf, protocol=pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, bundle_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    logger.info(f"Lexicon bundle '{bundle_path}' built (version {lexicon['lexicon_version']}).")
+    return lexicon
+
+
+def load_lexicon(
+        data_path: str,
+        bundle_path: str = BUNDLE_PATH
+    ) -> dict:
+    """
+    Load the compiled lexicon, rebuilding the bundle if the source files changed.\n
+    ---
+    ### Args
+    - `data_path` (`str`): the data folder.
+    - `bundle_path` (`str`): the bundle file.\n
+    ---
+    ### Returns
+    - `dict`: the compiled lexicon (see `compile_lexicon`).
+    """
+    stats = _source_stats(data_path)
+    bundle = _read_bundle(bundle_path)
+    if bundle is not None and (stats is None or bundle["stats"] == stats):
+        return bundle["lexicon"]
+    if stats is None:
+        raise FileNotFoundError(f"No word lists in '{data_path}' and no lexicon bundle in '{bundle_path}'")
+    try:
+        return build_bundle(data_path, bundle_path)
+    except OSError as e:
+        logger.warning(f"Could not write lexicon bundle '{bundle_path}': {e}")
+        return compile_lexicon(data_path)
+
+
+if __name__ == '__main__':
+    default_data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))), "data")
+    build_bundle(*(sys.argv[1:3] or [default_data_path]))
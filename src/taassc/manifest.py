@@ -0,0 +1,153 @@
+"""
+Run manifest of `LGR_Full`, for resumable and incremental runs.
+
+The manifest records, for each analyzed file, the hash of its content, a key of the run settings (model and version,
+lexicon version, indices and outputs), the locations of its outputs and its CSV row. Each file is recorded in its own
+SQLite transaction once its outputs are in place, so a run interrupted at any point can be started again: the files
+already analyzed with the same settings, unchanged and with their outputs present are skipped, and the CSV is rebuilt
+from the recorded rows.
+"""
+
+# Standard Library
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger('TAASSC')
+
+# Bump when the schema changes
+MANIFEST_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE files (
+    name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT, settings_key TEXT, outputs TEXT, row TEXT
+);
+CREATE TABLE settings (settings_key TEXT PRIMARY KEY, settings TEXT);
+"""
+_TABLES = ("files", "settings")
+
+# Size of the blocks read to hash a file
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def settings_key(settings: dict) -> str:
+    """
+    Return the key of run settings (a hash of their JSON form).
+    """
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class RunManifest:
+    """
+    Manifest of the files analyzed by `LGR_Full`, stored in an SQLite database.\n
+    ---
+    ### Args
+    - `path` (`str`): the database file (created if needed).
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # Each record is a cheap, durable checkpoint
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != MANIFEST_FORMAT_VERSION:
+            if version:
+                logger.warning(f"Resetting run manifest '{path}' (format {version}, expected {MANIFEST_FORMAT_VERSION}).")
+            with self.connection:
+                for table in _TABLES:
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self.connection.executescript(_SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {MANIFEST_FORMAT_VERSION}")
+
+    def __enter__(self) -> "RunManifest":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def file_state(self, filename: str) -> Tuple[str, int, int]:
+        """
+        Return the content hash, size and modification time of a file.\n
+        The hash is only computed again if the size or modification time differ from the recorded ones.
+        """
+        stat = os.stat(filename)
+        row = self.connection.execute("SELECT size, mtime_ns, content_hash FROM files WHERE name = ?", (os.path.abspath(filename),)).fetchone()
+        if row is not None and row[:2] == (stat.st_size, stat.st_mtime_ns):
+            return row[2], stat.st_size, stat.st_mtime_ns
+        digest = hashlib.sha256()
+        with open(filename, "rb") as inf:
+            for block in iter(lambda: inf.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest(), stat.st_size, stat.st_mtime_ns
+
+    def completed(
+            self,
+            filename: str,
+            state: Tuple[str, int, int],
+            key: str
+        ) -> bool:
+        """
+        Check whether a file was recorded with the same content and settings, and its outputs still exist.\n
+        ---
+        ### Args
+        - `filename` (`str`): the file.
+        - `state` (`Tuple[str, int, int]`): its current state (see `file_state`).
+        - `key` (`str`): the key of the run settings (see `settings_key`).
+        """
+        row = self.connection.execute("SELECT content_hash, settings_key, outputs FROM files WHERE name = ?", (os.path.abspath(filename),)).fetchone()
+        if row is None or row[0] != state[0] or row[1] != key:
+            return False
+        return all(os.path.exists(x) for x in json.loads(row[2]).values())
+
+    def record(
+            self,
+            filename: str,
+            state: Tuple[str, int, int],
+            settings: dict,
+            outputs: Dict[str, str],
+            row: List[str]
+        ) -> None:
+        """
+        Record an analyzed file (in its own transaction).\n
+        ---
+        ### Args
+        - `filename` (`str`): the file.
+        - `state` (`Tuple[str, int, int]`): its state when it was analyzed (see `file_state`).
+        - `settings` (`dict`): the run settings.
+        - `outputs` (`Dict[str, str]`): the written outputs, by kind (`xml`, `vertical`).
+        - `row` (`List[str]`): the CSV row.
+        """
+        key = settings_key(settings)
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO settings VALUES (?, ?)", (key, json.dumps(settings, sort_keys=True)))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(filename), state[1], state[2], state[0], key, json.dumps(outputs), json.dumps(row))
+            )
+
+    def discard(self, filename: str) -> None:
+        """
+        Forget a file (e.g. when it could not be analyzed).
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM files WHERE name = ?", (os.path.abspath(filename),))
+
+    def row(self, filename: str) -> Optional[List[str]]:
+        """
+        Return the recorded CSV row of a file, or `None`.
+        """
+        row = self.connection.execute("SELECT row FROM files WHERE name = ?", (os.path.abspath(filename),)).fetchone()
+        return None if row is None else json.loads(row[0])
@@ -0,0 +1,362 @@
+"""
+Opt-in profiling of the analysis pipeline.
+
+While a `Profiler` is enabled (see `enable` and `profile`), the analysis functions record the time and calls of each
+stage (`clean` for cleaning and splitting the texts, `parse`, `tables`, `tagging`, `complexity`, `mattr`,
+`output_xml`, `output_vertical`, `output_table`, `read_tagged`) and of each tagging rule, and the tokens and time of each document,
+keeping the slowest ones. Stage times are exclusive: a stage run while another one is timed (e.g. texts cleaned
+lazily while parsing) is not counted twice. The profile is exported as a JSON report (`Profiler.report`) or as a Prometheus text snapshot (`Profiler.prometheus`).
+
+A document is timed as the sum of the stages run since the previous document ended, so with batched parsing
+(`LGR_Analysis_many`, `LGR_Full`) the parse of a whole batch is counted towards the document whose parse ran it.
+Output writers are timed but not counted towards documents.
+
+When no profiler is enabled, each hook costs a global lookup per document, chunk or file (not per token). Only the
+work done in the calling process is recorded: with `n_process > 1`, the worker processes are not profiled.
+"""
+
+# Standard Library
+import json
+import time
+import heapq
+import itertools
+import threading
+import contextlib
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# Upper bounds of the document time histogram (in seconds)
+DOCUMENT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Number of slowest documents kept
+DEFAULT_SLOWEST = 10
+# Stage whose tokens are counted as the tokens of the documents (each token is also counted by `parse`)
+DOCUMENT_TOKENS_STAGE = "tables"
+
+_active = None
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class Profiler:
+    """
+    Cumulative stage, rule and document timings (thread safe).\n
+    ---
+    ### Args
+    - `rules` (`bool`): whether to time each tagging rule call (the costliest hook, as rules run per token).
+    - `slowest` (`int`): the number of slowest documents to keep.
+    """
+    def __init__(
+            self,
+            rules: bool = True,
+            slowest: int = DEFAULT_SLOWEST
+        ) -> None:
+        self.time_rules = rules
+        self.n_slowest = slowest
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._timed_rules = {}
+        self._rule_tuples = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear the recorded timings.
+        """
+        with self._lock:
+            self.started = time.time()
+            self.stages = {}
+            self.rules = {}
+            self.documents = 0
+            self.tokens = 0
+            self.document_seconds = 0.0
+            self.buckets = [0] * (len(DOCUMENT_BUCKETS) + 1)
+            self.slowest = []
+            self._order = itertools.count()
+
+    def _state(self) -> threading.local:
+        """
+        Return the timings of the current thread: stage time recorded (to make stage times exclusive), and the time and
+        tokens of the current document.
+        """
+        local = self._local
+        if not hasattr(local, "recorded"):
+            local.recorded = 0.0
+            local.document_seconds = 0.0
+            local.document_tokens = 0
+        return local
+
+    def add(
+            self,
+            name: str,
+            seconds: float,
+            tokens: int = 0,
+            document: bool = True
+        ) -> None:
+        """
+        Record the (exclusive) time of a stage, counted towards the current document unless `document` is unset.
+        """
+        local = self._state()
+        local.recorded += seconds
+        if document:
+            local.document_seconds += seconds
+            if name == DOCUMENT_TOKENS_STAGE:
+                local.document_tokens += tokens
+        with self._lock:
+            totals = self.stages.get(name)
+            if totals is None:
+                totals = self.stages[name] = [0.0, 0, 0]
+            totals[0] += seconds
+            totals[1] += 1
+            totals[2] += tokens
+
+    @contextlib.contextmanager
+    def stage(
+            self,
+            name: str,
+            tokens: int = 0,
+            document: bool = True
+        ) -> Iterator[None]:
+        """
+        Time a stage (excluding the stages timed within it), counted towards the current document unless `document` is unset.
+        """
+        local = self._state()
+        recorded = local.recorded
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add(name, elapsed - (local.recorded - recorded), tokens, document)
+
+    def timed_iter(
+            self,
+            name: str,
+            items: Iterable,
+            tokens: Optional[Callable[[Any], int]] = None
+        ) -> Iterator:
+        """
+        Yield the items of an iterator, timing the production of each one as a stage.
+        """
+        items = iter(items)
+        local = self._state()
+        while True:
+            recorded = local.recorded
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            elapsed = time.perf_counter() - start
+            self.add(name, elapsed - (local.recorded - recorded), tokens(item) if tokens else 0)
+            yield item
+
+    def _timed_rule(self, rule: Callable) -> Callable:
+        timed = self._timed_rules.get(rule)
+        if timed is None:
+            name = rule.__name__.lstrip("_")
+            perf_counter = time.perf_counter
+
+            def timed(*args):
+                start = perf_counter()
+                result = rule(*args)
+                elapsed = perf_counter() - start
+                with self._lock:
+                    totals = self.rules.get(name)
+                    if totals is None:
+                        totals = self.rules[name] = [0.0, 0]
+                    totals[0] += elapsed
+                    totals[1] += 1
+                return result
+
+            timed = self._timed_rules[rule] = timed
+        return timed
+
+    def token_rules(self, token_rules: Callable[..., tuple]) -> Callable[..., tuple]:
+        """
+        Wrap the lookup of the rules applicable to a token so that the returned rules are timed.
+        """
+        if not self.time_rules:
+            return token_rules
+
+        def timed_token_rules(*key):
+            rules = token_rules(*key)
+            timed = self._rule_tuples.get(rules)
+            if timed is None:
+                timed = self._rule_tuples[rules] = tuple(self._timed_rule(x) for x in rules)
+            return timed
+        return timed_token_rules
+
+    def end_document(self, label: Optional[str] = None) -> None:
+        """
+        Record the end of a document, with the stage time and tokens counted since the previous one.
+        """
+        local = self._state()
+        seconds, tokens = local.document_seconds, local.document_tokens
+        local.document_seconds = 0.0
+        local.document_tokens = 0
+        with self._lock:
+            self.documents += 1
+            self.tokens += tokens
+            self.document_seconds += seconds
+            for i, bound in enumerate(DOCUMENT_BUCKETS):
+                if seconds <= bound:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+            entry = (seconds, next(self._order), label, tokens)
+            if len(self.slowest) < self.n_slowest:
+                heapq.heappush(self.slowest, entry)
+            elif self.n_slowest and seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def report(self) -> dict:
+        """
+        Return the profile: stage and rule times and calls (by decreasing time), and document statistics.
+        """
+        with self._lock:
+            stages = {x: list(y) for x, y in self.stages.items()}
+            rules = {x: list(y) for x, y in self.rules.items()}
+            documents, tokens, seconds = self.documents, self.tokens, self.document_seconds
+            slowest = sorted(self.slowest, reverse=True)
+            started = self.started
+
+        stage_total = sum(x[0] for x in stages.values()) or 1.0
+        rule_total = sum(x[0] for x in rules.values()) or 1.0
+        return {
+            "started": started,
+            "elapsed": time.time() - started,
+            "stages": {
+                name: {"seconds": x[0], "calls": x[1], "tokens": x[2], "share": x[0] / stage_total}
+                for name, x in sorted(stages.items(), key=lambda x: -x[1][0])
+            },
+            "rules": {
+                name: {"seconds": x[0], "calls": x[1], "mean_us": 1e6 * x[0] / x[1], "share": x[0] / rule_total}
+                for name, x in sorted(rules.items(), key=lambda x: -x[1][0])
+            },
+            "documents": {
+                "count": documents,
+                "tokens": tokens,
+                "seconds": seconds,
+                "docs_per_second": documents / seconds if seconds else None,
+                "tokens_per_second": tokens / seconds if seconds else None,
+                "slowest": [{"label": label, "tokens": n, "seconds": x} for x, _, label, n in slowest],
+            },
+        }
+
+    def write_json(self, filename: str) -> None:
+        """
+        Write the profile (see `report`) to a JSON file.
+        """
+        with open(filename, "w") as outf:
+            json.dump(self.report(), outf, indent=2)
+            outf.write("\n")
+
+    def prometheus(self, prefix: str = "taassc") -> str:
+        """
+        Return the profile as a Prometheus text exposition snapshot (counters and a document time histogram).
+        """
+        with self._lock:
+            stages = {x: list(y) for x, y in self.stages.items()}
+            rules = {x: list(y) for x, y in self.rules.items()}
+            documents, tokens, seconds = self.documents, self.tokens, self.document_seconds
+            buckets = list(self.buckets)
+
+        lines = []
+        def metric(name, kind, help, samples):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                labels = "{" + ",".join(f'{x}="{y}"' for x, y in labels.items()) + "}" if labels else ""
+                lines.append(f"{prefix}_{name}{suffix}{labels} {value!r}")
+
+        metric("stage_seconds_total", "counter", "Time spent in each analysis stage.", [("", {"stage": x}, y[0]) for x, y in sorted(stages.items())])
+        metric("stage_calls_total", "counter", "Calls of each analysis stage.", [("", {"stage": x}, y[1]) for x, y in sorted(stages.items())])
+        if rules:
+            metric("rule_seconds_total", "counter", "Time spent in each tagging rule.", [("", {"rule": x}, y[0]) for x, y in sorted(rules.items())])
+            metric("rule_calls_total", "counter", "Calls of each tagging rule.", [("", {"rule": x}, y[1]) for x, y in sorted(rules.items())])
+        metric("documents_total", "counter", "Analyzed documents.", [("", {}, documents)])
+        metric("tokens_total", "counter", "Tokens of the analyzed documents.", [("", {}, tokens)])
+        cumulative = list(itertools.accumulate(buckets))
+        metric("document_seconds", "histogram", "Analysis time of the documents.", [
+            *(("_bucket", {"le": repr(x)}, y) for x, y in zip(DOCUMENT_BUCKETS, cumulative)),
+            ("_bucket", {"le": "+Inf"}, cumulative[-1]),
+            ("_sum", {}, seconds),
+            ("_count", {}, documents),
+        ])
+        return "\n".join(lines) + "\n"
+
+
+def active() -> Optional[Profiler]:
+    """
+    Return the enabled profiler, if any.
+    """
+    return _active
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """
+    Enable a profiler (a new one by default) and return it.
+    """
+    global _active
+    _active = profiler if profiler is not None else Profiler()
+    return _active
+
+
+def disable() -> Optional[Profiler]:
+    """
+    Disable profiling and return the profiler that was enabled, if any.
+    """
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+@contextlib.contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """
+    Enable a profiler (a new one by default) within a `with` block, restoring the previous one afterwards.
+    """
+    global _active
+    previous = _active
+    profiler = enable(profiler)
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+def stage(
+        name: str,
+        tokens: int = 0,
+        document: bool = True
+    ) -> contextlib.AbstractContextManager:
+    """
+    Time a stage with the enabled profiler (a no-op context when profiling is disabled).
+    """
+    return _NULL_STAGE if _active is None else _active.stage(name, tokens, document)
+
+
+def timed_iter(
+        name: str,
+        items: Iterable,
+        tokens: Optional[Callable[[Any], int]] = None
+    ) -> Iterable:
+    """
+    Time the production of each item as a stage with the enabled profiler (the items are returned as they are when
+    profiling is disabled).
+    """
+    return items if _active is None else _active.timed_iter(name, items, tokens)
+
+
+def token_rules(token_rules: Callable[..., tuple]) -> Callable[..., tuple]:
+    """
+    Return the token rule lookup, timing the rules with the enabled profiler.
+    """
+    return token_rules if _active is None else _active.token_rules(token_rules)
+
+
+def end_document(label: Optional[str] = None) -> None:
+    """
+    Record the end of a document with the enabled profiler.
+    """
+    if _active is not None:
+        _active.end_document(label)
@@ -0,0 +1,279 @@
+"""
+Writers of the results tables, and token-level tables of tagged texts.
+
+The results of `LGR_Full`, `LGR_Rescore_Full`, `lgrXml` and `LGR_XML` are written as CSV, or as columnar files when
+the output file ends with `.parquet` (Parquet) or `.arrow`/`.feather` (Arrow IPC). In columnar files the filename and
+the TMLE metadata columns are strings, `nwords` is an integer column and the other indices are float columns. Rows are
+buffered and written in row groups (`DEFAULT_ROW_GROUP_SIZE` rows), so memory does not grow with the corpus.
+
+`tagged_table` builds a token-level table of a tagged text (one row per token, with its sentence, attributes and tags),
+read directly from the columns of a `TaggedText`.
+
+The columnar outputs require `pyarrow` (`pip install pyTAASSC[parquet]`).
+"""
+
+# Standard Library
+import os
+from typing import Any, List, Optional, Sequence
+
+# Local Modules
+from .tagged import TaggedText
+
+# Columnar formats, by extension
+COLUMNAR_EXTENSIONS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+# Text columns of the results (the other columns are indices)
+STRING_COLUMNS = frozenset(["filename", "learning_environment", "mode", "discipline", "subdiscipline", "text_type"])
+# Integer indices (the other indices are floats)
+INTEGER_COLUMNS = frozenset(["nwords"])
+# Rows per row group (or record batch) of the columnar results
+DEFAULT_ROW_GROUP_SIZE = 4096
+# Token attributes stored as dictionaries (few distinct values)
+DICTIONARY_ATTRIBUTES = frozenset(["pos", "tag", "dep_rel"])
+
+
+def _pyarrow(filename: str) -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(f"The 'pyarrow' package is required to read or write '{filename}'.") from e
+    return pyarrow
+
+
+def columnar_format(filename: str) -> Optional[str]:
+    """
+    Return the columnar format of a file from its extension (`"parquet"` or `"arrow"`), or `None` for other files.
+    """
+    return COLUMNAR_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def csv_line(fields: Sequence[str]) -> str:
+    """
+    Join fields into a CSV line, quoting the fields holding a comma, a quote or a line break, and a lone empty field (as
+    `csv.writer` does).
+    """
+    line = ",".join(fields)
+    if line and line.count(",") == len(fields) - 1 and '"' not in line and "\n" not in line and "\r" not in line:
+        return line
+    if len(fields) == 1 and not fields[0]:
+        # Not an empty line, which would be read as no field
+        return '""'
+    return ",".join(
+        '"' + x.replace('"', '""') + '"' if "," in x or '"' in x or "\n" in x or "\r" in x else x
+        for x in fields
+    )
+
+
+class CsvResults:
+    """
+    Results CSV writer: a header line, then one line per row (without a trailing line break).\n
+    ---
+    ### Args
+    - `filename` (`str`): the output file.
+    - `columns` (`List[str]`): the column names.
+    """
+    def __init__(
+            self,
+            filename: str,
+            columns: List[str]
+        ) -> None:
+        self.filename = filename
+        self.columns = list(columns)
+        self._outf = open(filename, "w")
+        self._outf.write(csv_line(self.columns))
+
+    def write(self, row: Sequence[str]) -> None:
+        """
+        Write a row.
+        """
+        self._outf.write("\n" + csv_line(row))
+
+    def close(self) -> None:
+        """
+        Close the file.
+        """
+        self._outf.close()
+
+    def __enter__(self) -> "CsvResults":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ColumnarResults:
+    """
+    Results writer to a Parquet or Arrow IPC file, written in row groups.\n
+    The rows are the CSV rows (strings), converted to the column types: `STRING_COLUMNS` are kept as strings,
+    `INTEGER_COLUMNS` are stored as 64-bit integers and the other columns as 64-bit floats (which round-trip exactly).\n
+    ---
+    ### Args
+    - `filename` (`str`): the output file (`.parquet`, `.arrow` or `.feather`).
+    - `columns` (`List[str]`): the column names.
+    - `row_group_size` (`int`): the number of rows per row group.
+    """
+    def __init__(
+            self,
+            filename: str,
+            columns: List[str],
+            row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+        ) -> None:
+        pa = _pyarrow(filename)
+        self.filename = filename
+        self.columns = list(columns)
+        self.row_group_size = row_group_size
+        self.format = columnar_format(filename)
+        types = [pa.string() if x in STRING_COLUMNS else pa.int64() if x in INTEGER_COLUMNS else pa.float64() for x in self.columns]
+        self.schema = pa.schema(list(zip(self.columns, types)))
+        self._converters = [str if x in STRING_COLUMNS else int if x in INTEGER_COLUMNS else float for x in self.columns]
+        self._buffers = [[] for _ in self.columns]
+        self._rows = 0
+        if self.format == "parquet":
+            import pyarrow.parquet
+
+            self._writer = pyarrow.parquet.ParquetWriter(filename, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(filename, self.schema)
+
+    def write(self, row: Sequence[str]) -> None:
+        """
+        Write a row (buffered until a row group is complete).
+        """
+        for buffer, convert, value in zip(self._buffers, self._converters, row):
+            buffer.append(convert(value))
+        self._rows += 1
+        if self._rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows as a row group.
+        """
+        if not self._rows:
+            return
+        pa = _pyarrow(self.filename)
+        batch = pa.record_batch([pa.array(x, y.type) for x, y in zip(self._buffers, self.schema)], schema=self.schema)
+        self._writer.write_batch(batch)
+        self._buffers = [[] for _ in self.columns]
+        self._rows = 0
+
+    def close(self) -> None:
+        """
+        Write the buffered rows and close the file.
+        """
+        try:
+            self.flush()
+        finally:
+            self._writer.close()
+
+    def __enter__(self) -> "ColumnarResults":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_results(
+        filename: str,
+        columns: List[str],
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+    ) -> Any:
+    """
+    Open a results writer, columnar or CSV according to the extension of the file (see `columnar_format`).\n
+    ---
+    ### Args
+    - `filename` (`str`): the output file.
+    - `columns` (`List[str]`): the column names.
+    - `row_group_size` (`int`): the number of rows per row group (columnar files only).\n
+    ---
+    ### Returns
+    - `CsvResults` | `ColumnarResults`: the writer, with `write(row)` and `close()` (and usable in a `with` block).
+    """
+    if columnar_format(filename) is not None:
+        return ColumnarResults(filename, columns, row_group_size)
+    return CsvResults(filename, columns)
+
+
+def tagged_table(
+        tagged_text,
+        columns: List[str],
+        document: Optional[str] = None
+    ) -> Any:
+    """
+    Return a tagged text as a token-level `pyarrow.Table`.\n
+    The table has a `sent_id` column (the sentence numbers of the vertical format), then the given token attributes:
+    `idx` and `head idx` as integers, the tag categories and `pos`/`tag`/`dep_rel` as dictionary-encoded strings (null
+    for no tag). The columns of a `TaggedText` are converted as a whole; other tagged texts are read token by token.\n
+    ---
+    ### Args
+    - `tagged_text` (`TaggedText` | `list`): the tagged text.
+    - `columns` (`List[str]`): the token attributes (e.g. `VERTICAL_COLUMNS["full"]`).
+    - `document` (`str`): the name of the document, added as a first `document` column (optional).\n
+    ---
+    ### Returns
+    - `pyarrow.Table`: the token table.
+    """
+    pa = _pyarrow("token tables")
+    import numpy as np
+
+    if isinstance(tagged_text, TaggedText):
+        text = tagged_text
+        positions = np.concatenate([np.arange(start, end) for start, end in text.sents] or [np.zeros(0, np.int64)])
+        sent_ids = np.repeat(np.arange(len(text.sents)), [end - start for start, end in text.sents])
+        heads = np.frombuffer(text.heads, dtype=text.heads.typecode)
+        words = pa.array(text.words, pa.string())
+        basic = {"word": words, "lemma": text.lemmas, "pos": text.pos, "tag": text.tags, "dep_rel": text.deps}
+        # Tag code 0 (no tag) is a null, the other codes index the tag names
+        tag_names = pa.array([str(x) for x in text.tag_names[1:]], pa.string())
+
+        def column(name):
+            codes = text._columns.get(name)
+            if codes is not None:
+                codes = np.frombuffer(codes, dtype=np.uint16).astype(np.int32)
+                return pa.DictionaryArray.from_arrays(pa.array(codes - 1, pa.int32(), mask=codes == 0), tag_names)
+            if name == "idx":
+                return pa.array(np.arange(len(text.words)), pa.int32())
+            if name == "head idx":
+                return pa.array(heads, pa.int32())
+            if name == "head":
+                return words.take(pa.array(heads))
+            if name in basic:
+                values = basic[name] if isinstance(basic[name], pa.Array) else pa.array(basic[name], pa.string())
+                return values.dictionary_encode() if name in DICTIONARY_ATTRIBUTES else values
+            extra = text._extra
+            return pa.array([extra.get(i, {}).get(name) for i in range(len(text.words))], pa.string())
+
+        positions = pa.array(positions)
+        arrays = [pa.array(sent_ids, pa.int32())] + [column(x).take(positions) for x in columns]
+    else:
+        tokens = [(sent_id, token) for sent_id, sent in enumerate(tagged_text) for token in sent]
+
+        def column(name):
+            if name in ("idx", "head idx"):
+                return pa.array([int(token[name]) for _, token in tokens], pa.int32())
+            values = pa.array([None if token.get(name) is None else str(token.get(name)) for _, token in tokens], pa.string())
+            return values.dictionary_encode() if name in DICTIONARY_ATTRIBUTES or name not in ("word", "lemma", "head") else values
+
+        arrays = [pa.array([x for x, _ in tokens], pa.int32())] + [column(x) for x in columns]
+
+    names = ["sent_id"] + list(columns)
+    if document is not None:
+        arrays.insert(0, pa.array([document] * len(arrays[0]), pa.string()).dictionary_encode())
+        names.insert(0, "document")
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def write_table(
+        table: Any,
+        filename: str
+    ) -> None:
+    """
+    Write a `pyarrow.Table` to a Parquet or Arrow IPC file, according to its extension (see `columnar_format`).
+    """
+    pa = _pyarrow(filename)
+    if columnar_format(filename) == "arrow":
+        with pa.ipc.new_file(filename, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(table, filename)
@@ -0,0 +1,432 @@
+"""
+Local analysis server keeping the spaCy model and the word lists loaded.
+
+Texts are posted as JSON to `/analyze` and the indices (and optionally the tagged text) are returned as JSON.
+Concurrent requests are collected into micro-batches (up to `max_batch_size` texts, waiting at most `max_wait` seconds
+for more) and parsed together with `nlp.pipe` by a single worker thread. `/stats` reports the latency and throughput,
+`/health` whether the server is up. With profiling enabled (`--profile`), `/metrics` exposes the stage and rule timings
+as Prometheus text and `/profile` as JSON (see `taassc.profiling`).
+
+Run `python -m taassc.server [--host HOST] [--port PORT] [--model MODEL] [--max-batch-size N] [--max-wait SECONDS] [--profile]`.
+
+Requests:
+- `POST /analyze` with `{"text": "..."}` or `{"texts": ["...", ...]}`, and optionally `"tagged": true` for the tagged
+  text (as a list of sentences of per-token objects) and `lemma_text`. Returns `{"result": {...}}` or `{"results": [...]}`.
+  A text that cannot be analyzed (e.g. one without words) gets an `{"error": "..."}` entry in `results` (the other texts
+  are still analyzed), or a 422 response for a single `text`.
+- `GET /stats`, `GET /health`, and `GET /metrics` and `GET /profile` with profiling enabled.
+"""
+
+# Standard Library
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+from collections import deque
+from typing import Any, List, Optional, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local Modules
+from . import profiling
+from .cache import ParseCache
+from .taassc import (
+    DEFAULT_MODEL, DEFAULT_EXCLUDE, DEFAULT_CHUNK_CHARS, MODEL_ALIASES,
+    LGR_Analysis, LGR_Analysis_many, load_model, load_resources
+)
+
+logger = logging.getLogger('TAASSC')
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT = 0.01
+# Largest accepted request body (in bytes)
+MAX_REQUEST_SIZE = 64 * 1024 ** 2
+# Number of recent requests and batches the statistics are computed on
+STATS_WINDOW = 1000
+
+
+class _Job:
+    """
+    Texts of a request waiting to be analyzed.
+    """
+    __slots__ = ("texts", "tagged", "results", "errors", "done")
+
+    def __init__(
+            self,
+            texts: List[str],
+            tagged: bool
+        ) -> None:
+        self.texts = texts
+        self.tagged = tagged
+        self.results = [None] * len(texts)
+        self.errors = {}
+        self.done = threading.Event()
+
+
+class ServerStats:
+    """
+    Request, batch and latency statistics of a server (thread safe).\n
+    ---
+    ### Args
+    - `window` (`int`): the number of recent requests and batches the latency and batch size statistics are computed on.
+    """
+    def __init__(self, window: int = STATS_WINDOW) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.completions = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add_request(
+            self,
+            n_texts: int,
+            latency: float,
+            error: bool = False
+        ) -> None:
+        """
+        Record a completed request.
+        """
+        with self._lock:
+            self.requests += 1
+            self.texts += n_texts
+            self.errors += error
+            self.latencies.append(latency)
+            self.completions.append((time.monotonic(), n_texts))
+
+    def add_batch(self, n_texts: int) -> None:
+        """
+        Record an analyzed batch.
+        """
+        with self._lock:
+            self.batches += 1
+            self.batch_sizes.append(n_texts)
+
+    def snapshot(self) -> dict:
+        """
+        Return the statistics: counts since start, latency percentiles (in milliseconds), mean batch size and throughput.
+        """
+        with self._lock:
+            now = time.monotonic()
+            latencies = sorted(self.latencies)
+            batch_sizes = list(self.batch_sizes)
+            completions = list(self.completions)
+            stats = {
+                "uptime": now - self.started,
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "errors": self.errors,
+            }
+
+        def percentile(p):
+            return 1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else None
+
+        recent = now - completions[0][0] if completions else 0
+        stats.update({
+            "latency_ms": {"p50": percentile(0.5), "p90": percentile(0.9), "p99": percentile(0.99), "max": percentile(1)},
+            "mean_batch_size": sum(batch_sizes) / len(batch_sizes) if batch_sizes else None,
+            "texts_per_second": stats["texts"] / stats["uptime"] if stats["uptime"] else None,
+            "recent_texts_per_second": sum(n for _, n in completions) / recent if recent else None,
+        })
+        return stats
+
+
+class MicroBatcher:
+    """
+    Collect analysis requests into micro-batches, analyzed by a single worker thread with `LGR_Analysis_many`.\n
+    ---
+    ### Args
+    - `max_batch_size` (`int`): the maximum number of texts per batch.
+    - `max_wait` (`float`): the maximum time (in seconds) to wait for more requests once a batch is started.
+    - `model` (`str`): the spaCy model (see `load_model`).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.
+    - `cache` (`ParseCache`): the parse cache to reuse parses from (optional).
+    - `chunk_chars` (`int`): the maximum length of the parsed chunks of long texts (see `LGR_Analysis`).
+    """
+    def __init__(
+            self,
+            max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+            max_wait: float = DEFAULT_MAX_WAIT,
+            model: str = DEFAULT_MODEL,
+            exclude: Sequence[str] = DEFAULT_EXCLUDE,
+            cache: Optional[ParseCache] = None,
+            chunk_chars: int = DEFAULT_CHUNK_CHARS
+        ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"Invalid maximum batch size {max_batch_size}")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.model = model
+        self.exclude = exclude
+        self.cache = cache
+        self.chunk_chars = chunk_chars
+        self.stats = ServerStats()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self) -> None:
+        """
+        Load the model and the word lists, and start the worker thread.
+        """
+        load_resources()
+        load_model(self.model, self.exclude)
+        self._thread = threading.Thread(target=self._run, name="taassc-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the worker thread once the queued requests are analyzed.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def analyze(
+            self,
+            texts: List[str],
+            tagged: bool = False,
+            timeout: Optional[float] = None,
+            return_errors: bool = False
+        ) -> List[Any]:
+        """
+        Analyze texts (together with the other pending requests) and return their analyses (see `LGR_Analysis`).\n
+        ---
+        ### Args
+        - `texts` (`List[str]`): the texts.
+        - `tagged` (`bool`): whether the tagged texts (and `lemma_text`) are needed.
+        - `timeout` (`float`): the maximum time to wait for the analyses (in seconds).
+        - `return_errors` (`bool`): whether the texts that cannot be analyzed get their exception in place of their
+        analysis (by default the first exception is raised).
+        """
+        if self._thread is None:
+            raise RuntimeError("The batcher is not started")
+        started = time.monotonic()
+        job = _Job(texts, tagged)
+        self._queue.put(job)
+        if not job.done.wait(timeout):
+            raise TimeoutError(f"Analysis not completed within {timeout} seconds")
+        self.stats.add_request(len(texts), time.monotonic() - started, bool(job.errors))
+        if return_errors:
+            return [job.errors.get(i, x) for i, x in enumerate(job.results)]
+        if job.errors:
+            raise job.errors[min(job.errors)]
+        return job.results
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            size = len(job.texts)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                try:
+                    job = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+                size += len(job.texts)
+            self._analyze_batch(batch)
+
+    def _analyze_batch(self, batch: List[_Job]) -> None:
+        """
+        Analyze the texts of a batch of requests, then release the requests.\n
+        If the batch fails, the texts are analyzed one by one so that only the failing texts get an error.
+        """
+        texts = [(text, (job, i)) for job in batch for i, text in enumerate(job.texts)]
+        tagged = any(job.tagged for job in batch)
+        done = 0
+        try:
+            for tag_output, (job, i) in LGR_Analysis_many(
+                    texts, output=tagged, batch_size=self.max_batch_size, as_tuples=True,
+                    model=self.model, exclude=self.exclude, cache=self.cache, chunk_chars=self.chunk_chars):
+                job.results[i] = tag_output
+                done += 1
+        except Exception:
+            for text, (job, i) in texts[done:]:
+                try:
+                    job.results[i] = LGR_Analysis(text, output=tagged, model=self.model, exclude=self.exclude, cache=self.cache, chunk_chars=self.chunk_chars)
+                except Exception as e:
+                    logger.error("Failed to analyze text: %s: %s", type(e).__name__, e)
+                    job.errors[i] = e
+        self.stats.add_batch(len(texts))
+        for job in batch:
+            job.done.set()
+
+
+def json_result(
+        tag_output: dict,
+        tagged: bool = False
+    ) -> dict:
+    """
+    Return an analysis (see `LGR_Analysis`) as a JSON-serializable dict, with the tagged text as a list of sentences of
+    per-token dicts if `tagged` is set.
+    """
+    result = {x: y for x, y in tag_output.items() if x not in ("tagged_text", "lemma_text")}
+    if tagged:
+        result["lemma_text"] = tag_output["lemma_text"]
+        result["tagged_text"] = tag_output["tagged_text"].to_list()
+    return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "TAASSC"
+
+    def _send(
+            self,
+            status: int,
+            data: Any
+        ) -> None:
+        if isinstance(data, str):
+            body = data.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = json.dumps(data, default=lambda x: x.item() if hasattr(x, "item") else str(x)).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._send(200, {**self.server.batcher.stats.snapshot(), **self.server.info})
+        elif self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path in ("/metrics", "/profile"):
+            profiler = profiling.active()
+            if profiler is None:
+                self._send(404, {"error": "Profiling is not enabled (start the server with --profile)"})
+            else:
+                self._send(200, profiler.prometheus() if self.path == "/metrics" else profiler.report())
+        else:
+            self._send(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self) -> None:
+        if self.path != "/analyze":
+            self._send(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_SIZE:
+            self._send(413, {"error": f"Request larger than {MAX_REQUEST_SIZE} bytes"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length))
+            single = "text" in request
+            texts = [request["text"]] if single else request["texts"]
+            tagged = bool(request.get("tagged", False))
+            if not isinstance(texts, list) or not all(isinstance(x, str) for x in texts):
+                raise ValueError("'texts' must be a list of strings")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._send(400, {"error": f"Invalid request (expected {{\"text\": ...}} or {{\"texts\": [...]}}): {e}"})
+            return
+        try:
+            outputs = self.server.batcher.analyze(texts, tagged, return_errors=True) if texts else []
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        results = [{"error": f"{type(x).__name__}: {x}"} if isinstance(x, Exception) else json_result(x, tagged) for x in outputs]
+        if not single:
+            self._send(200, {"results": results})
+        elif isinstance(outputs[0], Exception):
+            self._send(422, results[0])
+        else:
+            self._send(200, {"result": results[0]})
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s " + format, self.address_string(), *args)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """
+    HTTP server answering analysis requests with a `MicroBatcher`.\n
+    ---
+    ### Args
+    - `address` (`tuple`): the `(host, port)` to listen on.
+    - `batcher` (`MicroBatcher`): the (started) batcher.
+    """
+    daemon_threads = True
+    # Concurrent clients are expected (the default backlog is 5)
+    request_queue_size = 128
+
+    def __init__(
+            self,
+            address: tuple,
+            batcher: MicroBatcher
+        ) -> None:
+        super().__init__(address, _Handler)
+        self.batcher = batcher
+        self.info = {
+            "model": MODEL_ALIASES.get(batcher.model, batcher.model),
+            "lexicon_version": load_resources()["lexicon_version"],
+            "max_batch_size": batcher.max_batch_size,
+            "max_wait": batcher.max_wait,
+        }
+
+
+def serve(
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        cache: Optional[ParseCache] = None,
+        profile: bool = False
+    ) -> None:
+    """
+    Load the model and serve analysis requests until interrupted.\n
+    ---
+    ### Args
+    - `host` (`str`): the host to listen on (localhost by default).
+    - `port` (`int`): the port to listen on.
+    - `max_batch_size` (`int`): the maximum number of texts per batch.
+    - `max_wait` (`float`): the maximum time (in seconds) to wait for more requests once a batch is started.
+    - `model` (`str`): the spaCy model (see `load_model`).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.
+    - `cache` (`ParseCache`): the parse cache to reuse parses from (optional).
+    - `profile` (`bool`): whether to profile the analyses (served on `/metrics` and `/profile`).
+    """
+    if profile:
+        profiling.enable()
+    batcher = MicroBatcher(max_batch_size, max_wait, model, exclude, cache)
+    batcher.start()
+    server = AnalysisServer((host, port), batcher)
+    logger.info(f"Serving TAASSC analyses on http://{host}:{server.server_port} (model '{model}').")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+        if profile:
+            profiling.disable()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve TAASSC analyses over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait", type=float, default=DEFAULT_MAX_WAIT, help="in seconds")
+    parser.add_argument("--cache", help="parse cache folder")
+    parser.add_argument("--profile", action="store_true", help="profile the analyses (served on /metrics and /profile)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s][%(name)s][%(levelname)s] %(message)s')
+    serve(args.host, args.port, args.max_batch_size, args.max_wait, args.model, cache=ParseCache(args.cache) if args.cache else None, profile=args.profile)
@@ -23,86 +23,140 @@ Licence:
 # Standard Lbrary
 import os
 import re
-import sys
 import glob
+import gzip
 import logging
+import time
+import functools
+import itertools
 from xml.dom import minidom
 import xml.etree.ElementTree as ET
-from typing import List, Any, Union, Dict
-
-# Set current working directory to the directory of the script
-script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
-os.chdir(script_dir)
-
-# Set logger
-logging.basicConfig(
-    level = logging.INFO,
-    format = '[%(asctime)s][%(name)s][%(levelname)s] %(message)s',
-    handlers = [
-        logging.FileHandler('taassc.log', mode='a'),
-        logging.StreamHandler()])
+from typing import List, Any, Union, Dict, Optional, Iterator, Iterable, Sequence, Tuple, Callable
+
+# Local Modules
+from . import profiling
+from .cache import ParseCache
+from .tagged import TaggedText
+from .manifest import RunManifest, settings_key
+from .results import open_results, columnar_format, tagged_table, write_table
+from .lexicon import load_lexicon, class_map
+
+
+def typechecked(func):
+    """
+    Instrument `func` with typeguard on its first call.\n
+    typeguard recompiles the whole module for every decorated function, so doing it at import time is slow (typeguard
+    itself is imported on the first call too).\n
+    ---
+    ### Args
+    - `func`: the function to type check.
+    """
+    instrumented = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal instrumented
+        if instrumented is None:
+            from typeguard import typechecked as _typechecked
+            instrumented = _typechecked(func)
+        return instrumented(*args, **kwargs)
+    return wrapper
+
+# Set logger (handlers are left to the host application)
+# Messages on the per-document path use lazy `%` arguments, so that nothing is rendered unless the level is enabled
 logger = logging.getLogger('TAASSC')
+logger.addHandler(logging.NullHandler())
+
+# One analyzed document in `LOG_SAMPLE_EVERY` gets a structured debug record (see `_DocumentLog`)
+LOG_SAMPLE_EVERY = int(os.environ.get("TAASSC_LOG_SAMPLE", 100))
+
+class _DocumentLog:
+    """
+    Sampled, structured per-document debug records of a corpus run.\n
+    Each sampled record carries its fields (`run`, `file`, `n`, `words`, `seconds`) as the `taassc` attribute of the
+    log record, for structured handlers (e.g. a JSON formatter). `seconds` is the time since the previous document of
+    the run was written (with worker processes, results arrive by chunks of files). Nothing is computed when DEBUG
+    records of the `TAASSC` logger are disabled.\n
+    ---
+    ### Args
+    - `run` (`str`): the kind of run (`"analyze"`, `"rescore"`, `"tmle"`).
+    - `words_column` (`int`): the CSV row column holding the number of words, if any.
+    - `sample_every` (`int`): log one document in `sample_every` (1 logs all of them).
+    """
+    def __init__(
+            self,
+            run: str,
+            words_column: Optional[int] = None,
+            sample_every: int = LOG_SAMPLE_EVERY
+        ) -> None:
+        self.run = run
+        self.words_column = words_column
+        self.sample_every = max(1, sample_every)
+        self.enabled = logger.isEnabledFor(logging.DEBUG)
+        self.count = 0
+        self.last = time.perf_counter()
+
+    def document(
+            self,
+            filename: str,
+            row: List[str]
+        ) -> None:
+        """
+        Count a document written to the CSV, and log it if it is sampled.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        seconds, self.last = now - self.last, now
+        self.count += 1
+        if (self.count - 1) % self.sample_every:
+            return
+        words = int(float(row[self.words_column])) if self.words_column is not None else None
+        logger.debug(
+            "%s: document %d '%s' (%s words) in %.3f s.", self.run, self.count, filename, words, seconds,
+            extra={"taassc": {"run": self.run, "file": filename, "n": self.count, "words": words, "seconds": seconds}})
 
 if __name__ == '__main__':
     logger.warning(f"This script should not be run as main!")
 
-logger.info(f"Working on folder '{script_dir}'")
-DATA_PATH = 'data'
+# Data folder (repository `data` directory unless overridden)
+DATA_PATH = os.environ.get(
+    "TAASSC_DATA_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))), "data"))
 
-logger.info(f"Python v: {sys.version}")
+# spaCy model settings
+DEFAULT_MODEL = "en_core_web_trf"
+NLP_MAX_LENGTH = 1728483
+# Longer texts are parsed in chunks of at most this many characters (see `split_text`)
+DEFAULT_CHUNK_CHARS = 100000
 
-# Third-Party Packages
-logger.info(f"Importing third-party packages...")
-try:
-    import spacy
-    from typeguard import typechecked
-    from lexical_diversity import lex_div as ld
-    logger.info(f"Third-party packages imported.")
-    logger.info(f"spaCy v: {spacy.__version__}")
-except Exception as e:
-    try:
-        logger.info(f"Installing third-party packages.")
-        os.system('python3 -m pip install --upgrade pip setuptools spacy lexical-diversity')
-        import spacy
-        from typeguard import typechecked
-        from lexical_diversity import lex_div as ld
-        logger.info(f"Third-party packages installed and imported.")
-        logger.info(f"spaCy v: {spacy.__version__}")
-    except Exception as e:
-        logger.critical(f"Failed to import third-party packages: {e}")
-        raise
+# Model name shortcuts and pipeline components never read by the tagging rules
+MODEL_ALIASES = {x: f"en_core_web_{x}" for x in ["sm", "md", "lg", "trf"]}
+DEFAULT_EXCLUDE = ("ner",)
 
+# Files per task in multi-process runs
+DEFAULT_CHUNK_SIZE = 32
 
-# Load spaCy model
-try:
-    logger.info(f"Loading spaCy model 'en_core_web_trf'...")
-    nlp = spacy.load("en_core_web_trf")
-    nlp.max_length = 1728483
-    logger.info(f"spaCy model 'en_core_web_trf' loaded with max lenght '{nlp.max_length}'...")
-except:
-    logger.info(f"Downloading spaCy model 'en_core_web_trf'...")
-    try:
-        os.system("python3 -m spacy download en_core_web_trf")
-        logger.info(f"Loading spaCy model 'en_core_web_trf'...")
-        nlp = spacy.load("en_core_web_trf")
-        nlp.max_length = 1728483
-        logger.info(f"spaCy model 'en_core_web_trf' loaded with max lenght '{nlp.max_length}'...")
-    except Exception as e:
-        logger.error(f"Failed to load spaCy model: {e}")
-        raise
+# Lazily loaded resources
+_models = {}
+_resources = {}
+_LAZY_RESOURCES = (
+    "semantic_noun", "semantic_verb", "semantic_adj", "semantic_adv", "nominal_stop",
+    "noun_dict", "verb_dict", "that_verb_dict", "to_verb_dict", "phrasal_verb_dict", "adj_dict", "adv_dict",
+    "nominal_suffix_trie", "proper_suffix_trie", "index_list", "lexicon_version")
+
+class _Lexicon:
+    """
+    The loaded word lists and dictionaries as attributes (e.g. `_lexicon.noun_dict`), read by the tagging rules.\n
+    The resources are loaded on first access (see `load_resources`), then read as plain attributes.
+    """
+    def __getattr__(self, name: str) -> Any:
+        if name not in _LAZY_RESOURCES:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        load_resources()
+        return self.__dict__[name]
 
-# Load lists
-logger.info(f"Loading lists...")
-try:
-    semantic_noun = open(f"{DATA_PATH}/lists_LGR/semantic_class_noun.txt").read().split("\n")
-    semantic_verb = open(f"{DATA_PATH}/lists_LGR/semantic_class_verb.txt").read().split("\n")
-    semantic_adj = open(f"{DATA_PATH}/lists_LGR/semantic_class_adj.txt").read().split("\n")
-    semantic_adv = open(f"{DATA_PATH}/lists_LGR/semantic_class_adverb_5-25-20.txt").read().split("\n")
-    nominal_stop = open(f"{DATA_PATH}/lists_LGR/nom_stop_list_edited.txt").read().split("\n")
-    logger.info(f"Lists loaded.")
-except Exception as e:
-    logger.error(f"Failed to load lists: {e}")
-    raise
+_lexicon = _Lexicon()
 
 @typechecked
 def list_dict(
@@ -117,21 +171,75 @@ def list_dict(
     ### Returns
     - `dict`: the dictionary.
     """
-    return {y: l[0] for x in words_list for l in [x.split("\t")] for y in l[1:]}
-
-logger.info(f"Creating dictionaries...")
-try:
-    noun_dict = list_dict(semantic_noun)
-    verb_dict = list_dict(semantic_verb[:7])
-    that_verb_dict = list_dict(semantic_verb[7:11])
-    to_verb_dict = list_dict(semantic_verb[11:16])
-    phrasal_verb_dict = list_dict(semantic_verb[16:])
-    adj_dict = list_dict(semantic_adj)
-    adv_dict = list_dict(semantic_adv)
-    logger.info(f"Dictionaries created.")
-except Exception as e:
-    logger.error(f"Failed to create dictionaries: {e}")
-    raise
+    return class_map(words_list)
+
+def load_resources() -> dict:
+    """
+    Load the compiled word lists, dictionaries and the index list (only once, see `lexicon.load_lexicon`).\n
+    The loaded objects are also exposed as module attributes (e.g. `noun_dict`, `index_list`) and as the attributes of
+    `_lexicon`, read by the tagging rules.\n
+    ---
+    ### Returns
+    - `dict`: the loaded resources.
+    """
+    if _resources:
+        return _resources
+
+    logger.info(f"Loading lists from '{DATA_PATH}'...")
+    try:
+        resources = load_lexicon(DATA_PATH)
+    except Exception as e:
+        logger.error(f"Failed to load lists: {e}")
+        raise
+
+    _lexicon.__dict__.update(resources)
+    _resources.update(resources)
+    logger.info(f"Lists loaded (lexicon version {resources['lexicon_version']}).")
+    return _resources
+
+def load_model(
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE
+    ) -> Any:
+    """
+    Load a spaCy model (only once per model name and excluded components).\n
+    ---
+    ### Args
+    - `model` (`str`): the spaCy model name or path (`"sm"`, `"md"`, `"lg"` and `"trf"` are shortcuts for `en_core_web_*`).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load (NER is never used by the tagging rules).\n
+    ---
+    ### Returns
+    - `spacy.language.Language`: the loaded pipeline.
+    """
+    model = MODEL_ALIASES.get(model, model)
+    key = (model, tuple(exclude))
+    if key in _models:
+        return _models[key]
+
+    import spacy
+    logger.info(f"Loading spaCy model '{model}' without {list(exclude)} (spaCy v: {spacy.__version__})...")
+    try:
+        nlp = spacy.load(model, exclude=list(exclude))
+    except OSError:
+        logger.info(f"Downloading spaCy model '{model}'...")
+        try:
+            from spacy.cli import download
+            download(model)
+            nlp = spacy.load(model, exclude=list(exclude))
+        except BaseException as e:
+            logger.error(f"Failed to load spaCy model: {e}")
+            raise OSError(f"Failed to load spaCy model '{model}'") from e
+    nlp.max_length = NLP_MAX_LENGTH
+    logger.info(f"spaCy model '{model}' loaded with pipeline {nlp.pipe_names} and max length '{nlp.max_length}'.")
+    _models[key] = nlp
+    return nlp
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_RESOURCES:
+        return load_resources()[name]
+    if name == "nlp":
+        return load_model()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 categories = {}
 
@@ -150,48 +258,35 @@ def mini_d(
     for x in category_list:
         categories[x] = category_name
 
-
-logger.info(f"Mapping items to categories...")
-try:
-    mini_d("main_tag", "nn_all prep_phrase verb pp_all wh_relative_clause".split())
-    mini_d("main_tag2", ["all_phrasal_verbs"])
-    mini_d("spec_tag1", "nominalization pp1 pp2 pp3 pp3_it pp_indefinite pp_demonstrative cc_phrase cc_clause wh_question past_tense perfect_aspect non_past_tense jj_attributive jj_predicative discourse_particle place_adverbials time_adverbials conjuncts_adverb downtoners_adverb hedges_adverb amplifiers_adverb emphatics wh_clause wh_relative_subj_clause wh_relative_obj_clause wh_relative_prep_clause that_relative_clause that_complement_clause".split())
-    mini_d("spec_tag2", "pv_do split_aux be_mv that_verb_clause that_adjective_clause that_noun_clause".split())
-    mini_d("spec_tag3", "adverbial_subordinator_causitive adverbial_subordinator_conditional adverbial_subordinator_other agentless_passive by_passive".split())
-    mini_d("spec_tag4", ["contraction", "to_clause"])
-    mini_d("spec_tag5", "modal_possibility modal_necessity modal_predictive to_clause_noun to_clause_verb to_clause_adjective".split())
-    mini_d("spec_tag6", ["past_participial_clause", "complementizer_that0"])
-    mini_d("semantic_tag1", "nn_animate nn_cognitive nn_concrete nn_technical nn_quantity nn_place nn_group nn_abstract activity_verb communication_verb mental_verb causation_verb occurrence_verb existence_verb aspectual_verb intransitive_activity_phrasal_verb intransitive_occurence_phrasal_verb copular_phrasal_verb intransitive_aspectual_phrasal_verb transitive_activity_phrasal_verb transitive_mental_phrasal_verb transitive_communication_phrasal_verb size_attributive_adj time_attributive_adj color_attributive_adj evaluative_attributive_adj relational_attributive_adj topical__attributive_adj attitudinal_adj likelihood_adj certainty_adj ability_willingness_adj personal_affect_adj ease_difficulty_adj evaluative_adj attitudinal_adverb factive_adverb likelihood_adverb nonfactive_adverb that_verb_clause_nonfactive that_verb_clause_attitudinal that_verb_clause_factive that_verb_clause_likelihood that_noun_clause_nonfactive that_noun_clause_attitudinal that_noun_clause_factive that_noun_clause_likelihood to_adjective_clause_certainty to_adjective_clause_ability_willingness to_adjective_clause_personal_affect to_adjective_clause_ease_difficulty to_adjective_clause_evaluative that_adjective_clause_attitudinal that_adjective_clause_likelihood".split())
-    mini_d("semantic_tag2", "to_clause_verb_to_speech_act to_clause_verb_cognition to_clause_verb_desire to_clause_verb_to_causative to_clause_verb_probability to_clause_adjective_certainty to_clause_adjective_ability_willingness to_clause_adjective_personal_affect to_clause_adjective_ease_difficulty to_clause_adjective_evaluative".split())
-    mini_d("other", "wrd_length nwords mattr".split())
-    logger.info(f"Items to categories mapped.")
-except Exception as e:
-    logger.error(f"Failed to map items to categories: {e}")
-    raise
+# Map items to categories (unchecked: type checking instruments the module, which is slow at import time)
+mini_d.__wrapped__("main_tag", "nn_all prep_phrase verb pp_all wh_relative_clause".split())
+mini_d.__wrapped__("main_tag2", ["all_phrasal_verbs"])
+mini_d.__wrapped__("spec_tag1", "nominalization pp1 pp2 pp3 pp3_it pp_indefinite pp_demonstrative cc_phrase cc_clause wh_question past_tense perfect_aspect non_past_tense jj_attributive jj_predicative discourse_particle place_adverbials time_adverbials conjuncts_adverb downtoners_adverb hedges_adverb amplifiers_adverb emphatics wh_clause wh_relative_subj_clause wh_relative_obj_clause wh_relative_prep_clause that_relative_clause that_complement_clause".split())
+mini_d.__wrapped__("spec_tag2", "pv_do split_aux be_mv that_verb_clause that_adjective_clause that_noun_clause".split())
+mini_d.__wrapped__("spec_tag3", "adverbial_subordinator_causitive adverbial_subordinator_conditional adverbial_subordinator_other agentless_passive by_passive".split())
+mini_d.__wrapped__("spec_tag4", ["contraction", "to_clause"])
+mini_d.__wrapped__("spec_tag5", "modal_possibility modal_necessity modal_predictive to_clause_noun to_clause_verb to_clause_adjective".split())
+mini_d.__wrapped__("spec_tag6", ["past_participial_clause", "complementizer_that0"])
+mini_d.__wrapped__("semantic_tag1", "nn_animate nn_cognitive nn_concrete nn_technical nn_quantity nn_place nn_group nn_abstract activity_verb communication_verb mental_verb causation_verb occurrence_verb existence_verb aspectual_verb intransitive_activity_phrasal_verb intransitive_occurence_phrasal_verb copular_phrasal_verb intransitive_aspectual_phrasal_verb transitive_activity_phrasal_verb transitive_mental_phrasal_verb transitive_communication_phrasal_verb size_attributive_adj time_attributive_adj color_attributive_adj evaluative_attributive_adj relational_attributive_adj topical__attributive_adj attitudinal_adj likelihood_adj certainty_adj ability_willingness_adj personal_affect_adj ease_difficulty_adj evaluative_adj attitudinal_adverb factive_adverb likelihood_adverb nonfactive_adverb that_verb_clause_nonfactive that_verb_clause_attitudinal that_verb_clause_factive that_verb_clause_likelihood that_noun_clause_nonfactive that_noun_clause_attitudinal that_noun_clause_factive that_noun_clause_likelihood to_adjective_clause_certainty to_adjective_clause_ability_willingness to_adjective_clause_personal_affect to_adjective_clause_ease_difficulty to_adjective_clause_evaluative that_adjective_clause_attitudinal that_adjective_clause_likelihood".split())
+mini_d.__wrapped__("semantic_tag2", "to_clause_verb_to_speech_act to_clause_verb_cognition to_clause_verb_desire to_clause_verb_to_causative to_clause_verb_probability to_clause_adjective_certainty to_clause_adjective_ability_willingness to_clause_adjective_personal_affect to_clause_adjective_ease_difficulty to_clause_adjective_evaluative".split())
+mini_d.__wrapped__("other", "wrd_length nwords mattr".split())
 
 # Categories
 tag_categories = {x: None for x in "main_tag spec_tag1 spec_tag2 spec_tag3 spec_tag4 spec_tag5 spec_tag6 semantic_tag1 semantic_tag2".split()}
 
-# Index list
-logger.info(f"Loading index list...")
-try:
-    index_list = open(f"{DATA_PATH}/lists_LGR/LGR_index_list_5-26-20.txt").read().split("\n")
-    logger.info(f"Index list loaded.")
-except Exception as e:
-    logger.error(f"Failed to load index list: {e}")
-    raise
-
 @typechecked
 def ex_tester(
-        input_text: str
+        input_text: str,
+        model: str = DEFAULT_MODEL
     ) -> None:
     """
     Example tester for checking spaCy output.\n
     ---
     ### Args
     - `input_text` (`str`): the text to test.
+    - `model` (`str`): the spaCy model.
     """
-    spcy_sample = nlp(input_text)
+    spcy_sample = load_model(model)(input_text)
     for sent_number, sent in enumerate(spcy_sample.sents, 1):
         print(f"sent_number {sent_number}")
         for token in sent:
@@ -211,6 +306,70 @@ def safe_divide(
     """
     return 0.0 if float(denominator) == 0.0 else numerator / denominator
 
+# Window of the moving-average type-token ratio
+MATTR_WINDOW = 50
+
+@typechecked
+def mattr(
+        text: Sequence,
+        window_length: int = MATTR_WINDOW
+    ) -> float:
+    """
+    Moving-average type-token ratio, as `lexical_diversity.lex_div.mattr` computes it (to the last bit).\n
+    The tokens are coded as integers and the number of types of each window is updated incrementally as the window
+    slides, so the cost is linear in the number of tokens instead of proportional to the window length. Texts of at
+    most `window_length` tokens get their type-token ratio.\n
+    ---
+    ### Args
+    - `text` (`Sequence`): the tokens (e.g. the `lemma_POS` strings of `lemma_text`).
+    - `window_length` (`int`): the window length.\n
+    ---
+    ### Returns
+    - `float`: the MATTR (`0` for an empty text).
+    """
+    import numpy
+
+    n = len(text)
+    if n < window_length + 1:
+        return len(set(text)) / n if n else 0
+    types = dict.fromkeys(text)
+    for code, token in enumerate(types):
+        types[token] = code
+    return _mattr_codes(numpy.fromiter(map(types.__getitem__, text), numpy.int64, n), window_length)
+
+def _mattr_codes(
+        codes,
+        window_length: int = MATTR_WINDOW
+    ) -> float:
+    """
+    MATTR of a text coded as integers (a NumPy array, equal codes for equal tokens), see `mattr`.
+    """
+    import numpy
+
+    n = len(codes)
+    if n < window_length + 1:
+        return len(numpy.unique(codes)) / n if n else 0
+
+    # Previous and next positions of the same type (far outside the text if there is none)
+    order = numpy.argsort(codes, kind="stable")
+    same = codes[order[1:]] == codes[order[:-1]]
+    previous = numpy.full(n, -2 * n - window_length, dtype=numpy.int64)
+    following = numpy.full(n, 2 * n + window_length, dtype=numpy.int64)
+    previous[order[1:][same]] = order[:-1][same]
+    following[order[:-1][same]] = order[1:][same]
+
+    # Sliding from window `x` to `x + 1` adds a type if the entering token's type is not in the rest of the window,
+    # and removes one if the leaving token's type is not either
+    positions = numpy.arange(n - window_length)
+    entering = positions + window_length - previous[window_length:] >= window_length
+    leaving = following[:n - window_length] - positions >= window_length
+    window_types = numpy.empty(n - window_length + 1, dtype=numpy.int64)
+    window_types[0] = len(numpy.unique(codes[:window_length]))
+    numpy.cumsum(entering.astype(numpy.int64) - leaving, out=window_types[1:])
+    window_types[1:] += window_types[0]
+    # Accumulated in window order, as the sequential sum of `lexical_diversity`
+    return float(numpy.cumsum(window_types / float(window_length))[-1]) / len(window_types)
+
 @typechecked
 def prettify(
         element
@@ -225,41 +384,258 @@ def prettify(
     reparsed = minidom.parseString(rough_string)
     return reparsed.toprettyxml(indent="    ")
 
-@typechecked
-def wrd_nchar(
-        token,
-        features: dict
-    ) -> None:
-    """
-    Add word length and count to features.\n
+# Rule constants
+NON_WORD_POS = frozenset(["PUNCT", "SYM", "SPACE", "X"])
+PP1 = frozenset("i we our us my me ourselves myself".split())
+PP2 = frozenset("you your yourself ya thy thee thine".split())
+PP3 = frozenset("he she they their his them her him themselves himself herself".split())
+PP3_IT = frozenset(["it"])
+PP_ALL = PP1 | PP2 | PP3 | PP3_IT
+DEMONSTRATIVES = frozenset(["this", "that", "these", "those"])
+INDEFINITES = frozenset("everybody everyone everything somebody someone something anybody anyone anything nobody noone none nothing one ones".split())
+CONTRACTIONS = frozenset("'m 'll n't 're 's".split())
+COORDINATORS = frozenset(["and", "or"])
+WH_TAGS = frozenset(["WDT", "WP", "WP$", "WRB"])
+MODALS_POSSIBILITY = frozenset("can may might could".split())
+MODALS_NECESSITY = frozenset("ought must should".split())
+MODALS_PREDICTIVE = frozenset("will would shall".split())
+THAT0_VERBS = frozenset("check consider ensure illustrate fear say assume understand hold appreciate insist feel reveal indicate wish decide express follow suggest saw direct pray observe record imagine see think show confirm ask meant acknowledge recognize need accept contend come maintain believe claim verify demonstrate learn hope thought reflect deduce prove find deny wrote read repeat remember admit adds advise compute reach trust yield state describe realize expect mean report know stress note told held explain hear gather establish suppose found use fancy submit doubt felt".split())
+THAT0_CHILD_BLOCKERS = frozenset(["that", "who", "what", "how", "where", "why", "when", "whose", "whom", "whomever"])
+THAT0_PREV_BLOCKERS = THAT0_CHILD_BLOCKERS | frozenset(["whatever", "which"])
+THAT0_NEXT_BLOCKERS = THAT0_PREV_BLOCKERS | frozenset(['"', "'", ",", ":", "myself", "itself", "herself", "ourself", "ourselves", "themselves", "themself"])
+TO_VERB_CLASSES = frozenset("to_speech_act_verb cognition_verb desire_verb to_causative_verb probability_verb".split())
+TO_ADJ_CLASSES = frozenset("certainty_adj ability_willingness_adj personal_affect_adj ease_difficulty_adj evaluative_adj".split())
+VERB_CLASSES = frozenset("activity_verb communication_verb mental_verb causation_verb occurrence_verb existence_verb aspectual_verb that_nonfactive_verb attitudinal_verb factive_verb likelihood_verb".split())
+INTRANSITIVE_PHRASAL_CLASSES = frozenset("intransitive_activity_phrasal_verb intransitive_occurence_phrasal_verb copular_phrasal_verb intransitive_aspectual_phrasal_verb".split())
+TRANSITIVE_PHRASAL_CLASSES = frozenset("transitive_activity_phrasal_verb transitive_mental_phrasal_verb transitive_communication_phrasal_verb".split())
+ATTRIBUTIVE_ADJ_CLASSES = frozenset("size_attributive_adj time_attributive_adj color_attributive_adj evaluative_attributive_adj relational_attributive_adj topical__attributive_adj".split())
+ADVERB_CLASSES = frozenset("discourse_particle place_adverbials time_adverbials conjuncts_adverb downtoners_adverb hedges_adverb amplifiers_adverb emphatics".split())
+ADVERB_SEMANTIC_CLASSES = frozenset("attitudinal_adverb factive_adverb likelihood_adverb nonfactive_adverb".split())
+DISCOURSE_PARTICLES = frozenset("well now anyway anyhow anyways".split())
+THAT_VERB_CLASSES = frozenset("nonfactive_verb attitudinal_verb factive_verb likelihood_verb".split())
+THAT_NOUN_CLASSES = frozenset("nn_nonfactive nn_attitudinal nn_factive_noun nn_likelihood".split())
+
+class DocTables:
+    """
+    Per-document token attributes, built once and read by the tagging rules instead of the spaCy objects.\n
+    Each attribute is a column indexed by the token position in the document; negative positions wrap around and
+    positions past the end raise `IndexError`, as with `Doc` indexing.\n
     ---
     ### Args
-    - `token`: the token.
-    - `features` (`dict`): the features dictionary.
+    - `document` (`spacy.tokens.Doc`): the parsed document.
+    """
+    __slots__ = (
+        "document", "text", "lower", "lemma", "lemma_lower", "pos", "tag", "dep", "head", "children", "child_deps",
+        "sents", "question", "pos_ids", "dep_ids", "lemma_ids", "heads", "lengths"
+    )
+
+    def __init__(self, document) -> None:
+        import numpy
+        from spacy.attrs import ORTH, LEMMA, POS, TAG, DEP, HEAD, LENGTH
+        from spacy.strings import get_string_id
+
+        self.document = document
+        array = document.to_array([ORTH, LEMMA, POS, TAG, DEP, HEAD, LENGTH])
+        strings = document.vocab.strings
+
+        # Resolve each distinct string once per column
+        columns = []
+        for column in range(5):
+            keys = array[:, column].tolist()
+            values = {x: strings[x] for x in set(keys)}
+            columns.append([values[x] for x in keys])
+            if column < 2:
+                values = {x: y.lower() for x, y in values.items()}
+                columns.append([values[x] for x in keys])
+        self.text, self.lower, self.lemma, self.lemma_lower, self.pos, self.tag, self.dep = columns
+
+        # Integer columns, for the bulk counts
+        self.pos_ids = array[:, 2]
+        self.dep_ids = array[:, 4]
+        # String ids of the lemmas as `lemma_text` writes them (the lowercase text for `-PRON-`)
+        self.lemma_ids = array[:, 1].copy()
+        for i in numpy.flatnonzero(self.lemma_ids == _label_id("-PRON-")).tolist():
+            self.lemma_ids[i] = get_string_id(self.lower[i])
+        self.lengths = array[:, 6].astype(numpy.int64)
+        # HEAD holds the (signed) offset to the head
+        self._link(array[:, 5].astype(numpy.int64) + numpy.arange(len(document)), [(x.start, x.end) for x in document.sents])
+
+    @classmethod
+    def from_columns(
+            cls,
+            words: List[str],
+            lemmas: List[str],
+            pos: List[str],
+            tags: List[str],
+            deps: List[str],
+            heads: List[int],
+            sents: List[Tuple[int, int]]
+        ) -> "DocTables":
+        """
+        Build the tables from saved token columns (e.g. read back from an `xml` or `vertical` output), without spaCy.\n
+        The saved lemmas are lowercased: the lemma of a proper noun is restored as its text when they only differ by case,
+        as spaCy does not lowercase them. The case of the other lemmas is lost (see `LGR_Rescore`).\n
+        ---
+        ### Args
+        - `words` (`List[str]`): the token texts.
+        - `lemmas` (`List[str]`): the lemmas.
+        - `pos` (`List[str]`): the universal POS tags.
+        - `tags` (`List[str]`): the fine-grained POS tags.
+        - `deps` (`List[str]`): the dependency relations.
+        - `heads` (`List[int]`): the positions of the heads.
+        - `sents` (`List[Tuple[int, int]]`): the `(start, end)` token positions of the sentences.\n
+        ---
+        ### Returns
+        - `DocTables`: the tables (with `document` set to `None`).
+        """
+        import numpy
+
+        if not len(words) == len(lemmas) == len(pos) == len(tags) == len(deps) == len(heads):
+            raise ValueError("The token columns must have the same length")
+        if any(not 0 <= x < len(words) for x in heads):
+            raise ValueError("Head position out of range")
+
+        self = cls.__new__(cls)
+        self.document = None
+        self.text = list(words)
+        self.lemma = [x if y == "PROPN" and z == x.lower() else z for x, y, z in zip(words, pos, lemmas)]
+        lowered = {x: x.lower() for x in set(self.text) | set(self.lemma)}
+        self.lower = [lowered[x] for x in self.text]
+        self.lemma_lower = [lowered[x] for x in self.lemma]
+        self.pos, self.tag, self.dep = list(pos), list(tags), list(deps)
+
+        from spacy.strings import get_string_id
+
+        label_ids = {x: _label_id(x) for x in set(pos) | set(deps)}
+        self.pos_ids = numpy.array([label_ids[x] for x in pos], dtype=numpy.uint64)
+        self.dep_ids = numpy.array([label_ids[x] for x in deps], dtype=numpy.uint64)
+        lemma_keys = [x if y == "-PRON-" else y for x, y in zip(self.lower, self.lemma)]
+        string_ids = {x: get_string_id(x) for x in set(lemma_keys)}
+        self.lemma_ids = numpy.array([string_ids[x] for x in lemma_keys], dtype=numpy.uint64)
+        self.lengths = numpy.array([len(x) for x in words], dtype=numpy.int64)
+        self._link(numpy.array(heads, dtype=numpy.int64), sents)
+        return self
+
+    def _link(
+            self,
+            heads,
+            sents: List[Tuple[int, int]]
+        ) -> None:
+        """
+        Set the dependency and sentence columns from the head positions (a NumPy array) and the sentence bounds.
+        """
+        self.heads = heads
+        self.head = head = heads.tolist()
+        self.children = children = [[] for _ in head]
+        for i, x in enumerate(head):
+            if x != i:
+                children[x].append(i)
+        dep = self.dep
+        self.child_deps = [frozenset(dep[x] for x in y) if y else frozenset() for y in children]
+
+        self.sents = list(sents)
+        self.question = []
+        for start, end in self.sents:
+            self.question.extend(["?" in self.text[start:end]] * (end - start))
+
+    def __len__(self) -> int:
+        return len(self.head)
+
+_last_tables = None
+
+def _doc_tables(document) -> DocTables:
+    """
+    Return the tables of `document`, reusing those of the last document (used by the public rule functions).
+    """
+    global _last_tables
+    if _last_tables is None or _last_tables.document is not document or len(_last_tables) != len(document):
+        _last_tables = DocTables(document)
+    return _last_tables
+
+# Dependents counted on nouns, as `<dep>_dep`
+NOMINAL_DEPS = ("relcl", "amod", "det", "prep", "poss", "cc")
+
+@functools.lru_cache(maxsize=None)
+def _label_id(label: str) -> int:
+    from spacy.strings import get_string_id
+    return get_string_id(label)
+
+def _complexity_counts(
+        tables: DocTables,
+        lemma_text: bool = True,
+        lemma_keys: bool = False
+    ) -> dict:
     """
-    if token.pos_ not in ["PUNCT", "SYM", "SPACE", "X"]:
-        features["wrd_length"] += len(token.text)
+    Compute the word, noun phrase and clausal complexity counts of a document in bulk.\n
+    These are the counts of `wrd_nchar`, `noun_phrase_complexity` and `clausal_complexity`, summed over the tokens
+    (with `lemma_text` only if `lemma_text` is set). With `lemma_keys`, the words are also returned as their lemma and
+    POS ids (as a one-chunk list of arrays, so that `_merge_counts` concatenates them), for the MATTR without the
+    `lemma_text` strings.
+    """
+    import numpy
+
+    pos, dep, heads = tables.pos_ids, tables.dep_ids, tables.heads
+    n = len(tables)
+
+    # Dependents (non-root tokens) and their number per head
+    dependent = heads != numpy.arange(n)
+    n_children = numpy.bincount(heads[dependent], minlength=n)
+
+    word = pos != _label_id("PUNCT")
+    for x in NON_WORD_POS - {"PUNCT"}:
+        word &= pos != _label_id(x)
+    noun = pos == _label_id("NOUN")
+    noun_dependent = dependent & noun[heads]
+    clause = (pos == _label_id("VERB")) & (dep != _label_id("aux"))
+    subject = numpy.bincount(heads[dependent & ((dep == _label_id("nsubj")) | (dep == _label_id("nsubjpass")))], minlength=n) > 0
+    finite = clause & subject
+    independent = finite & ((dep == _label_id("ROOT")) | (dep == _label_id("conj")))
+
+    counts = {
+        "wrd_length": int(tables.lengths[word].sum()),
+        "nwords": int(numpy.count_nonzero(word)),
+    }
+    if lemma_text:
+        lemma, lower, pos_names = tables.lemma, tables.lower, tables.pos
+        counts["lemma_text"] = [f"{lower[i] if lemma[i] == '-PRON-' else lemma[i]}_{pos_names[i]}" for i in numpy.flatnonzero(word).tolist()]
+    if lemma_keys:
+        counts["lemma_keys"] = [(tables.lemma_ids[word], pos[word])]
+    counts.update({
+        "np": int(numpy.count_nonzero(noun)),
+        "np_deps": int(n_children[noun].sum()),
+    })
+    for x in NOMINAL_DEPS:
+        counts[f"{x}_dep"] = int(numpy.count_nonzero(noun_dependent & (dep == _label_id(x))))
+    counts.update({
+        "all_clauses": int(numpy.count_nonzero(clause)),
+        "finite_clause": int(numpy.count_nonzero(finite)),
+        "finite_ind_clause": int(numpy.count_nonzero(independent)),
+        "finite_dep_clause": int(numpy.count_nonzero(finite & ~independent)),
+        "finite_compl_clause": int(numpy.count_nonzero(finite & (dep == _label_id("ccomp")))),
+        "finite_relative_clause": int(numpy.count_nonzero(finite & (dep == _label_id("relcl")))),
+        "nonfinite_clause": int(numpy.count_nonzero(clause & ~subject)),
+        "vp_deps": int(n_children[clause].sum()),
+    })
+    return counts
+
+# Table-based rules, all called as `rule(i, words_count, tables, tokens, features)`
+
+def _wrd_nchar(i, words_count, tables, tokens, features):
+    pos = tables.pos[i]
+    if pos not in NON_WORD_POS:
+        text = tables.text[i]
+        features["wrd_length"] += len(text)
         features["nwords"] += 1
-        lemma = token.text.lower() if token.lemma_ == "-PRON-" else token.lemma_
-        features["lemma_text"].append(f"{lemma}_{token.pos_}")
+        lemma = tables.lower[i] if tables.lemma[i] == "-PRON-" else tables.lemma[i]
+        features["lemma_text"].append(f"{lemma}_{pos}")
 
-@typechecked
-def noun_phrase_complexity(
-        token,
-        features: dict
-    ) -> None:
-    """
-    Analyze noun phrase complexity.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.pos_ == "NOUN":
+def _noun_phrase_complexity(i, words_count, tables, tokens, features):
+    if tables.pos[i] == "NOUN":
         features["np"] += 1
-        deps = [child.dep_ for child in token.children]
-        features["np_deps"] += len(deps)
-        for x in deps:
+        children = tables.children[i]
+        features["np_deps"] += len(children)
+        for x in children:
+            x = tables.dep[x]
             if x == "relcl": features["relcl_dep"] += 1
             if x == "amod": features["amod_dep"] += 1
             if x == "det": features["det_dep"] += 1
@@ -267,414 +643,607 @@ def noun_phrase_complexity(
             if x == "poss": features["poss_dep"] += 1
             if x == "cc": features["cc_dep"] += 1
 
-@typechecked
-def clausal_complexity(
-        token,
-        features: dict
-    ) -> None:
-    """
-    Analyze clausal complexity.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.pos_ == "VERB" and token.dep_ != "aux":
+def _clausal_complexity(i, words_count, tables, tokens, features):
+    dep = tables.dep[i]
+    if tables.pos[i] == "VERB" and dep != "aux":
         features["all_clauses"] += 1
-        deps = [child.dep_ for child in token.children]
+        deps = tables.child_deps[i]
         if "nsubj" in deps or "nsubjpass" in deps:
             features["finite_clause"] += 1
-            features["finite_ind_clause" if token.dep_ in ["ROOT", "conj"] else "finite_dep_clause"] += 1
-            if token.dep_ == "ccomp": features["finite_compl_clause"] += 1
-            if token.dep_ == "relcl": features["finite_relative_clause"] += 1
+            features["finite_ind_clause" if dep in ["ROOT", "conj"] else "finite_dep_clause"] += 1
+            if dep == "ccomp": features["finite_compl_clause"] += 1
+            if dep == "relcl": features["finite_relative_clause"] += 1
         else:
             features["nonfinite_clause"] += 1
-        features["vp_deps"] += len(deps)
+        features["vp_deps"] += len(tables.children[i])
 
-@typechecked
-def basic_info(
-        token,
-        tokens: dict
-    ) -> None:
-    """
-    Populate basic information for a token.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    """
+def _basic_info(i, tables, tokens):
+    head = tables.head[i]
     tokens.update({
-        "word": token.text,
-        "lemma": token.lemma_.lower(),
-        "pos": token.pos_,
-        "tag": token.tag_,
-        "idx": str(token.i),
-        "dep_rel": token.dep_,
-        "head": token.head.text,
-        "head idx": str(token.head.i)
+        "word": tables.text[i],
+        "lemma": tables.lemma_lower[i],
+        "pos": tables.pos[i],
+        "tag": tables.tag[i],
+        "idx": str(i),
+        "dep_rel": tables.dep[i],
+        "head": tables.text[head],
+        "head idx": str(head)
     })
 
-@typechecked
-def pronoun_analysis(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze pronouns.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    pp1 = "i we our us my me ourselves myself".split()
-    pp2 = "you your yourself ya thy thee thine".split()
-    pp3 = "he she they their his them her him themselves himself herself".split()
-    pp3_it = ["it"]
-    pp_all = pp1 + pp2 + pp3 + pp3_it
-
-    if token.text.lower() in pp_all:
+def _pronoun_analysis(i, words_count, tables, tokens, features):
+    lower = tables.lower[i]
+    if lower in PP_ALL:
         features["pp_all"] += 1
         tokens["main_tag"] = "pp_all"
 
-    if token.text.lower() in pp1:
+    if lower in PP1:
         features["pp1"] += 1
         tokens["spec_tag1"] = "pp1"
-    elif token.text.lower() in pp2:
+    elif lower in PP2:
         features["pp2"] += 1
         tokens["spec_tag1"] = "pp2"
-    elif token.text.lower() in pp3:
+    elif lower in PP3:
         features["pp3"] += 1
         tokens["spec_tag1"] = "pp3"
-    elif token.text.lower() in pp3_it:
+    elif lower in PP3_IT:
         features["pp3_it"] += 1
         tokens["spec_tag1"] = "pp3_it"
 
-@typechecked
-def advanced_pronoun(
-        token,
-        document,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze advanced pronouns.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `document`: the document.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    demonstrative_list = ["this", "that", "these", "those"]
-    indefinite_l = "everybody everyone everything somebody someone something anybody anyone anything nobody noone none nothing one ones".split()
-
-    if token.text.lower() in indefinite_l and token.dep_ in ["nsubj", "nsubjpass", "dobj", "pobj"]:
+def _advanced_pronoun(i, words_count, tables, tokens, features):
+    lower = tables.lower[i]
+    dep = tables.dep[i]
+    if lower in INDEFINITES and dep in ["nsubj", "nsubjpass", "dobj", "pobj"]:
         features["pp_indefinite"] += 1
         tokens["spec_tag1"] = "pp_indefinite"
-    elif token.text.lower() in demonstrative_list:
-        if token.dep_ == "advmod" or (
-            token.i + 1 < len(document) and document[token.i + 1].text.lower() in ["who", ".", "!", "?", ":"]
+    elif lower in DEMONSTRATIVES:
+        head = tables.head[i]
+        if dep == "advmod" or (
+            i + 1 < len(tables) and tables.lower[i + 1] in ["who", ".", "!", "?", ":"]
         ) or (
-            token.dep_ == "nsubjpass" and token.head.dep_ != "relcl"
+            dep == "nsubjpass" and tables.dep[head] != "relcl"
         ) or (
-            token.dep_ == "pobj"
+            dep == "pobj"
         ) or (
-            token.dep_ in ["nsubj", "dobj"] and token.head.dep_ != "relcl" and token.head.pos_ != "NOUN"
+            dep in ["nsubj", "dobj"] and tables.dep[head] != "relcl" and tables.pos[head] != "NOUN"
         ):
             features["pp_demonstrative"] += 1
             tokens["spec_tag1"] = "pp_demonstrative"
 
-@typechecked
-def pro_verb(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze pro-verbs.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.lemma_ == "do" and token.pos_ == "VERB" and token.dep_ != "aux":
-        if not any(child.dep_ in ["dobj", "ccomp"] for child in token.children):
+def _pro_verb(i, words_count, tables, tokens, features):
+    if tables.lemma[i] == "do" and tables.pos[i] == "VERB" and tables.dep[i] != "aux":
+        deps = tables.child_deps[i]
+        if "dobj" not in deps and "ccomp" not in deps:
             features["pv_do"] += 1
             tokens["spec_tag2"] = "pv_do"
 
-@typechecked
-def contraction_check(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Check for contractions.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.text.lower() in "'m 'll n't 're 's".split() and token.dep_ != "case":
+def _contraction_check(i, words_count, tables, tokens, features):
+    if tables.lower[i] in CONTRACTIONS and tables.dep[i] != "case":
         features["contraction"] += 1
         tokens["spec_tag4"] = "contraction"
 
-@typechecked
-def split_aux_check(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Check for split auxiliaries.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.pos_ == "VERB" and token.dep_ not in ["aux", "aux_pass"]:
-        end = token.i
-        start = next((x.i for x in token.children if x.dep_ in ["aux", "aux_pass"]), None)
-        adv = next((x.i for x in token.children if x.dep_ == "advmod"), None)
-        if start is not None and adv is not None and start < adv < end:
+def _split_aux_check(i, words_count, tables, tokens, features):
+    if tables.pos[i] == "VERB" and tables.dep[i] not in ["aux", "aux_pass"]:
+        deps = tables.child_deps[i]
+        if "advmod" not in deps or ("aux" not in deps and "aux_pass" not in deps):
+            return
+        dep = tables.dep
+        children = tables.children[i]
+        start = next(x for x in children if dep[x] in ["aux", "aux_pass"])
+        adv = next(x for x in children if dep[x] == "advmod")
+        if start < adv < i:
             features["split_aux"] += 1
             tokens["spec_tag2"] = "split_aux"
 
-@typechecked
-def prep_analysis(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze prepositions.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.dep_ == "mark":
-        if token.text.lower() == "because":
+def _prep_analysis(i, words_count, tables, tokens, features):
+    dep = tables.dep[i]
+    if dep == "mark":
+        lower = tables.lower[i]
+        if lower == "because":
             features["adverbial_subordinator_causitive"] += 1
             tokens["spec_tag3"] = "adverbial_subordinator_causitive"
-        elif token.text.lower() in ["if", "unless"]:
+        elif lower in ["if", "unless"]:
             features["adverbial_subordinator_conditional"] += 1
             tokens["spec_tag3"] = "adverbial_subordinator_conditional"
-        elif token.text.lower() not in ["that"]:
+        elif lower not in ["that"]:
             features["adverbial_subordinator_other"] += 1
             tokens["spec_tag3"] = "adverbial_subordinator_other"
-    elif token.dep_ == "prep":
-        if any(child.dep_ in ["pobj", "pcomp", "prep", "amod", "cc"] for child in token.children):
+    elif dep == "prep":
+        if not tables.child_deps[i].isdisjoint(["pobj", "pcomp", "prep", "amod", "cc"]):
             features["prep_phrase"] += 1
             tokens["main_tag"] = "prep_phrase"
 
-@typechecked
-def coordination_analysis(
-        token,
-        words_count: int,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze coordination.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `words_count` (`int`): the words count.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.text.lower() in ["and", "or"]:
+def _coordination_analysis(i, words_count, tables, tokens, features):
+    if tables.lower[i] in COORDINATORS:
+        head = tables.head[i]
         if words_count == 0:
             features["cc_clause"] += 1
             tokens["spec_tag1"] = "cc_clause"
-        elif token.head.pos_ in ["NOUN", "ADJ", "ADV", "PRON", "PROPN", "PART"]:
+        elif tables.pos[head] in ["NOUN", "ADJ", "ADV", "PRON", "PROPN", "PART"]:
             features["cc_phrase"] += 1
             tokens["spec_tag1"] = "cc_phrase"
-        elif token.head.pos_ == "VERB":
-            l = sorted(
-                [(child.i, "cc_clause" if child.dep_ == "conj" and "nsubj" in [chld.dep_ for chld in child.children] else "cc_phrase") for child in token.head.children if child.dep_ in ["cc", "conj"]],
-                key=lambda x: x[0]
-            )
-            for i, (idx, relation) in enumerate(l):
-                if idx == token.i:
-                    next_relation = l[i + 1][1] if i + 1 < len(l) else "cc_clause"
+        elif tables.pos[head] == "VERB":
+            # Children are in document order
+            dep = tables.dep
+            l = [(x, "cc_clause" if dep[x] == "conj" and "nsubj" in tables.child_deps[x] else "cc_phrase") for x in tables.children[head] if dep[x] in ["cc", "conj"]]
+            for j, (idx, relation) in enumerate(l):
+                if idx == i:
+                    next_relation = l[j + 1][1] if j + 1 < len(l) else "cc_clause"
                     features[next_relation] += 1
                     tokens["spec_tag1"] = next_relation
                     break
 
-@typechecked
-def noun_analysis(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze nouns.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.pos_ in ["NOUN", "PROPN"]:
+def _noun_analysis(i, words_count, tables, tokens, features):
+    nominal_stop = _lexicon.nominal_stop
+    nominal_suffix_trie = _lexicon.nominal_suffix_trie
+    proper_suffix_trie = _lexicon.proper_suffix_trie
+    pos = tables.pos[i]
+    if pos in ["NOUN", "PROPN"]:
         features["nn_all"] += 1
         tokens["main_tag"] = "nn_all"
-        nominal_suffixes = {
-            6: ["nesses"],
-            5: ["ician", "ities", "ances", "ences", "ments", "tions", "ships", "esses", "ettes", "hoods"],
-            4: ["ance", "ence", "ment", "ness", "tion", "ship", "ette", "hood", "cies", "ries", "ants", "ents", "doms", "ings", "ages", "fuls", "isms", "ists", "ites", "lets", "eses", "ates"],
-            3: ["ant", "ent", "dom", "ing", "ity", "ure", "age", "ese", "ess", "ful", "ism", "ist", "ite", "let", "als", "ees", "ers", "ors", "ate"],
-            2: ["al", "cy", "ee", "er", "or", "ry"],
-        }
-        proper_suffixes = {
-            4: ["ians"],
-            3: ["ian", "ans"],
-            2: ["an"],
-        }
-        if token.lemma_.lower() not in nominal_stop:
-            for length, suffixes in nominal_suffixes.items():
-                if len(token.text) > length and token.text.lower()[-length:] in suffixes:
-                    features["nominalization"] += 1
-                    tokens["spec_tag1"] = "nominalization"
-                    break
-            else:
-                for length, suffixes in proper_suffixes.items():
-                    if len(token.text) > length and token.pos_ == "PROPN" and token.text.lower()[-length:] in suffixes:
-                        features["nominalization"] += 1
-                        tokens["spec_tag1"] = "nominalization"
-                        break
-
-@typechecked
-def semantic_analysis_noun(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze semantic tags for nouns.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.pos_ in ["NOUN", "PROPN"]:
-        lemma = token.lemma_.lower()
+        if tables.lemma_lower[i] not in nominal_stop:
+            lower = tables.lower[i]
+            length = len(tables.text[i])
+            if nominal_suffix_trie.match(lower, length) or (pos == "PROPN" and proper_suffix_trie.match(lower, length)):
+                features["nominalization"] += 1
+                tokens["spec_tag1"] = "nominalization"
+
+def _semantic_analysis_noun(i, words_count, tables, tokens, features):
+    noun_dict = _lexicon.noun_dict
+    if tables.pos[i] in ["NOUN", "PROPN"]:
+        lemma = tables.lemma_lower[i]
         if lemma in noun_dict and noun_dict[lemma] in categories:
             features[noun_dict[lemma]] += 1
             tokens["semantic_tag1"] = noun_dict[lemma]
 
-@typechecked
-def be_analysis(
-        token,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze `'be'` verbs.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    if token.lemma_.lower() == "be" and token.dep_ not in ["aux", "auxpass"]:
+def _be_analysis(i, words_count, tables, tokens, features):
+    if tables.lemma_lower[i] == "be" and tables.dep[i] not in ["aux", "auxpass"]:
         features["be_mv"] += 1
         tokens["spec_tag2"] = "be_mv"
 
-@typechecked
-def verb_analysis(
-        token,
-        document,
-        tokens: dict,
-        features: dict
-    ) -> None:
-    """
-    Analyze verbs.\n
-    ---
-    ### Args
-    - `token`: the token.
-    - `document`: the document.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    that0_list = "check consider ensure illustrate fear say assume understand hold appreciate insist feel reveal indicate wish decide express follow suggest saw direct pray observe record imagine see think show confirm ask meant acknowledge recognize need accept contend come maintain believe claim verify demonstrate learn hope thought reflect deduce prove find deny wrote read repeat remember admit adds advise compute reach trust yield state describe realize expect mean report know stress note told held explain hear gather establish suppose found use fancy submit doubt felt".split()
-    to_verb_list = "to_speech_act_verb cognition_verb desire_verb to_causative_verb probability_verb".split()
-    to_adj_list = "certainty_adj ability_willingness_adj personal_affect_adj ease_difficulty_adj evaluative_adj".split()
-
-    if token.pos_ == "VERB":
+def _verb_analysis(i, words_count, tables, tokens, features):
+    to_verb_dict = _lexicon.to_verb_dict
+    adj_dict = _lexicon.adj_dict
+    if tables.pos[i] == "VERB":
         features["verb"] += 1
         tokens["main_tag"] = "verb"
-        if token.dep_ == "aux":
-            if token.text in "can may might could".split():
+        dep = tables.dep[i]
+        tag = tables.tag[i]
+        if dep == "aux":
+            text = tables.text[i]
+            if text in MODALS_POSSIBILITY:
                 features["modal_possibility"] += 1
                 tokens["spec_tag5"] = "modal_possibility"
-            elif token.text in "ought must should".split():
+            elif text in MODALS_NECESSITY:
                 features["modal_necessity"] += 1
                 tokens["spec_tag5"] = "modal_necessity"
-            elif token.text in "will would shall".split():
+            elif text in MODALS_PREDICTIVE:
                 features["modal_predictive"] += 1
                 tokens["spec_tag5"] = "modal_predictive"
-            elif token.tag_ == "VBD":
+            elif tag == "VBD":
                 features["past_tense"] += 1
                 tokens["spec_tag4"] = "past_tense"
             else:
                 features["non_past_tense"] += 1
                 tokens["spec_tag1"] = "non_past_tense"
         else:
-            if token.head.lemma_ in that0_list and token.dep_ == "ccomp" and token.i > token.head.i:
+            head = tables.head[i]
+            if tables.lemma[head] in THAT0_VERBS and dep == "ccomp" and i > head:
+                children = tables.children[i]
                 if all(
-                    x.text.lower() not in ["that", "who", "what", "how", "where", "why", "when", "whose", "whom", "whomever"] and x.dep_ != "det"
-                    for x in token.children
-                ) and not any(
-                    x.dep_ == "mark" or x.dep_ in ["nsubj", "csubj"] for x in token.children
-                ) and token.tag_ != "VBG":
-                    if document[token.head.i - 1].text not in ["that", "who", "what", "how", "where", "why", "when", "whose", "whom", "whomever", "whatever", "which"]:
-                        if document[token.head.i + 1].text not in ["that", "who", "what", "how", "where", "why", "when", "whose", "whom", "whomever", "whatever", "which", '"', "'", ",", ":", "myself", "itself", "herself", "ourself", "ourselves", "themselves", "themself"]:
-                            if " ".join([document[token.head.i + 1].text, document[token.head.i + 2].text]) not in ["' ,", '" ,']:
+                    tables.lower[x] not in THAT0_CHILD_BLOCKERS and tables.dep[x] != "det"
+                    for x in children
+                ) and tables.child_deps[i].isdisjoint(["mark", "nsubj", "csubj"]) and tag != "VBG":
+                    text = tables.text
+                    if text[head - 1] not in THAT0_PREV_BLOCKERS:
+                        if text[head + 1] not in THAT0_NEXT_BLOCKERS:
+                            if " ".join([text[head + 1], text[head + 2]]) not in ["' ,", '" ,']:
                                 features["complementizer_that0"] += 1
                                 tokens["spec_tag6"] = "complementizer_that0"
-            if token.dep_ == "acl" and token.tag_ == "VBN":
+            if dep == "acl" and tag == "VBN":
                 features["past_participial_clause"] += 1
                 tokens["spec_tag6"] = "past_participial_clause"
-            if document[token.i - 1].text.lower() == "to" and document[token.i - 1].dep_ == "aux" and document[token.i - 1].head.i == token.i:
-                contr_token = document[token.i - 2]
-                if contr_token.text.lower() not in ["able", "ought"]:
+            if tables.lower[i - 1] == "to" and tables.dep[i - 1] == "aux" and tables.head[i - 1] == i:
+                contr = i - 2
+                if tables.lower[contr] not in ["able", "ought"]:
                     features["to_clause"] += 1
                     tokens["spec_tag4"] = "to_clause"
-                    if contr_token.pos_ == "NOUN":
+                    contr_pos = tables.pos[contr]
+                    contr_lemma = tables.lemma[contr]
+                    if contr_pos == "NOUN":
                         features["to_clause_noun"] += 1
                         tokens["spec_tag5"] = "to_clause_noun"
-                    if contr_token.pos_ == "VERB":
+                    if contr_pos == "VERB":
                         features["to_clause_verb"] += 1
                         tokens["spec_tag5"] = "to_clause_verb"
-                        if contr_token.lemma_ in to_verb_dict and to_verb_dict[contr_token.lemma_] in to_verb_list:
-                            features[f"to_clause_verb_{to_verb_dict[contr_token.lemma_][:-5]}"] += 1
-                            tokens["semantic_tag2"] = f"to_clause_verb_{to_verb_dict[contr_token.lemma_][:-5]}"
-                    if contr_token.pos_ == "ADJ":
+                        if contr_lemma in to_verb_dict and to_verb_dict[contr_lemma] in TO_VERB_CLASSES:
+                            features[f"to_clause_verb_{to_verb_dict[contr_lemma][:-5]}"] += 1
+                            tokens["semantic_tag2"] = f"to_clause_verb_{to_verb_dict[contr_lemma][:-5]}"
+                    if contr_pos == "ADJ":
                         features["to_clause_adjective"] += 1
                         tokens["spec_tag5"] = "to_clause_adjective"
-                        if contr_token.lemma_ in adj_dict and adj_dict[contr_token.lemma_] in to_adj_list:
-                            features[f"to_clause_adjective_{adj_dict[contr_token.lemma_][:-4]}"] += 1
-                            tokens["semantic_tag2"] = f"to_clause_adjective_{adj_dict[contr_token.lemma_][:-4]}"
-            if token.tag_ == "VBD":
+                        if contr_lemma in adj_dict and adj_dict[contr_lemma] in TO_ADJ_CLASSES:
+                            features[f"to_clause_adjective_{adj_dict[contr_lemma][:-4]}"] += 1
+                            tokens["semantic_tag2"] = f"to_clause_adjective_{adj_dict[contr_lemma][:-4]}"
+            if tag == "VBD":
                 features["past_tense"] += 1
                 tokens["spec_tag1"] = "past_tense"
-            elif token.tag_ in ["VBN", "VBG"]:
-                if any(x.lemma_ == "have" and x.dep_ == "aux" for x in token.children):
+            elif tag in ["VBN", "VBG"]:
+                if any(tables.lemma[x] == "have" and tables.dep[x] == "aux" for x in tables.children[i]):
                     features["perfect_aspect"] += 1
                     tokens["spec_tag1"] = "perfect_aspect"
             else:
                 features["non_past_tense"] += 1
                 tokens["spec_tag1"] = "non_past_tense"
 
+def _passive_analysis(i, words_count, tables, tokens, features):
+    if tables.pos[i] == "VERB" and "auxpass" in tables.child_deps[i]:
+        if "agent" in tables.child_deps[i]:
+            features["by_passive"] += 1
+            tokens["spec_tag3"] = "by_passive"
+        else:
+            features["agentless_passive"] += 1
+            tokens["spec_tag3"] = "agentless_passive"
+
+def _semantic_analysis_verb(i, words_count, tables, tokens, features):
+    phrasal_verb_dict = _lexicon.phrasal_verb_dict
+    verb_dict = _lexicon.verb_dict
+    if tables.pos[i] == "VERB":
+        lemma = tables.lemma_lower[i]
+        deps = tables.child_deps[i]
+        if "prt" in deps:
+            for x in tables.children[i]:
+                if tables.dep[x] == "prt":
+                    phrasal = f"{lemma} {tables.text[x]}"
+                    if phrasal in phrasal_verb_dict:
+                        features["all_phrasal_verbs"] += 1
+                        tokens["main_tag2"] = "all_phrasal_verbs"
+                        if "dobj" in deps:
+                            if phrasal_verb_dict[phrasal] in TRANSITIVE_PHRASAL_CLASSES:
+                                features[phrasal_verb_dict[phrasal]] += 1
+                                tokens["semantic_tag1"] = phrasal_verb_dict[phrasal]
+                        else:
+                            if phrasal_verb_dict[phrasal] in INTRANSITIVE_PHRASAL_CLASSES:
+                                features[phrasal_verb_dict[phrasal]] += 1
+                                tokens["semantic_tag1"] = phrasal_verb_dict[phrasal]
+        else:
+            if lemma in verb_dict and verb_dict[lemma] in VERB_CLASSES:
+                features[verb_dict[lemma]] += 1
+                tokens["semantic_tag1"] = verb_dict[lemma]
+
+def _adjective_analysis(i, words_count, tables, tokens, features):
+    adj_dict = _lexicon.adj_dict
+    dep = tables.dep[i]
+    if dep in ["acomp"]:
+        features["jj_predicative"] += 1
+        tokens["spec_tag1"] = "jj_predicative"
+        lemma = tables.lemma_lower[i]
+        if lemma in adj_dict and adj_dict[lemma] in ATTRIBUTIVE_ADJ_CLASSES:
+            features[adj_dict[lemma]] += 1
+            tokens["semantic_tag1"] = adj_dict[lemma]
+    elif dep == "amod":
+        features["jj_attributive"] += 1
+        tokens["spec_tag1"] = "jj_attributive"
+
+def _adverb_analysis(i, words_count, tables, tokens, features):
+    adv_dict = _lexicon.adv_dict
+    if tables.pos[i] == "ADV" or tables.dep[i] in ["npadvmod", "advmod", "intj"]:
+        lemma = tables.lemma_lower[i]
+        if lemma in adv_dict and adv_dict[lemma] in ADVERB_CLASSES:
+            features[adv_dict[lemma]] += 1
+            tokens["spec_tag1"] = adv_dict[lemma]
+        if words_count == 0 and tables.lower[i] in DISCOURSE_PARTICLES:
+            features["discourse_particle"] += 1
+            tokens["spec_tag1"] = "discourse_particle"
+        elif lemma in adv_dict and adv_dict[lemma] in ADVERB_SEMANTIC_CLASSES:
+            features[adv_dict[lemma]] += 1
+            tokens["semantic_tag1"] = adv_dict[lemma]
+
+def _wh_analysis(i, words_count, tables, tokens, features, question=None):
+    # `question`: whether the sentence is a question (by default, the sentence of the token in the tables)
+    if tables.tag[i] in WH_TAGS and tables.lower[i] != "that":
+        dep = tables.dep[i]
+        head = tables.head[i]
+        head_dep = tables.dep[head]
+        if head_dep not in ["csubj", "ccomp", "pcomp"] and (words_count == 0 or tables.text[i - 1] in ['"', "'", ":"]) and (tables.question[i] if question is None else question):
+            features["wh_question"] += 1
+            tokens["spec_tag1"] = "wh_question"
+        if tables.pos[i - 1] == "VERB" and tables.lemma[i - 1] != "be":
+            if head_dep != "advcl":
+                features["wh_clause"] += 1
+                tokens["spec_tag1"] = "wh_clause"
+        if dep == "pobj" and tables.dep[tables.head[head]] == "relcl":
+            features["wh_relative_clause"] += 1
+            tokens["main_tag"] = "wh_relative_clause"
+            features["wh_relative_prep_clause"] += 1
+            tokens["spec_tag1"] = "wh_relative_prep_clause"
+        if head_dep == "relcl":
+            if dep in ["nsubj", "nsubjpass"]:
+                features["wh_relative_clause"] += 1
+                tokens["main_tag"] = "wh_relative_clause"
+                features["wh_relative_subj_clause"] += 1
+                tokens["spec_tag1"] = "wh_relative_subj_clause"
+            if dep in ["dobj"]:
+                features["wh_relative_clause"] += 1
+                tokens["main_tag"] = "wh_relative_clause"
+                features["wh_relative_obj_clause"] += 1
+                tokens["spec_tag1"] = "wh_relative_obj_clause"
+
+def _that_analysis(i, words_count, tables, tokens, features):
+    that_verb_dict = _lexicon.that_verb_dict
+    noun_dict = _lexicon.noun_dict
+    adj_dict = _lexicon.adj_dict
+    if tables.lower[i] == "that":
+        dep = tables.dep[i]
+        head_dep = tables.dep[tables.head[i]]
+        if dep in ["nsubj", "nsubjpass", "dobj", "pobj"] and head_dep == "relcl":
+            features["that_relative_clause"] += 1
+            tokens["spec_tag1"] = "that_relative_clause"
+        if dep in ["mark", "nsubj"] and head_dep in ["ccomp", "acl"]:
+            features["that_complement_clause"] += 1
+            tokens["spec_tag1"] = "that_complement_clause"
+            prev_pos = tables.pos[i - 1]
+            prev_lemma = tables.lemma_lower[i - 1]
+            if prev_pos == "VERB":
+                features["that_verb_clause"] += 1
+                tokens["spec_tag2"] = "that_verb_clause"
+                if prev_lemma in that_verb_dict and that_verb_dict[prev_lemma] in THAT_VERB_CLASSES:
+                    features[f"that_verb_clause_{that_verb_dict[prev_lemma][:-5]}"] += 1
+                    tokens["semantic_tag1"] = f"that_verb_clause_{that_verb_dict[prev_lemma][:-5]}"
+            if prev_pos == "NOUN":
+                features["that_noun_clause"] += 1
+                tokens["spec_tag2"] = "that_noun_clause"
+                if prev_lemma in noun_dict and noun_dict[prev_lemma] in THAT_NOUN_CLASSES:
+                    features[f"that_noun_clause_{noun_dict[prev_lemma][3:]}"] += 1
+                    tokens["semantic_tag1"] = f"that_noun_clause_{noun_dict[prev_lemma][3:]}"
+            if prev_pos == "ADJ":
+                features["that_adjective_clause"] += 1
+                tokens["spec_tag2"] = "that_adjective_clause"
+                if prev_lemma in adj_dict:
+                    if adj_dict[prev_lemma] == "attitudinal_adj":
+                        features["that_adjective_clause_attitudinal"] += 1
+                        tokens["semantic_tag1"] = "that_adjective_clause_attitudinal"
+                    if adj_dict[prev_lemma] == "likelihood_adj":
+                        features["that_adjective_clause_likelihood"] += 1
+                        tokens["semantic_tag1"] = "that_adjective_clause_likelihood"
+
+@typechecked
+def wrd_nchar(
+        token,
+        features: dict
+    ) -> None:
+    """
+    Add word length and count to features.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `features` (`dict`): the features dictionary.
+    """
+    _wrd_nchar(token.i, 0, _doc_tables(token.doc), None, features)
+
+@typechecked
+def noun_phrase_complexity(
+        token,
+        features: dict
+    ) -> None:
+    """
+    Analyze noun phrase complexity.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `features` (`dict`): the features dictionary.
+    """
+    _noun_phrase_complexity(token.i, 0, _doc_tables(token.doc), None, features)
+
+@typechecked
+def clausal_complexity(
+        token,
+        features: dict
+    ) -> None:
+    """
+    Analyze clausal complexity.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `features` (`dict`): the features dictionary.
+    """
+    _clausal_complexity(token.i, 0, _doc_tables(token.doc), None, features)
+
+@typechecked
+def basic_info(
+        token,
+        tokens: dict
+    ) -> None:
+    """
+    Populate basic information for a token.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    """
+    _basic_info(token.i, _doc_tables(token.doc), tokens)
+
+@typechecked
+def pronoun_analysis(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze pronouns.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _pronoun_analysis(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def advanced_pronoun(
+        token,
+        document,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze advanced pronouns.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `document`: the document (`spacy.tokens.Doc`) indexed by `token.i`.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _advanced_pronoun(token.i, 0, _doc_tables(document), tokens, features)
+
+@typechecked
+def pro_verb(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze pro-verbs.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _pro_verb(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def contraction_check(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Check for contractions.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _contraction_check(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def split_aux_check(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Check for split auxiliaries.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _split_aux_check(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def prep_analysis(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze prepositions.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _prep_analysis(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def coordination_analysis(
+        token,
+        words_count: int,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze coordination.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `words_count` (`int`): the words count.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _coordination_analysis(token.i, words_count, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def noun_analysis(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze nouns.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _noun_analysis(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def semantic_analysis_noun(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze semantic tags for nouns.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _semantic_analysis_noun(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def be_analysis(
+        token,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze `'be'` verbs.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _be_analysis(token.i, 0, _doc_tables(token.doc), tokens, features)
+
+@typechecked
+def verb_analysis(
+        token,
+        document,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze verbs.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `document`: the document (`spacy.tokens.Doc`) indexed by `token.i`.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _verb_analysis(token.i, 0, _doc_tables(document), tokens, features)
+
 @typechecked
 def passive_analysis(
         token,
@@ -689,13 +1258,7 @@ def passive_analysis(
     - `tokens` (`dict`): the tokens dictionary.
     - `features` (`dict`): the features dictionary.
     """
-    if token.pos_ == "VERB" and any(x.dep_ == "auxpass" for x in token.children):
-        if any(x.dep_ == "agent" for x in token.children):
-            features["by_passive"] += 1
-            tokens["spec_tag3"] = "by_passive"
-        else:
-            features["agentless_passive"] += 1
-            tokens["spec_tag3"] = "agentless_passive"
+    _passive_analysis(token.i, 0, _doc_tables(token.doc), tokens, features)
 
 @typechecked
 def semantic_analysis_verb(
@@ -711,31 +1274,7 @@ def semantic_analysis_verb(
     - `tokens` (`dict`): the tokens dictionary.
     - `features` (`dict`): the features dictionary.
     """
-    var_list = "activity_verb communication_verb mental_verb causation_verb occurrence_verb existence_verb aspectual_verb that_nonfactive_verb attitudinal_verb factive_verb likelihood_verb".split()
-    intransitive_phrasal_list = "intransitive_activity_phrasal_verb intransitive_occurence_phrasal_verb copular_phrasal_verb intransitive_aspectual_phrasal_verb".split()
-    transitive_phrasal_list = "transitive_activity_phrasal_verb transitive_mental_phrasal_verb transitive_communication_phrasal_verb".split()
-
-    lemma = token.lemma_.lower()
-    if token.pos_ == "VERB":
-        if "prt" in [chld.dep_ for chld in token.children]:
-            for x in token.children:
-                if x.dep_ == "prt":
-                    phrasal = f"{lemma} {x.text}"
-                    if phrasal in phrasal_verb_dict:
-                        features["all_phrasal_verbs"] += 1
-                        tokens["main_tag2"] = "all_phrasal_verbs"
-                        if "dobj" in [chld.dep_ for chld in token.children]:
-                            if phrasal in phrasal_verb_dict and phrasal_verb_dict[phrasal] in transitive_phrasal_list:
-                                features[phrasal_verb_dict[phrasal]] += 1
-                                tokens["semantic_tag1"] = phrasal_verb_dict[phrasal]
-                        else:
-                            if phrasal in phrasal_verb_dict and phrasal_verb_dict[phrasal] in intransitive_phrasal_list:
-                                features[phrasal_verb_dict[phrasal]] += 1
-                                tokens["semantic_tag1"] = phrasal_verb_dict[phrasal]
-        else:
-            if lemma in verb_dict and verb_dict[lemma] in var_list:
-                features[verb_dict[lemma]] += 1
-                tokens["semantic_tag1"] = verb_dict[lemma]
+    _semantic_analysis_verb(token.i, 0, _doc_tables(token.doc), tokens, features)
 
 @typechecked
 def adjective_analysis(
@@ -751,17 +1290,7 @@ def adjective_analysis(
     - `tokens` (`dict`): the tokens dictionary.
     - `features` (`dict`): the features dictionary.
     """
-    attr_list = "size_attributive_adj time_attributive_adj color_attributive_adj evaluative_attributive_adj relational_attributive_adj topical__attributive_adj".split()
-
-    if token.dep_ in ["acomp"]:
-        features["jj_predicative"] += 1
-        tokens["spec_tag1"] = "jj_predicative"
-        if token.lemma_.lower() in adj_dict and adj_dict[token.lemma_.lower()] in attr_list:
-            features[adj_dict[token.lemma_.lower()]] += 1
-            tokens["semantic_tag1"] = adj_dict[token.lemma_.lower()]
-    elif token.dep_ == "amod":
-        features["jj_attributive"] += 1
-        tokens["spec_tag1"] = "jj_attributive"
+    _adjective_analysis(token.i, 0, _doc_tables(token.doc), tokens, features)
 
 @typechecked
 def adverb_analysis(
@@ -779,20 +1308,7 @@ def adverb_analysis(
     - `tokens` (`dict`): the tokens dictionary.
     - `features` (`dict`): the features dictionary.
     """
-    var_list = "discourse_particle place_adverbials time_adverbials conjuncts_adverb downtoners_adverb hedges_adverb amplifiers_adverb emphatics".split()
-    var_list2 = "attitudinal_adverb factive_adverb likelihood_adverb nonfactive_adverb".split()
-
-    lemma = token.lemma_.lower()
-    if token.pos_ == "ADV" or token.dep_ in ["npadvmod", "advmod", "intj"]:
-        if lemma in adv_dict and adv_dict[lemma] in var_list:
-            features[adv_dict[lemma]] += 1
-            tokens["spec_tag1"] = adv_dict[lemma]
-        if words_count == 0 and token.text.lower() in "well now anyway anyhow anyways".split():
-            features["discourse_particle"] += 1
-            tokens["spec_tag1"] = "discourse_particle"
-        elif lemma in adv_dict and adv_dict[lemma] in var_list2:
-            features[adv_dict[lemma]] += 1
-            tokens["semantic_tag1"] = adv_dict[lemma]
+    _adverb_analysis(token.i, words_count, _doc_tables(token.doc), tokens, features)
 
 @typechecked
 def wh_analysis(
@@ -809,192 +1325,525 @@ def wh_analysis(
     ### Args
     - `token`: the token.
     - `words_count` (`int`): the words count.
-    - `document`: the document.
-    - `document_sentence`: the document sentence.
+    - `document`: the document (`spacy.tokens.Doc`) indexed by `token.i`.
+    - `document_sentence`: the sentence of the token (a WH-question if it holds a `"?"`).
     - `tokens` (`dict`): the tokens dictionary.
     - `features` (`dict`): the features dictionary.
     """
-    if token.tag_ in ["WDT", "WP", "WP$", "WRB"] and token.text.lower() != "that":
-        if token.head.dep_ not in ["csubj", "ccomp", "pcomp"] and (words_count == 0 or document[token.i - 1].text in ['"', "'", ":"]) and "?" in [t.text for t in document_sentence]:
-            features["wh_question"] += 1
-            tokens["spec_tag1"] = "wh_question"
-        if document[token.i - 1].pos_ == "VERB" and document[token.i - 1].lemma_ != "be":
-            if token.head.dep_ != "advcl":
-                features["wh_clause"] += 1
-                tokens["spec_tag1"] = "wh_clause"
-        if token.dep_ == "pobj" and token.head.head.dep_ == "relcl":
-            features["wh_relative_clause"] += 1
-            tokens["main_tag"] = "wh_relative_clause"
-            features["wh_relative_prep_clause"] += 1
-            tokens["spec_tag1"] = "wh_relative_prep_clause"
-        if token.head.dep_ == "relcl":
-            if token.dep_ in ["nsubj", "nsubjpass"]:
-                features["wh_relative_clause"] += 1
-                tokens["main_tag"] = "wh_relative_clause"
-                features["wh_relative_subj_clause"] += 1
-                tokens["spec_tag1"] = "wh_relative_subj_clause"
-            if token.dep_ in ["dobj"]:
-                features["wh_relative_clause"] += 1
-                tokens["main_tag"] = "wh_relative_clause"
-                features["wh_relative_obj_clause"] += 1
-                tokens["spec_tag1"] = "wh_relative_obj_clause"
+    question = "?" in [x.text for x in document_sentence]
+    _wh_analysis(token.i, words_count, _doc_tables(document), tokens, features, question)
+
+@typechecked
+def that_analysis(
+        token,
+        document,
+        tokens: dict,
+        features: dict
+    ) -> None:
+    """
+    Analyze `'that'` clauses.\n
+    ---
+    ### Args
+    - `token`: the token.
+    - `document`: the document (`spacy.tokens.Doc`) indexed by `token.i`.
+    - `tokens` (`dict`): the tokens dictionary.
+    - `features` (`dict`): the features dictionary.
+    """
+    _that_analysis(token.i, 0, _doc_tables(document), tokens, features)
+
+# Tagging rules in application order, as (rule, guard on (pos, dep, tag, lower, lemma)).
+# Each guard is the entry condition of its rule, so that rules are only called on the tokens they can tag.
+# The complexity counts (`wrd_nchar`, `noun_phrase_complexity`, `clausal_complexity`) are computed in bulk by `_complexity_counts`.
+_TAGGING_RULES = (
+    (_pronoun_analysis, lambda pos, dep, tag, lower, lemma: lower in PP_ALL),
+    (_advanced_pronoun, lambda pos, dep, tag, lower, lemma: lower in INDEFINITES or lower in DEMONSTRATIVES),
+    (_pro_verb, lambda pos, dep, tag, lower, lemma: lemma == "do" and pos == "VERB" and dep != "aux"),
+    (_contraction_check, lambda pos, dep, tag, lower, lemma: lower in CONTRACTIONS and dep != "case"),
+    (_split_aux_check, lambda pos, dep, tag, lower, lemma: pos == "VERB" and dep not in ["aux", "aux_pass"]),
+    (_prep_analysis, lambda pos, dep, tag, lower, lemma: dep in ["mark", "prep"]),
+    (_coordination_analysis, lambda pos, dep, tag, lower, lemma: lower in COORDINATORS),
+    (_wh_analysis, lambda pos, dep, tag, lower, lemma: tag in WH_TAGS and lower != "that"),
+    (_noun_analysis, lambda pos, dep, tag, lower, lemma: pos in ["NOUN", "PROPN"]),
+    (_semantic_analysis_noun, lambda pos, dep, tag, lower, lemma: pos in ["NOUN", "PROPN"]),
+    (_be_analysis, lambda pos, dep, tag, lower, lemma: lemma.lower() == "be" and dep not in ["aux", "auxpass"]),
+    (_verb_analysis, lambda pos, dep, tag, lower, lemma: pos == "VERB"),
+    (_passive_analysis, lambda pos, dep, tag, lower, lemma: pos == "VERB"),
+    (_semantic_analysis_verb, lambda pos, dep, tag, lower, lemma: pos == "VERB"),
+    (_adjective_analysis, lambda pos, dep, tag, lower, lemma: dep in ["acomp", "amod"]),
+    (_adverb_analysis, lambda pos, dep, tag, lower, lemma: pos == "ADV" or dep in ["npadvmod", "advmod", "intj"]),
+    (_that_analysis, lambda pos, dep, tag, lower, lemma: lower == "that"),
+)
+_TRIGGER_WORDS = PP_ALL | INDEFINITES | DEMONSTRATIVES | CONTRACTIONS | COORDINATORS | frozenset(["that"])
+_TRIGGER_LEMMAS = frozenset(["do", "be"])
+_dispatch_table = {}
+
+def _token_rules(
+        pos: str,
+        dep: str,
+        tag: str,
+        lower: str,
+        lemma: str
+    ) -> tuple:
+    """
+    Return the rules applicable to a token, built once per distinct (pos, dep, tag, trigger word, trigger lemma) key.
+    """
+    key = (pos, dep, tag if tag in WH_TAGS else "", lower if lower in _TRIGGER_WORDS else "", lemma if lemma.lower() in _TRIGGER_LEMMAS else "")
+    rules = _dispatch_table.get(key)
+    if rules is None:
+        rules = _dispatch_table[key] = tuple(rule for rule, guard in _TAGGING_RULES if guard(*key))
+    return rules
+
+def _count_tables(
+        tables: DocTables,
+        indices_dict: List[str],
+        tag_categories_d: dict,
+        output: bool
+    ) -> dict:
+    """
+    Tag a document from its tables and count the features (see `_finish_indices`).\n
+    The counts of the chunks of a document can be merged with `_merge_counts` before being finished.
+    """
+    index_dict = {x: 0 for x in indices_dict}
+    if output:
+        index_dict["lemma_text"] = []
+
+    pos, dep, tag, lower, lemma = tables.pos, tables.dep, tables.tag, tables.lower, tables.lemma
+    tagged_text = TaggedText(tables.sents, tables.text, tables.lemma_lower, pos, tag, dep, tables.head, tag_categories_d) if output else None
+    # Without output the tags are only counted, and the rules share a scratch dict
+    token_tags = {}
+    token_rules = profiling.token_rules(_token_rules)
+    with profiling.stage("tagging"):
+        for start, end in tables.sents:
+            for i in range(start, end):
+                for rule in token_rules(pos[i], dep[i], tag[i], lower[i], lemma[i]):
+                    rule(i, i - start, tables, token_tags, index_dict)
+                if tagged_text is not None and token_tags:
+                    tagged_text.set_tags(i, token_tags)
+                    token_tags = {}
+    with profiling.stage("complexity"):
+        index_dict.update(_complexity_counts(tables, lemma_text=output, lemma_keys=not output and "mattr" in index_dict))
+
+    if output:
+        index_dict["tagged_text"] = tagged_text
+    return index_dict
+
+def _merge_counts(parts: List[dict]) -> dict:
+    """
+    Merge the feature counts of the chunks of a document (see `_count_tables`), in document order.
+    """
+    index_dict = parts[0]
+    for part in parts[1:]:
+        for key, value in part.items():
+            if key == "tagged_text":
+                continue
+            if key in index_dict:
+                index_dict[key] += value
+            else:
+                index_dict[key] = value
+    if "tagged_text" in index_dict:
+        index_dict["tagged_text"] = TaggedText.concatenate([x["tagged_text"] for x in parts])
+    return index_dict
+
+def _pair_codes(lemma_keys: List[tuple]) -> Any:
+    """
+    Code the words of a document, given as `(lemma_ids, pos_ids)` arrays per chunk, as one integer per distinct
+    `lemma_POS` pair.
+    """
+    import numpy
+
+    lemma_ids = numpy.concatenate([x for x, _ in lemma_keys])
+    pos_ids = numpy.concatenate([x for _, x in lemma_keys])
+    if not len(lemma_ids):
+        return lemma_ids.astype(numpy.int64)
+    _, lemma_codes = numpy.unique(lemma_ids, return_inverse=True)
+    pos_values, pos_codes = numpy.unique(pos_ids, return_inverse=True)
+    return lemma_codes.astype(numpy.int64) * len(pos_values) + pos_codes
+
+def _finish_indices(
+        index_dict: dict,
+        output: bool
+    ) -> dict:
+    """
+    Compute the mean word length, MATTR and complexity ratios from the feature counts (see `_count_tables`).
+    """
+    lemma_text = index_dict["lemma_text"] if output else index_dict.pop("lemma_text", None)
+    lemma_keys = index_dict.pop("lemma_keys", None)
+    index_dict["wrd_length"] = index_dict["wrd_length"] / index_dict["nwords"]
+    if lemma_text is not None:
+        with profiling.stage("mattr"):
+            index_dict["mattr"] = mattr.__wrapped__(lemma_text)
+    elif lemma_keys is not None:
+        with profiling.stage("mattr"):
+            index_dict["mattr"] = _mattr_codes(_pair_codes(lemma_keys))
+    # noun phrase complexity
+    divide = safe_divide.__wrapped__
+    index_dict.update({
+        "mean_nominal_deps": divide(index_dict["np_deps"], index_dict["np"]),
+        "relcl_nominal": divide(index_dict["relcl_dep"], index_dict["np"]),
+        "amod_nominal": divide(index_dict["amod_dep"], index_dict["np"]),
+        "det_nominal": divide(index_dict["det_dep"], index_dict["np"]),
+        "prep_nominal": divide(index_dict["prep_dep"], index_dict["np"]),
+        "poss_nominal": divide(index_dict["poss_dep"], index_dict["np"]),
+        "cc_nominal": divide(index_dict["cc_dep"], index_dict["np"]),
+        "mean_verbal_deps": divide(index_dict["vp_deps"], index_dict["finite_clause"]),
+        "mlc": divide(index_dict["nwords"], index_dict["finite_clause"]),
+        "mltu": divide(index_dict["nwords"], index_dict["finite_ind_clause"]),
+        "dc_c": divide(index_dict["finite_dep_clause"], index_dict["finite_clause"]),
+        "ccomp_c": divide(index_dict["finite_compl_clause"], index_dict["finite_clause"]),
+        "relcl_c": divide(index_dict["finite_relative_clause"], index_dict["finite_clause"]),
+        "infinitive_prop": divide(index_dict["to_clause"], index_dict["all_clauses"]),
+        "nonfinite_prop": divide(index_dict["nonfinite_clause"], index_dict["all_clauses"])
+    })
+
+    return index_dict
+
+def _analyze_tables(
+        tables: DocTables,
+        indices_dict: Optional[List[str]],
+        tag_categories_d: dict,
+        output: bool
+    ) -> dict:
+    """
+    Tag a document from its tables and compute the indices (see `LGR_Doc_Analysis`).
+    """
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
+    return _finish_indices(_count_tables(tables, indices_dict, tag_categories_d, output), output)
 
 @typechecked
-def that_analysis(
-        token,
+def LGR_Doc_Analysis(
         document,
-        tokens: dict,
-        features: dict
-    ) -> None:
+        indices_dict: Optional[List[str]] = None,
+        tag_categories_d: dict = tag_categories,
+        output: bool = True
+    ) -> Any:
     """
-    Analyze `'that'` clauses.\n
+    Tag a parsed spaCy document and compute the indices.\n
     ---
     ### Args
-    - `token`: the token.
-    - `document`: the document.
-    - `tokens` (`dict`): the tokens dictionary.
-    - `features` (`dict`): the features dictionary.
-    """
-    that_verb_list = "nonfactive_verb attitudinal_verb factive_verb likelihood_verb".split()
-    that_noun_list = "nn_nonfactive nn_attitudinal nn_factive_noun nn_likelihood".split()
+    - `document` (`spacy.tokens.Doc`): the parsed document.
+    - `indices_dict` (`List[str]`): the indices to compute (defaults to the LGR index list).
+    - `tag_categories_d` (`dict`): the tag categories.
+    - `output` (`bool`): whether the tagged text is needed (otherwise only the indices are computed and returned).\n
+    ---
+    ### Returns
+    - `dict`: the indices, together with `lemma_text` and `tagged_text` (a `TaggedText`) if `output` is set.
+    """
+    with profiling.stage("tables", len(document)):
+        tables = DocTables(document)
+    tag_output = _analyze_tables(tables, indices_dict, tag_categories_d, output)
+    profiling.end_document()
+    return tag_output
+
+# Boundaries to split long texts on, from the preferred ones: paragraphs, lines, sentences and words
+SPLIT_BOUNDARIES = (
+    re.compile(r"\n\s*\n"),
+    re.compile(r"\n"),
+    re.compile(r"[.!?][\"'\u201d\u2019)\]]*\s+"),
+    re.compile(r"\s+"),
+)
 
-    if token.text.lower() == "that":
-        if token.dep_ in ["nsubj", "nsubjpass", "dobj", "pobj"] and token.head.dep_ == "relcl":
-            features["that_relative_clause"] += 1
-            tokens["spec_tag1"] = "that_relative_clause"
-        if token.dep_ in ["mark", "nsubj"] and token.head.dep_ in ["ccomp", "acl"]:
-            features["that_complement_clause"] += 1
-            tokens["spec_tag1"] = "that_complement_clause"
-            if document[token.i - 1].pos_ == "VERB":
-                features["that_verb_clause"] += 1
-                tokens["spec_tag2"] = "that_verb_clause"
-                verb_lemma = document[token.i - 1].lemma_.lower()
-                if verb_lemma in that_verb_dict and that_verb_dict[verb_lemma] in that_verb_list:
-                    features[f"that_verb_clause_{that_verb_dict[verb_lemma][:-5]}"] += 1
-                    tokens["semantic_tag1"] = f"that_verb_clause_{that_verb_dict[verb_lemma][:-5]}"
-            if document[token.i - 1].pos_ == "NOUN":
-                features["that_noun_clause"] += 1
-                tokens["spec_tag2"] = "that_noun_clause"
-                noun_lemma = document[token.i - 1].lemma_.lower()
-                if noun_lemma in noun_dict and noun_dict[noun_lemma] in that_noun_list:
-                    features[f"that_noun_clause_{noun_dict[noun_lemma][3:]}"] += 1
-                    tokens["semantic_tag1"] = f"that_noun_clause_{noun_dict[noun_lemma][3:]}"
-            if document[token.i - 1].pos_ == "ADJ":
-                features["that_adjective_clause"] += 1
-                tokens["spec_tag2"] = "that_adjective_clause"
-                adj_lemma = document[token.i - 1].lemma_.lower()
-                if adj_lemma in adj_dict:
-                    if adj_dict[adj_lemma] == "attitudinal_adj":
-                        features["that_adjective_clause_attitudinal"] += 1
-                        tokens["semantic_tag1"] = "that_adjective_clause_attitudinal"
-                    if adj_dict[adj_lemma] == "likelihood_adj":
-                        features["that_adjective_clause_likelihood"] += 1
-                        tokens["semantic_tag1"] = "that_adjective_clause_likelihood"
+@typechecked
+def split_text(
+        text: str,
+        max_chars: int = DEFAULT_CHUNK_CHARS
+    ) -> List[str]:
+    """
+    Split a text into chunks of at most `max_chars` characters.\n
+    Each chunk ends on the last paragraph boundary in its second half if there is one, otherwise on the last line,
+    sentence or word boundary (or is cut at `max_chars`). The chunks add up to the text.\n
+    ---
+    ### Args
+    - `text` (`str`): the (cleaned) text.
+    - `max_chars` (`int`): the maximum length of a chunk.\n
+    ---
+    ### Returns
+    - `List[str]`: the chunks.
+    """
+    if max_chars < 1:
+        raise ValueError(f"Invalid chunk length {max_chars}")
+    chunks = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = end
+        for boundary in SPLIT_BOUNDARIES:
+            match = None
+            for match in boundary.finditer(text, start + max_chars // 2, end):
+                pass
+            if match is not None:
+                cut = match.end()
+                break
+        chunks.append(text[start:cut])
+        start = cut
+    chunks.append(text[start:])
+    return chunks
+
+def _split_texts(
+        texts: Iterable[tuple],
+        max_chars: int
+    ) -> Iterator[tuple]:
+    """
+    Split `(text, context)` tuples into `(chunk, (context, last))` tuples, `last` marking the last chunk of a text.
+    """
+    for text, context in texts:
+        with profiling.stage("clean"):
+            chunks = split_text(text, max_chars)
+        for i, chunk in enumerate(chunks, 1):
+            yield chunk, (context, i == len(chunks))
+
+def _count_chunks(
+        chunks: List[str],
+        indices_dict: List[str],
+        tag_categories_d: dict,
+        output: bool,
+        model: str,
+        exclude: Sequence[str],
+        cache: Optional[ParseCache]
+    ) -> List[dict]:
+    """
+    Parse the chunks of a text one at a time and count their features (see `_count_tables`).
+    """
+    nlp = load_model(model, exclude)
+    documents = _parse_many(nlp, ((x, None) for x in chunks), 1 if len(chunks) > 1 else None, cache)
+    parts = []
+    for document, _ in documents:
+        with profiling.stage("tables", len(document)):
+            tables = DocTables(document)
+        parts.append(_count_tables(tables, indices_dict, tag_categories_d, output))
+    return parts
+
+def _count_chunk(args: tuple) -> dict:
+    chunk, *args = args
+    return _count_chunks([chunk], *args)[0]
+
+def _analyze_counts(
+        parts: List[dict],
+        output: bool
+    ) -> dict:
+    """
+    Compute the indices of a text from the feature counts of its chunks.
+    """
+    return _finish_indices(parts[0] if len(parts) == 1 else _merge_counts(parts), output)
 
 @typechecked
 def LGR_Analysis(
         text,
-        indices_dict: List[str] = index_list,
+        indices_dict: Optional[List[str]] = None,
         tag_categories_d: dict = tag_categories,
-        output: bool = False
+        output: bool = True,
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        cache: Optional[ParseCache] = None,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS,
+        n_process: int = 1
     ) -> Any:
-    logger.debug(f"Analyzing text: {text[:100]}...")  # Log first 100 characters for brevity
-    index_dict = {x: 0 for x in indices_dict}
-    index_dict["lemma_text"] = []
-
-    def clean_text(in_text):
-        in_text = re.sub(r"\[.*?\]", "", in_text)
-        in_text = re.sub(r"\n[0-9]:", "", in_text)
-        if " " in in_text:
-            if "\n" not in in_text:
-                in_text = " ".join(in_text.split())
-            else:
-                in_text = "\n".join(" ".join(x.split()) for x in in_text.split("\n"))
-        return in_text
-
-    document = nlp(clean_text(text))
-    logger.debug(f"Document processed: {document}")
-
-    output_list = []
-    for sent_idx, sent in enumerate(document.sents):
-        output_list.append([])
-        for idx_sent, token in enumerate(sent):
-            token_attrs = {x: None for x in tag_categories_d}
-            basic_info(token, token_attrs)
-            pronoun_analysis(token, token_attrs, index_dict)
-            advanced_pronoun(token, document, token_attrs, index_dict)
-            pro_verb(token, token_attrs, index_dict)
-            contraction_check(token, token_attrs, index_dict)
-            split_aux_check(token, token_attrs, index_dict)
-            prep_analysis(token, token_attrs, index_dict)
-            coordination_analysis(token, idx_sent, token_attrs, index_dict)
-            wh_analysis(token, idx_sent, document, sent, token_attrs, index_dict)
-            noun_analysis(token, token_attrs, index_dict)
-            semantic_analysis_noun(token, token_attrs, index_dict)
-            be_analysis(token, token_attrs, index_dict)
-            verb_analysis(token, document, token_attrs, index_dict)
-            passive_analysis(token, token_attrs, index_dict)
-            semantic_analysis_verb(token, token_attrs, index_dict)
-            adjective_analysis(token, token_attrs, index_dict)
-            adverb_analysis(token, idx_sent, token_attrs, index_dict)
-            that_analysis(token, document, token_attrs, index_dict)
-            wrd_nchar(token, index_dict)
-            noun_phrase_complexity(token, index_dict)
-            clausal_complexity(token, index_dict)
-            output_list[sent_idx].append(token_attrs)
-
-    index_dict["tagged_text"] = output_list
-    index_dict["wrd_length"] = index_dict["wrd_length"] / index_dict["nwords"]
-    index_dict["mattr"] = ld.mattr(index_dict["lemma_text"])
-
-    # noun phrase complexity
-    index_dict.update({
-        "mean_nominal_deps": safe_divide(index_dict["np_deps"], index_dict["np"]),
-        "relcl_nominal": safe_divide(index_dict["relcl_dep"], index_dict["np"]),
-        "amod_nominal": safe_divide(index_dict["amod_dep"], index_dict["np"]),
-        "det_nominal": safe_divide(index_dict["det_dep"], index_dict["np"]),
-        "prep_nominal": safe_divide(index_dict["prep_dep"], index_dict["np"]),
-        "poss_nominal": safe_divide(index_dict["poss_dep"], index_dict["np"]),
-        "cc_nominal": safe_divide(index_dict["cc_dep"], index_dict["np"]),
-        "mean_verbal_deps": safe_divide(index_dict["vp_deps"], index_dict["finite_clause"]),
-        "mlc": safe_divide(index_dict["nwords"], index_dict["finite_clause"]),
-        "mltu": safe_divide(index_dict["nwords"], index_dict["finite_ind_clause"]),
-        "dc_c": safe_divide(index_dict["finite_dep_clause"], index_dict["finite_clause"]),
-        "ccomp_c": safe_divide(index_dict["finite_compl_clause"], index_dict["finite_clause"]),
-        "relcl_c": safe_divide(index_dict["finite_relative_clause"], index_dict["finite_clause"]),
-        "infinitive_prop": safe_divide(index_dict["to_clause"], index_dict["all_clauses"]),
-        "nonfinite_prop": safe_divide(index_dict["nonfinite_clause"], index_dict["all_clauses"])
-    })
+    """
+    Parse and analyze a text.\n
+    Texts longer than `chunk_chars` are parsed in chunks (see `split_text`), so that memory is bounded by the chunk
+    length: the counts, token positions and tagged texts of the chunks are merged, and the results only differ from a
+    single parse at the chunk boundaries. With `n_process > 1` the chunks are parsed by a pool of worker processes.\n
+    ---
+    ### Args
+    - `text` (`str`): the text.
+    - `indices_dict` (`List[str]`): the indices to compute (defaults to the LGR index list).
+    - `tag_categories_d` (`dict`): the tag categories.
+    - `output` (`bool`): whether the tagged text is needed (otherwise only the indices are computed and returned).
+    - `model` (`str`): the spaCy model (see `load_model`).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.
+    - `cache` (`ParseCache`): the parse cache to reuse parses from (optional).
+    - `chunk_chars` (`int`): the maximum length of the parsed chunks.
+    - `n_process` (`int`): the number of worker processes for the chunks.\n
+    ---
+    ### Returns
+    - `dict`: the indices, together with `lemma_text` and `tagged_text` if `output` is set.
+    """
+    logger.debug("Analyzing text (%d characters).", len(text))
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
+    with profiling.stage("clean"):
+        chunks = split_text(clean_text(text), chunk_chars)
+    if n_process > 1 and len(chunks) > 1:
+        with _process_pool(n_process, model, exclude) as pool:
+            parts = list(pool.map(_count_chunk, [(x, indices_dict, tag_categories_d, output, model, exclude, cache) for x in chunks]))
+    else:
+        parts = _count_chunks(chunks, indices_dict, tag_categories_d, output, model, exclude, cache)
+    logger.debug("Document processed in %d chunks.", len(chunks))
+    tag_output = _analyze_counts(parts, output)
+    profiling.end_document()
+    return tag_output
 
-    return index_dict
+@typechecked
+def LGR_Analysis_many(
+        texts,
+        indices_dict: Optional[List[str]] = None,
+        tag_categories_d: dict = tag_categories,
+        output: bool = True,
+        batch_size: Optional[int] = None,
+        as_tuples: bool = False,
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        cache: Optional[ParseCache] = None,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS
+    ) -> Iterator:
+    """
+    Parse and analyze many texts, streaming them through `nlp.pipe` in batches.\n
+    Texts longer than `chunk_chars` are parsed in chunks, as in `LGR_Analysis`.\n
+    ---
+    ### Args
+    - `texts` (`Iterable`): the texts, or `(text, context)` tuples if `as_tuples` is set.
+    - `indices_dict` (`List[str]`): the indices to compute (defaults to the LGR index list).
+    - `tag_categories_d` (`dict`): the tag categories.
+    - `output` (`bool`): whether the tagged text is needed (otherwise only the indices are computed and returned).
+    - `batch_size` (`int`): the number of texts (or chunks) parsed per batch (defaults to the model setting).
+    - `as_tuples` (`bool`): whether `texts` yields `(text, context)` tuples.
+    - `model` (`str`): the spaCy model (see `load_model`).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.
+    - `cache` (`ParseCache`): the parse cache to reuse parses from (optional).
+    - `chunk_chars` (`int`): the maximum length of the parsed chunks.\n
+    ---
+    ### Yields
+    - `dict`: the analysis of each text (as `(analysis, context)` if `as_tuples` is set), in input order (see `LGR_Doc_Analysis`).
+    """
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
+    nlp = load_model(model, exclude)
+    if not as_tuples:
+        texts = ((text, None) for text in texts)
+    parts = []
+    for document, (context, last) in _parse_many(nlp, _split_texts(_clean_texts(texts), chunk_chars), batch_size, cache):
+        with profiling.stage("tables", len(document)):
+            tables = DocTables(document)
+        parts.append(_count_tables(tables, indices_dict, tag_categories_d, output))
+        if last:
+            tag_output = _analyze_counts(parts, output)
+            profiling.end_document(context if isinstance(context, str) else None)
+            parts = []
+            yield (tag_output, context) if as_tuples else tag_output
+
+def _clean_texts(texts: Iterable[tuple]) -> Iterator[tuple]:
+    """
+    Clean the texts of `(text, context)` tuples.
+    """
+    for text, context in texts:
+        with profiling.stage("clean"):
+            text = clean_text(text)
+        yield text, context
+
+def _parse_many(
+        nlp,
+        texts: Iterable[tuple],
+        batch_size: Optional[int],
+        cache: Optional[ParseCache]
+    ) -> Iterator[tuple]:
+    """
+    Parse `(text, context)` tuples with `nlp.pipe`, yielding `(document, context)` tuples in input order.\n
+    With a cache, cached parses are reused and only the missing ones are parsed (and then stored).
+    """
+    return profiling.timed_iter("parse", _parse_cached(nlp, texts, batch_size, cache), lambda x: len(x[0]))
+
+def _parse_cached(
+        nlp,
+        texts: Iterable[tuple],
+        batch_size: Optional[int],
+        cache: Optional[ParseCache]
+    ) -> Iterator[tuple]:
+    """
+    Parse `(text, context)` tuples with `nlp.pipe`, reusing (and storing) the parses of a cache (see `_parse_many`).
+    """
+    if cache is None:
+        yield from nlp.pipe(texts, batch_size=batch_size, as_tuples=True)
+        return
+
+    texts = iter(texts)
+    while True:
+        window = list(itertools.islice(texts, batch_size or nlp.batch_size))
+        if not window:
+            return
+        cached = [cache.get(text, nlp) for text, _ in window]
+        parsed = nlp.pipe([text for (text, _), document in zip(window, cached) if document is None], batch_size=batch_size)
+        for (text, context), document in zip(window, cached):
+            if document is None:
+                document = next(parsed)
+                cache.put(text, document, nlp)
+            yield document, context
+
+# Columns of the vertical format
+VERTICAL_COLUMNS = {
+    "full": ['idx', 'word', 'lemma', 'pos', 'tag', 'dep_rel', 'head', 'head idx', 'main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2'],
+    "simple": ['idx', 'word', 'lemma', 'tag', 'dep_rel', 'head idx', 'main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2']
+}
+WRITE_BUFFER_SIZE = 1 << 20
+
+def open_text(
+        filename: str,
+        mode: str = "r"
+    ) -> Any:
+    """
+    Open a text file, compressed according to its extension (`.gz`, or `.zst` which requires `zstandard`).\n
+    ---
+    ### Args
+    - `filename` (`str`): the file.
+    - `mode` (`str`): `"r"`, `"w"` or `"a"`.\n
+    ---
+    ### Returns
+    - the file object.
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode + "t", compresslevel=6)
+    if filename.endswith((".zst", ".zstd")):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(f"The 'zstandard' package is required to read or write '{filename}'.") from e
+        return zstandard.open(filename, mode + "t")
+    return open(filename, mode, buffering=WRITE_BUFFER_SIZE)
+
+def _vertical_lines(
+        list_text,
+        columns: List[str]
+    ) -> Iterator[tuple]:
+    """
+    Yield the sentence id and token lines of each non-empty sentence, in vertical format.
+    """
+    for sent_id, sent in enumerate(list_text):
+        if sent:
+            yield sent_id, ["\t".join([str(token.get(attr, "n/a")) for attr in columns]) for token in sent]
 
 @typechecked
 def output_vertical(
         list_text,
         outname,
         ordered_output = "simple",
-        pretty_print: bool = False
+        pretty_print: bool = False,
+        header: bool = False
     ) -> None:
     """
-    Output parsed text to vertical format.
-    """
-    ordered_output = {
-        "full": ['idx', 'word', 'lemma', 'pos', 'tag', 'dep_rel', 'head', 'head idx', 'main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2'],
-        "simple": ['idx', 'word', 'lemma', 'tag', 'dep_rel', 'head idx', 'main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2']
-    }[ordered_output]
-
-    with open(outname, "w") as outf:
-        for sent_id, sent in enumerate(list_text):
-            if not sent:
-                continue
-            outf.write(f"\n\n[Sentence {sent_id}]")
+    Output parsed text to vertical format.\n
+    The output is written in large chunks, and compressed if `outname` ends with `.gz` or `.zst` (see `open_text`).\n
+    ---
+    ### Args
+    - `list_text`: the tagged text.
+    - `outname` (`str`): the output file.
+    - `ordered_output` (`str`): the columns (`"full"` or `"simple"`, see `VERTICAL_COLUMNS`).
+    - `pretty_print` (`bool`): whether to also print the output.
+    - `header` (`bool`): whether to start with a row of column names.
+    """
+    columns = VERTICAL_COLUMNS[ordered_output]
+
+    with profiling.stage("output_vertical", document=False), open_text(outname, "w") as outf:
+        chunk = ["\t".join(columns)] if header else []
+        size = 0
+        for sent_id, lines in _vertical_lines(list_text, columns):
+            sentence = f"\n\n[Sentence {sent_id}]\n" + "\n".join(lines)
+            chunk.append(sentence)
+            size += len(sentence)
             if pretty_print:
                 print("\n\n")
-            for token in sent:
-                out_list = [str(token.get(attr, "n/a")) for attr in ordered_output]
-                outf.write("\n" + "\t".join(out_list))
-                if pretty_print:
-                    print("\n" + "\t".join(out_list))
+                for line in lines:
+                    print("\n" + line)
+            if size >= WRITE_BUFFER_SIZE:
+                outf.write("".join(chunk))
+                chunk = []
+                size = 0
+        outf.write("".join(chunk))
 
 @typechecked
 def print_vertical(
@@ -1004,17 +1853,86 @@ def print_vertical(
     """
     Print parsed text in vertical format.
     """
-    ordered_output = {
-        "full": ['idx', 'word', 'lemma', 'pos', 'tag', 'dep_rel', 'head', 'head idx', 'main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2'],
-        "simple": ['idx', 'word', 'lemma', 'tag', 'dep_rel', 'head idx', 'main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2']
-    }[ordered_output]
+    for sent_id, lines in _vertical_lines(list_text, VERTICAL_COLUMNS[ordered_output]):
+        print(f"\n\n[Sentence {sent_id}]")
+        for line in lines:
+            print("\n" + line)
+
+# Characters that cannot appear in an XML document
+XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+LGR_ATTR_LIST = ['main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2']
+
+def _xml_escape(
+        value: str,
+        attribute: bool = False
+    ) -> str:
+    """
+    Escape a text (or `attribute`) value as `prettify` writes it.
+    """
+    if XML_INVALID_CHARS.search(value):
+        raise ValueError(f"Character not allowed in XML in {value!r}")
+    if not attribute and "\r" in value:
+        # Line ends in character data are normalized by the XML parser
+        value = value.replace("\r\n", "\n").replace("\r", "\n")
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;").replace(">", "&gt;")
+
+def _xml_start(
+        indent: str,
+        name: str,
+        attributes: tuple = ()
+    ) -> str:
+    """
+    Return an indented XML start tag, as `prettify` writes it.
+    """
+    attrib = "".join(f' {key}="{_xml_escape(value, True)}"' for key, value in attributes)
+    return f"{indent}<{name}{attrib}"
+
+def _xml_element(
+        indent: str,
+        name: str,
+        text: str = "",
+        attributes: tuple = ()
+    ) -> str:
+    """
+    Return an indented XML element without child elements, as `prettify` writes it.
+    """
+    start = _xml_start(indent, name, attributes)
+    return f"{start}>{_xml_escape(text)}</{name}>\n" if text else f"{start}/>\n"
 
+def _write_xml(
+        list_text,
+        outf
+    ) -> None:
+    """
+    Write a tagged text to `outf` sentence by sentence, in the format of `prettify(output_xml(list_text))`.
+    """
+    outf.write('<?xml version="1.0" ?>\n')
+    empty = True
     for sent_id, sent in enumerate(list_text):
-        if not sent: continue
-        print(f"\n\n[Sentence {sent_id}]")
-        for token in sent:
-            out_list = [str(token.get(attr, "n/a")) for attr in ordered_output]
-            print("\n" + "\t".join(out_list))
+        if empty:
+            outf.write("<tagged_text>\n")
+            empty = False
+        words = []
+        parts = []
+        for item in sent:
+            words.append(item["word"])
+            parts += [
+                _xml_start("        ", "word", (("idx", item["idx"]),)) + ">\n",
+                _xml_element("            ", "raw", item["word"]),
+                _xml_element("            ", "lemma", item["lemma"]),
+                _xml_element("            ", "biber_tags", attributes=tuple((x, item[x]) for x in LGR_ATTR_LIST if item[x])),
+                _xml_element("            ", "UPOS", item["pos"]),
+                _xml_element("            ", "POS", item["tag"]),
+                _xml_element("            ", "DEP", item["dep_rel"], (("head", item["head"]), ("head_id", str(item["head idx"])))),
+                "        </word>\n"
+            ]
+        outf.write(
+            _xml_start("    ", "sentence", (("sent_id", str(sent_id)),)) + ">\n"
+            + _xml_element("        ", "sentence_text", " ".join(words))
+            + "".join(parts)
+            + "    </sentence>\n"
+        )
+    outf.write("<tagged_text/>\n" if empty else "</tagged_text>\n")
 
 @typechecked
 def output_xml(
@@ -1023,11 +1941,24 @@ def output_xml(
         xml_element = None
     ) -> Union[Any, ET.Element, None]:
     """
-    Output parsed text to XML format.
-    """
-    LGR_attr_list = ['main_tag', 'spec_tag1', 'spec_tag2', 'spec_tag3', 'spec_tag4', 'spec_tag5', 'spec_tag6', 'semantic_tag1', 'semantic_tag2']
-    xml_element = xml_element or ET.Element("tagged_text")
+    Output parsed text to XML format.\n
+    With `outname` (and no `xml_element`), the XML is streamed sentence by sentence to a temporary file (compressed if
+    `outname` ends with `.gz` or `.zst`, see `open_text`), which then replaces `outname`: a failed write leaves no
+    partial file behind.
+    """
+    if outname and xml_element is None:
+        part_path = _part_path(outname)
+        try:
+            with profiling.stage("output_xml", document=False), open_text(part_path, "w") as outf:
+                _write_xml(list_text, outf)
+            os.replace(part_path, outname)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        return
 
+    xml_element = xml_element or ET.Element("tagged_text")
     for sent_id, sent in enumerate(list_text):
         sent_level = ET.SubElement(xml_element, "sentence", attrib={"sent_id": str(sent_id)})
         sent_text = ET.SubElement(sent_level, "sentence_text")
@@ -1039,7 +1970,7 @@ def output_xml(
             ET.SubElement(wrd, "raw").text = item["word"]
             ET.SubElement(wrd, "lemma").text = item["lemma"]
             btt = ET.SubElement(wrd, "biber_tags")
-            for x in LGR_attr_list:
+            for x in LGR_ATTR_LIST:
                 if item[x]:
                     btt.set(x, item[x])
             ET.SubElement(wrd, "UPOS").text = item["pos"]
@@ -1057,6 +1988,26 @@ def output_xml(
     else:
         return xml_element
 
+@typechecked
+def output_table(
+        list_text,
+        outname: str,
+        document: Optional[str] = None
+    ) -> None:
+    """
+    Output parsed text as a token-level table (the `full` vertical columns, see `tagged_table`).
+
+    The table is written to Parquet, or to Arrow IPC if `outname` ends with `.arrow` or `.feather` (requires `pyarrow`).
+
+    ---
+    ### Args
+    - `list_text`: the tagged text.
+    - `outname` (`str`): the output file.
+    - `document` (`str`): the name of the document, added as a `document` column (optional).
+    """
+    with profiling.stage("output_table", document=False):
+        write_table(tagged_table(list_text, VERTICAL_COLUMNS["full"], document), outname)
+
 @typechecked
 def sent_exampler(
         list_text,
@@ -1079,125 +2030,737 @@ def sent_exampler(
             outl.append(" ".join(s_text))
     return outl
 
+def _process_pool(
+        n_process: int,
+        model: Optional[str] = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE
+    ) -> Any:
+    """
+    Create a process pool whose workers load the spaCy model once.\n
+    Word lists are loaded before the workers are forked, so that they are shared copy-on-write.\n
+    ---
+    ### Args
+    - `n_process` (`int`): the number of worker processes.
+    - `model` (`str`): the spaCy model loaded by each worker (`None` for workers that do not parse).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.\n
+    ---
+    ### Returns
+    - `concurrent.futures.ProcessPoolExecutor`: the pool.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    load_resources()
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    return ProcessPoolExecutor(n_process, mp_context=context, initializer=_init_worker, initargs=(model, tuple(exclude)))
+
+def _init_worker(model: Optional[str], exclude: Sequence[str]) -> None:
+    load_resources()
+    if model is not None:
+        load_model(model, exclude)
+
+def _chunks(items: list, size: int) -> List[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _error_message(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+def _normed_values(
+        tag_output: dict,
+        indices_dict: List[str]
+    ) -> list:
+    """
+    Return the index values as written by `LGR_Full` (counts normed per 10,000 words).
+    """
+    noNorm = ["nwords", "wrd_length", "mean_nominal_deps", "relcl_nominal", "amod_nominal", "det_nominal", "prep_nominal", "poss_nominal", "cc_nominal", "mean_verbal_deps", "mlc", "mltu", "dc_c", "ccomp_c", "relcl_c", "infinitive_prop", "nonfinite_prop"]
+    return [tag_output[x] if x in noNorm else (tag_output[x] / tag_output["nwords"]) * 10000 for x in indices_dict]
+
+def _output_paths(
+        filename: str,
+        outdirname: str,
+        output,
+        vertical_extension: str = ".tsv"
+    ) -> Dict[str, str]:
+    """
+    Return the `xml`/`vertical`/`table` outputs of an analyzed file, by kind.
+    """
+    name = os.path.splitext(os.path.basename(filename))[0]
+    paths = {}
+    if output:
+        if "xml" in output:
+            paths["xml"] = outdirname + "/xml/" + name + ".xml"
+        if "vertical" in output:
+            paths["vertical"] = outdirname + "/vertical/" + name + vertical_extension
+        if "table" in output:
+            paths["table"] = outdirname + "/table/" + name + ".parquet"
+    return paths
+
+def _part_path(path: str) -> str:
+    """
+    Return the temporary file an output is written to before being moved into place (with the same extension).
+    """
+    directory, name = os.path.split(path)
+    return os.path.join(directory, ".part-" + name)
+
+def _file_result(
+        filename: str,
+        tag_output: dict,
+        indices_dict: List[str],
+        outdirname: str,
+        output,
+        vertical_extension: str = ".tsv",
+        vertical_header: bool = False
+    ) -> tuple:
+    """
+    Build the CSV row of an analyzed file and write its `xml`/`vertical`/`table` outputs.\n
+    Each output is written to a temporary file first, so that an interrupted run never leaves a partial output behind.
+    """
+    simple_fname = os.path.basename(filename)
+    output_list = [simple_fname] + [str(x) for x in _normed_values(tag_output, indices_dict)]
+    for kind, path in _output_paths(filename, outdirname, output, vertical_extension).items():
+        part_path = _part_path(path)
+        try:
+            if kind == "xml":
+                output_xml(tag_output["tagged_text"], part_path)
+            elif kind == "table":
+                output_table(tag_output["tagged_text"], part_path, simple_fname)
+            else:
+                output_vertical(tag_output["tagged_text"], part_path, ordered_output="full", header=vertical_header)
+            os.replace(part_path, path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        logger.info("Generated file '%s'.", os.path.basename(path))
+    return filename, output_list, None
+
+def _analyze_files(
+        filenames: List[str],
+        indices_dict: List[str],
+        tag_categories_d: dict,
+        outdirname: str,
+        output,
+        batch_size: Optional[int],
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        cache: Optional[ParseCache] = None,
+        vertical_extension: str = ".tsv",
+        vertical_header: bool = False,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS
+    ) -> Iterator[tuple]:
+    """
+    Analyze files in batches, yielding one `(filename, csv_row, error)` tuple per file in input order.\n
+    If a batch fails, the remaining files are analyzed one by one so that only the failing files are reported.
+    """
+    # The tagged text is only needed for the xml/vertical/table outputs
+    tagged = bool(output) and ("xml" in output or "vertical" in output or "table" in output)
+
+    def read_texts():
+        for filename in filenames:
+            with open(filename) as inf:
+                yield inf.read(), filename
+
+    done = 0
+    try:
+        for tag_output, filename in LGR_Analysis_many(read_texts(), indices_dict, tag_categories_d, tagged, batch_size=batch_size, as_tuples=True, model=model, exclude=exclude, cache=cache, chunk_chars=chunk_chars):
+            result = _file_result(filename, tag_output, indices_dict, outdirname, output, vertical_extension, vertical_header)
+            done += 1
+            yield result
+    except Exception:
+        for filename in filenames[done:]:
+            try:
+                with open(filename) as inf:
+                    tag_output = LGR_Analysis(inf.read(), indices_dict, tag_categories_d, tagged, model=model, exclude=exclude, cache=cache, chunk_chars=chunk_chars)
+                result = _file_result(filename, tag_output, indices_dict, outdirname, output, vertical_extension, vertical_header)
+            except Exception as e:
+                result = filename, None, _error_message(e)
+            yield result
+
+def _analyze_files_chunk(args: tuple) -> List[tuple]:
+    return list(_analyze_files(*args))
+
+def _model_version(model: str) -> Optional[str]:
+    """
+    Return the version of an installed spaCy model (package or folder) without loading it.
+    """
+    import spacy.util
+
+    if os.path.isdir(model):
+        try:
+            return spacy.util.get_model_meta(model).get("version")
+        except (OSError, ValueError):
+            return None
+    return spacy.util.get_package_version(model)
+
+def _run_settings(
+        indices_dict: List[str],
+        tag_categories_d: dict,
+        outdirname: str,
+        output,
+        model: str,
+        exclude: Sequence[str],
+        vertical_extension: str,
+        vertical_header: bool,
+        chunk_chars: int
+    ) -> dict:
+    """
+    Return the settings that determine the results of `LGR_Full` on a file (see `RunManifest`).
+    """
+    import spacy
+
+    model = MODEL_ALIASES.get(model, model)
+    return {
+        "model": model,
+        "model_version": _model_version(model),
+        "spacy_version": spacy.__version__,
+        "exclude": sorted(exclude),
+        "lexicon_version": load_resources()["lexicon_version"],
+        "indices": list(indices_dict),
+        "tag_categories": list(tag_categories_d),
+        "outputs": {x: os.path.dirname(os.path.abspath(y)) for x, y in _output_paths("_", outdirname, output, vertical_extension).items()},
+        "vertical_extension": vertical_extension,
+        "vertical_header": vertical_header,
+        "chunk_chars": chunk_chars,
+    }
+
 @typechecked
 def LGR_Full(
         filenames,
         outname,
-        indices_dict: List[str] = index_list,
+        indices_dict: Optional[List[str]] = None,
         tag_categories_d: Dict[str, None] = tag_categories,
         outdirname: str = '',
-        output = None
-    ) -> None:
-    noNorm = ["nwords", "wrd_length", "mean_nominal_deps", "relcl_nominal", "amod_nominal", "det_nominal", "prep_nominal", "poss_nominal", "cc_nominal", "mean_verbal_deps", "mlc", "mltu", "dc_c", "ccomp_c", "relcl_c", "infinitive_prop", "nonfinite_prop"]
-    with open(outname, "w") as outf:
-        outf.write("filename," + ",".join(indices_dict))
-        if output:
-            if "xml" in output and not os.path.exists(outdirname + "/xml/"):
-                os.mkdir(outdirname + "/xml/")
-            if "vertical" in output and not os.path.exists(outdirname + "/vertical/"):
-                os.mkdir(outdirname + "/vertical/")
-        filenames = glob.glob(filenames + "*.txt") if type(filenames) == str else filenames
-
+        output = None,
+        batch_size: Optional[int] = None,
+        n_process: int = 1,
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        cache: Optional[ParseCache] = None,
+        vertical_extension: str = ".tsv",
+        vertical_header: bool = False,
+        manifest: Optional[RunManifest] = None,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS,
+        progress: Optional[Callable] = None
+    ) -> Dict[str, str]:
+    """
+    Analyze a list of files (or a folder) and write the results to a CSV file (or a Parquet/Arrow file, see `open_results`).\n
+    With `n_process > 1` the files are analyzed by a pool of worker processes; the CSV rows are still written in input order.\n
+    With a `manifest`, the files already analyzed with the same settings (and unchanged, with their outputs present) are
+    skipped and their recorded rows reused, and each analyzed file is recorded as soon as its outputs are written, so an
+    interrupted run can simply be started again. The CSV is only moved into place once complete.\n
+    ---
+    ### Args
+    - `filenames` (`list` | `str`): the files to analyze, or a folder prefix to glob `*.txt` from.
+    - `outname` (`str`): the output file: CSV, or columnar if it ends with `.parquet`, `.arrow` or `.feather`.
+    - `indices_dict` (`List[str]`): the indices to compute (defaults to the LGR index list).
+    - `tag_categories_d` (`dict`): the tag categories.
+    - `outdirname` (`str`): the folder for the `xml`/`vertical`/`table` outputs.
+    - `output` (`list`): the additional outputs to write (`"xml"`, `"vertical"`, `"table"` for Parquet token tables).
+    - `batch_size` (`int`): the number of texts parsed per batch by `nlp.pipe`.
+    - `n_process` (`int`): the number of worker processes.
+    - `model` (`str`): the spaCy model (see `load_model`).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.
+    - `cache` (`ParseCache`): the parse cache to reuse parses from (optional).
+    - `vertical_extension` (`str`): the extension of the `vertical` outputs (e.g. `".tsv.gz"` to compress them, see `open_text`).
+    - `vertical_header` (`bool`): whether the `vertical` outputs start with a row of column names.
+    - `manifest` (`RunManifest`): the run manifest, to resume or update a previous run (optional).
+    - `chunk_chars` (`int`): the maximum length of the parsed chunks of long texts (see `LGR_Analysis`).
+    - `progress` (`Callable`): called with `(filename, csv_row, error)` once each file is done (optional).\n
+    ---
+    ### Returns
+    - `Dict[str, str]`: the files that could not be analyzed, with their error.
+    """
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
+    if output:
+        if "xml" in output and not os.path.exists(outdirname + "/xml/"):
+            os.mkdir(outdirname + "/xml/")
+        if "vertical" in output and not os.path.exists(outdirname + "/vertical/"):
+            os.mkdir(outdirname + "/vertical/")
+        if "table" in output and not os.path.exists(outdirname + "/table/"):
+            os.mkdir(outdirname + "/table/")
+    filenames = glob.glob(filenames + "*.txt") if type(filenames) == str else list(filenames)
+
+    states = {}
+    completed = set()
+    if manifest is not None:
+        settings = _run_settings(indices_dict, tag_categories_d, outdirname, output, model, exclude, vertical_extension, vertical_header, chunk_chars)
+        key = settings_key(settings)
         for filename in filenames:
-            simple_fname = os.path.basename(filename)
-            text = open(filename).read()
-            tag_output = LGR_Analysis(text, indices_dict, tag_categories_d)
-            output_list = [simple_fname] + [
-                str(tag_output[x]) if x in noNorm else str((tag_output[x] / tag_output["nwords"]) * 10000)
-                for x in indices_dict
-            ]
-            logger.debug(f"Writing to CSV: {output_list}")
-            outf.write("\n" + ",".join(output_list))
-            if output:
-                if "xml" in output:
-                    output_xml(tag_output["tagged_text"], outdirname + "/xml/" + os.path.splitext(simple_fname)[0] + ".xml")
-                    logger.info(f"Generated file '{simple_fname.replace('txt', 'xml')}'.")
-                if "vertical" in output:
-                    output_vertical(tag_output["tagged_text"], outdirname + "/vertical/" + os.path.splitext(simple_fname)[0] + ".tsv", ordered_output="full")
-                    logger.info(f"Generated file '{simple_fname.replace('txt', 'tsv')}'.")
+            try:
+                states[filename] = manifest.file_state(filename)
+            except OSError:
+                # Reported when the file is analyzed
+                continue
+            if manifest.completed(filename, states[filename], key):
+                completed.add(filename)
+        logger.info(f"Run manifest '{manifest.path}': {len(completed)} files up to date, {len(filenames) - len(completed)} to analyze.")
+    pending = [x for x in filenames if x not in completed]
+
+    def results():
+        if n_process <= 1:
+            yield from _analyze_files(pending, indices_dict, tag_categories_d, outdirname, output, batch_size, model, exclude, cache, vertical_extension, vertical_header, chunk_chars)
+            return
+        chunks = _chunks(pending, batch_size or DEFAULT_CHUNK_SIZE)
+        with _process_pool(n_process, model, exclude) as pool:
+            futures = [pool.submit(_analyze_files_chunk, (chunk, indices_dict, tag_categories_d, outdirname, output, batch_size, model, exclude, cache, vertical_extension, vertical_header, chunk_chars)) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    yield from future.result()
+                except Exception as e:
+                    yield from ((filename, None, _error_message(e)) for filename in chunk)
+
+    failed = {}
+    document_log = _DocumentLog("analyze", 1 + indices_dict.index("nwords") if "nwords" in indices_dict else None)
+    part_name = _part_path(outname)
+    try:
+        with open_results(part_name, ["filename"] + indices_dict) as outf:
+            new_results = results()
+            for filename in filenames:
+                if filename in completed:
+                    output_list, error = manifest.row(filename), None
+                else:
+                    filename, output_list, error = next(new_results)
+                    if error is not None:
+                        logger.error("Failed to analyze file '%s': %s", filename, error)
+                        failed[filename] = error
+                        if manifest is not None:
+                            manifest.discard(filename)
+                    elif manifest is not None and filename in states:
+                        manifest.record(filename, states[filename], settings, _output_paths(filename, outdirname, output, vertical_extension), output_list)
+                if output_list is not None:
+                    outf.write(output_list)
+                    document_log.document(filename, output_list)
+                if progress is not None:
+                    progress(filename, output_list, error)
+            new_results.close()
+        os.replace(part_name, outname)
+    except BaseException:
+        if os.path.exists(part_name):
+            os.remove(part_name)
+        raise
+    return failed
+
+@typechecked
+def compare_models(
+        filenames,
+        models: Sequence[str] = ("en_core_web_sm", "en_core_web_trf"),
+        outname: Optional[str] = None,
+        indices_dict: Optional[List[str]] = None,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        batch_size: Optional[int] = None
+    ) -> dict:
+    """
+    Compare the indices obtained with different spaCy models on a reference corpus.\n
+    For every index the mean (normed) value per model is reported, along with the mean absolute difference from the first model
+    (the reference) and the proportion of files where the value is identical. The parsing throughput of each model is reported too.\n
+    ---
+    ### Args
+    - `filenames` (`list`): the reference corpus files.
+    - `models` (`Sequence[str]`): the models to compare, the first one being the reference.
+    - `outname` (`str`): the CSV file to write the report to (optional).
+    - `indices_dict` (`List[str]`): the indices to compare (defaults to the LGR index list).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.
+    - `batch_size` (`int`): the number of texts parsed per batch by `nlp.pipe`.\n
+    ---
+    ### Returns
+    - `dict`: the report, with `models`, `files`, `docs_per_second` and per-index statistics under `indices`.
+    """
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
+    filenames = list(filenames)
+    texts = []
+    for filename in filenames:
+        with open(filename) as inf:
+            texts.append(inf.read())
+
+    values = {}
+    docs_per_second = {}
+    for model in models:
+        load_model(model, exclude)
+        start = time.perf_counter()
+        values[model] = [_normed_values(tag_output, indices_dict) for tag_output in LGR_Analysis_many(texts, indices_dict, output=False, batch_size=batch_size, model=model, exclude=exclude)]
+        docs_per_second[model] = safe_divide(len(texts), time.perf_counter() - start)
+        logger.info(f"Model '{model}': {docs_per_second[model]:.2f} docs/sec.")
+
+    reference = models[0]
+    report = {"models": list(models), "files": len(texts), "docs_per_second": docs_per_second, "indices": {}}
+    for i, index in enumerate(indices_dict):
+        stats = {f"{model}_mean": safe_divide(sum(row[i] for row in values[model]), len(texts)) for model in models}
+        for model in models[1:]:
+            pairs = [(ref_row[i], row[i]) for ref_row, row in zip(values[reference], values[model])]
+            stats[f"{model}_mean_abs_diff"] = safe_divide(sum(abs(a - b) for a, b in pairs), len(pairs))
+            stats[f"{model}_agreement"] = safe_divide(sum(1 for a, b in pairs if a == b), len(pairs))
+        report["indices"][index] = stats
 
+    if outname:
+        columns = list(next(iter(report["indices"].values()), {}))
+        with open(outname, "w") as outf:
+            outf.write("index," + ",".join(columns))
+            for index, stats in report["indices"].items():
+                outf.write("\n" + ",".join([index] + [str(stats[x]) for x in columns]))
+            outf.write("\n" + ",".join(["docs_per_second"] + [str(docs_per_second[x.rsplit("_", 1)[0]]) if x.endswith("_mean") else "" for x in columns]))
+    return report
 
 @typechecked
 def calcFromXml(
         xml_filename,
-        indices_dict: List[str] = index_list
+        indices_dict: Optional[List[str]] = None
     ) -> Dict[str, int]:
     """
-    Calculate counts from XML files.
+    Calculate counts from XML files.\n
+    The file is read in one streaming pass, so that memory does not grow with its size.
     """
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
     simplefilename = os.path.basename(xml_filename)
     index_dict = {x: 0 for x in indices_dict}
-    tree = ET.parse(xml_filename)
-    root = tree.getroot()
-
-    for tags in root.iter("biber_tags"):
-        for x in tags.attrib:
-            feature = tags.attrib[x]
-            if feature in index_dict:
-                index_dict[feature] += 1
-            else:
-                logger.warning(f"The tag '{feature}' is not a recognized tag. Please double check the file '{simplefilename}'.")
 
-    for upos in root.iter("UPOS"):
-        if upos.text not in ["PUNCT", "SYM", "SPACE", "X"]:
-            index_dict["nwords"] += 1
+    events = ET.iterparse(xml_filename, events=("start", "end"))
+    _, root = next(events)
+    for event, element in events:
+        if event != "end":
+            continue
+        tag = element.tag
+        if tag == "biber_tags":
+            for feature in element.attrib.values():
+                if feature in index_dict:
+                    index_dict[feature] += 1
+                else:
+                    logger.warning("The tag '%s' is not a recognized tag. Please double check the file '%s'.", feature, simplefilename)
+        elif tag == "UPOS":
+            if element.text not in NON_WORD_POS:
+                index_dict["nwords"] += 1
+        elif tag == "sentence":
+            # Drop the sentences already counted
+            root.clear()
+        element.clear()
 
     return index_dict
 
+def _calc_from_xml_chunk(args: tuple) -> List[Dict[str, int]]:
+    filenames, indices_dict = args
+    return [calcFromXml(filename, indices_dict) for filename in filenames]
+
 @typechecked
 def lgrXml(
         filenames,
         outname,
-        indices_dict: List[str] = index_list
+        indices_dict: Optional[List[str]] = None,
+        n_process: int = 1
     ) -> None:
     """
-    LGR XML analysis.
+    LGR XML analysis (tag counts only: see `LGR_Rescore_Full` for all the indices).\n
+    The results are written as CSV, or as a columnar file if `outname` ends with `.parquet`, `.arrow` or `.feather`.\n
+    With `n_process > 1` the files are read by a pool of worker processes; the CSV rows are still written in input order.
     """
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
     logger.info(f"Outname: '{outname}'")
-    with open(outname, "w") as outf:
-        index_list = [x for x in indices_dict if x not in ["wrd_length", "mattr", "np", "np_deps", "relcl_dep", "amod_dep", "det_dep", "prep_dep", "poss_dep", "cc_dep", "all_clauses", "finite_clause", "finite_ind_clause", "finite_dep_clause", "finite_compl_clause", "finite_relative_clause", "nonfinite_clause", "vp_deps"]]
-        outf.write("filename," + ",".join(index_list))
-        for filename in filenames:
-            tagDict = calcFromXml(filename, index_list)
+    index_list = [x for x in indices_dict if x not in ["wrd_length", "mattr", "np", "np_deps", "relcl_dep", "amod_dep", "det_dep", "prep_dep", "poss_dep", "cc_dep", "all_clauses", "finite_clause", "finite_ind_clause", "finite_dep_clause", "finite_compl_clause", "finite_relative_clause", "nonfinite_clause", "vp_deps"]]
+    with open_results(outname, ["filename"] + index_list) as outf:
+        filenames = list(filenames)
+
+        def counts():
+            if n_process <= 1:
+                yield from (calcFromXml(filename, index_list) for filename in filenames)
+                return
+            with _process_pool(n_process, None) as pool:
+                for chunk in pool.map(_calc_from_xml_chunk, [(chunk, index_list) for chunk in _chunks(filenames, DEFAULT_CHUNK_SIZE)]):
+                    yield from chunk
+
+        for filename, tagDict in zip(filenames, counts()):
             simple_fname = os.path.basename(filename)
-            logger.info(f"Generated file '{simple_fname}'.")
+            logger.info("Generated file '%s'.", simple_fname)
             output_list = [simple_fname] + [
                 str(tagDict[x]) if x in ["nwords", "wrd_length"] else str((tagDict[x] / tagDict["nwords"]) * 10000)
                 for x in index_list
             ]
-            outf.write("\n" + ",".join(output_list))
+            outf.write(output_list)
+
+# Tag values standing for "no tag" in the saved outputs
+NO_TAG_VALUES = frozenset(["", "None", "n/a"])
+
+def _tagged_format(filename: str) -> str:
+    """
+    Return the format of a saved output (`"xml"` or `"vertical"`) from its extension, ignoring `.gz`/`.zst`.
+    """
+    name = re.sub(r"\.(gz|zst|zstd)$", "", filename)
+    return "xml" if name.lower().endswith(".xml") else "vertical"
+
+def _read_xml_tokens(filename: str) -> tuple:
+    """
+    Read the token columns, sentence bounds and tags of an `xml` output (see `output_xml`), in one streaming pass.
+    """
+    words, lemmas, pos, tags, deps, head_ids, sents, token_tags = [], [], [], [], [], [], [], []
+    positions = {}
+    start = 0
+    with open_text(filename) as inf:
+        events = ET.iterparse(inf, events=("start", "end"))
+        _, root = next(events)
+        for event, element in events:
+            if event != "end":
+                continue
+            if element.tag == "word":
+                dep = element.find("DEP")
+                if dep is None:
+                    raise ValueError(f"Word {element.get('idx')} has no DEP element in '{filename}'")
+                positions[element.get("idx")] = len(words)
+                words.append(element.findtext("raw", ""))
+                lemmas.append(element.findtext("lemma", ""))
+                pos.append(element.findtext("UPOS", ""))
+                tags.append(element.findtext("POS", ""))
+                deps.append(dep.text or "")
+                head_ids.append(dep.get("head_id"))
+                biber_tags = element.find("biber_tags")
+                token_tag = {x: y for x, y in biber_tags.attrib.items() if y not in NO_TAG_VALUES} if biber_tags is not None else None
+                if token_tag:
+                    token_tags.append((len(words) - 1, token_tag))
+                element.clear()
+            elif element.tag == "sentence":
+                sents.append((start, len(words)))
+                start = len(words)
+                root.clear()
+
+    try:
+        heads = [positions[x] for x in head_ids]
+    except KeyError as e:
+        raise ValueError(f"Unknown head_id {e} in '{filename}'") from None
+    return (words, lemmas, pos, tags, deps, heads), sents, token_tags
+
+def _read_vertical_tokens(filename: str) -> tuple:
+    """
+    Read the token columns, sentence bounds and tags of a `full` vertical output (see `output_vertical`).\n
+    Tokens containing line breaks span several lines, and are joined back; tokens containing tabs cannot be read back.
+    """
+    columns = VERTICAL_COLUMNS["full"]
+    header = "\t".join(columns)
+    n_fields = len(columns)
+    words, lemmas, pos, tags, deps, head_ids, sents, token_tags = [], [], [], [], [], [], [], []
+    positions = {}
+    start = 0
+    pending = None
+    with open_text(filename) as inf:
+        for line_no, line in enumerate(inf, 1):
+            line = line[:-1] if line.endswith("\n") else line
+            if pending is not None:
+                line = pending + "\n" + line
+                pending = None
+            elif not line or (line_no == 1 and line == header):
+                continue
+            elif line.startswith("[Sentence "):
+                if len(words) > start:
+                    sents.append((start, len(words)))
+                    start = len(words)
+                continue
+            fields = line.split("\t")
+            if len(fields) < n_fields:
+                pending = line
+                continue
+            if len(fields) > n_fields:
+                raise ValueError(f"Line {line_no} of '{filename}' does not have the {n_fields} columns of a 'full' vertical output (or a token contains a tab)")
+            positions[fields[0]] = len(words)
+            words.append(fields[1])
+            lemmas.append(fields[2])
+            pos.append(fields[3])
+            tags.append(fields[4])
+            deps.append(fields[5])
+            head_ids.append(fields[7])
+            token_tag = {x: y for x, y in zip(columns[8:], fields[8:]) if y not in NO_TAG_VALUES}
+            if token_tag:
+                token_tags.append((len(words) - 1, token_tag))
+    if pending is not None:
+        raise ValueError(f"Truncated token line at the end of '{filename}'")
+    if len(words) > start:
+        sents.append((start, len(words)))
+
+    try:
+        heads = [positions[x] for x in head_ids]
+    except KeyError as e:
+        raise ValueError(f"Unknown head idx {e} in '{filename}'") from None
+    return (words, lemmas, pos, tags, deps, heads), sents, token_tags
+
+def _read_tagged_tokens(filename: str) -> tuple:
+    """
+    Read the `(words, lemmas, pos, tags, deps, heads)` columns, sentence bounds and `(position, tags)` pairs of a saved output.
+    """
+    if _tagged_format(filename) == "xml":
+        return _read_xml_tokens(filename)
+    return _read_vertical_tokens(filename)
 
 @typechecked
-def LGR_XML(
-        xml_files,
-        outname,
-        index_list: List[str],
-        tag_categories: dict):
+def read_tagged(
+        filename: str,
+        tag_categories_d: dict = tag_categories
+    ) -> TaggedText:
     """
-    LGR XML analysis for TMLE xml texts.
+    Read back a tagged text, with its saved tags, from an `xml` or (`full`) `vertical` output.\n
+    The format is chosen from the extension: `.xml` for XML, anything else for vertical (optionally `.gz`/`.zst` compressed).\n
+    ---
+    ### Args
+    - `filename` (`str`): the saved output.
+    - `tag_categories_d` (`dict`): the tag categories.\n
+    ---
+    ### Returns
+    - `TaggedText`: the tagged text.
     """
-    with open(outname, "w") as outf:
-        ignore_list = ["np", "np_deps", "relcl_dep", "amod_dep", "det_dep", "prep_dep", "poss_dep", "cc_dep", "all_clauses", "finite_clause", "finite_ind_clause", "finite_dep_clause", "finite_compl_clause", "finite_relative_clause", "nonfinite_clause", "vp_deps"]
-        refined_index_list = [x for x in index_list if x not in ignore_list]
-        outf.write("filename,learning_environment,mode,discipline,subdiscipline,text_type," + ",".join(refined_index_list))
+    (words, lemmas, pos, tags, deps, heads), sents, token_tags = _read_tagged_tokens(filename)
+    tagged_text = TaggedText(sents, words, lemmas, pos, tags, deps, heads, tag_categories_d)
+    for i, token_tag in token_tags:
+        tagged_text.set_tags(i, token_tag)
+    return tagged_text
 
-        tt_list = open(f"{DATA_PATH}/lists_LGR/text_type_map_2020-5-24.txt").read().split("\n")
-        tt_dict = {x.split("\t")[0] + "\t" + x.split("\t")[1] + "\t" + x.split("\t")[2]: x.split("\t")[3] for x in tt_list}
+@typechecked
+def convert_tagged(
+        infile: str,
+        outfile: str,
+        header: bool = False
+    ) -> None:
+    """
+    Convert a saved output between the `xml` and (`full`) `vertical` formats, keeping the saved tags, or to a token table.\n
+    The formats are chosen from the extensions (see `read_tagged`, and `output_table` for `.parquet`/`.arrow`/`.feather`).\n
+    ---
+    ### Args
+    - `infile` (`str`): the saved output.
+    - `outfile` (`str`): the converted output.
+    - `header` (`bool`): whether a `vertical` output starts with a row of column names.
+    """
+    tagged_text = read_tagged(infile)
+    if columnar_format(outfile) is not None:
+        output_table(tagged_text, outfile, os.path.basename(infile))
+    elif _tagged_format(outfile) == "xml":
+        output_xml(tagged_text, outfile)
+    else:
+        output_vertical(tagged_text, outfile, ordered_output="full", header=header)
+    logger.info(f"Converted '{infile}' to '{outfile}'.")
+
+@typechecked
+def LGR_Rescore(
+        filename: str,
+        indices_dict: Optional[List[str]] = None,
+        tag_categories_d: dict = tag_categories,
+        output: bool = False
+    ) -> dict:
+    """
+    Compute all the indices of a text from its `xml` or (`full`) `vertical` output, without spaCy.\n
+    The saved tokens, POS tags and dependencies are tagged again by the current rules and word lists (a saved token keeps
+    a single tag per category, which is not enough to recover the counts), so the indices are those `LGR_Doc_Analysis`
+    computes from the same parse, with one difference: the saved lemmas are lowercased, and only the lemmas of proper nouns
+    are restored (see `DocTables.from_columns`). When the parser kept uppercase letters in other lemmas (e.g. `"I"` for
+    the pronoun), the `lemma_text` of these tokens is lowercased, so `mattr` counts lemmas of the same POS that only
+    differ by case as one type, and the rules comparing the lemma to lowercase forms (`pv_do`, `complementizer_that0`,
+    `to_clause_verb_*`/`to_clause_adjective_*`, `perfect_aspect`, `wh_clause`) can tag their tokens differently. The
+    other indices read lowercased lemmas in both cases.\n
+    ---
+    ### Args
+    - `filename` (`str`): the saved output (see `read_tagged`).
+    - `indices_dict` (`List[str]`): the indices to compute (defaults to the LGR index list).
+    - `tag_categories_d` (`dict`): the tag categories.
+    - `output` (`bool`): whether the (new) tagged text is needed.\n
+    ---
+    ### Returns
+    - `dict`: the indices, together with `lemma_text` and `tagged_text` if `output` is set.
+    """
+    with profiling.stage("read_tagged"):
+        columns, sents, _ = _read_tagged_tokens(filename)
+    with profiling.stage("tables", len(columns[0])):
+        tables = DocTables.from_columns(*columns, sents)
+    tag_output = _analyze_tables(tables, indices_dict, tag_categories_d, output)
+    profiling.end_document(filename)
+    return tag_output
+
+def _rescore_files(
+        filenames: List[str],
+        indices_dict: List[str],
+        tag_categories_d: dict
+    ) -> Iterator[tuple]:
+    """
+    Rescore files, yielding one `(filename, csv_row, error)` tuple per file in input order.
+    """
+    for filename in filenames:
+        try:
+            tag_output = LGR_Rescore(filename, indices_dict, tag_categories_d)
+            yield filename, [os.path.basename(filename)] + [str(x) for x in _normed_values(tag_output, indices_dict)], None
+        except Exception as e:
+            yield filename, None, _error_message(e)
+
+def _rescore_files_chunk(args: tuple) -> List[tuple]:
+    return list(_rescore_files(*args))
 
-        def discipline_fixer(discipline: str):
-            typo_dict = {"natural_sciences": "natural_science", "natual_science": "natural_science", "anthropology": "humanities", "social_sciences": "social_science", "marketing": "business", "astronomy": "natural_science", "english": "humanities", "chemistry": "natural_science", "pnatural_science": "natural_science", "n/a": "service_encounters"}
-            return typo_dict.get(discipline.lower().split(" ")[0], discipline.lower())
+@typechecked
+def LGR_Rescore_Full(
+        filenames,
+        outname: str,
+        indices_dict: Optional[List[str]] = None,
+        tag_categories_d: Dict[str, None] = tag_categories,
+        n_process: int = 1,
+        progress: Optional[Callable] = None
+    ) -> Dict[str, str]:
+    """
+    Rescore a list of `xml` or `vertical` outputs (see `LGR_Rescore`) and write the results to a CSV file, as `LGR_Full` does.\n
+    With `n_process > 1` the files are read by a pool of worker processes; the CSV rows are still written in input order.\n
+    ---
+    ### Args
+    - `filenames` (`list`): the saved outputs.
+    - `outname` (`str`): the output file: CSV, or columnar if it ends with `.parquet`, `.arrow` or `.feather`.
+    - `indices_dict` (`List[str]`): the indices to compute (defaults to the LGR index list).
+    - `tag_categories_d` (`dict`): the tag categories.
+    - `n_process` (`int`): the number of worker processes.
+    - `progress` (`Callable`): called with `(filename, csv_row, error)` once each file is done (optional).\n
+    ---
+    ### Returns
+    - `Dict[str, str]`: the files that could not be rescored, with their error.
+    """
+    indices_dict = load_resources()["index_list"] if indices_dict is None else indices_dict
+    filenames = list(filenames)
+    failed = {}
+    with open_results(outname, ["filename"] + indices_dict) as outf:
+
+        def results():
+            if n_process <= 1:
+                yield from _rescore_files(filenames, indices_dict, tag_categories_d)
+                return
+            with _process_pool(n_process, None) as pool:
+                for chunk in pool.map(_rescore_files_chunk, [(chunk, indices_dict, tag_categories_d) for chunk in _chunks(filenames, DEFAULT_CHUNK_SIZE)]):
+                    yield from chunk
+
+        document_log = _DocumentLog("rescore", 1 + indices_dict.index("nwords") if "nwords" in indices_dict else None)
+        for filename, output_list, error in results():
+            if error is not None:
+                logger.error("Failed to rescore file '%s': %s", filename, error)
+                failed[filename] = error
+            else:
+                logger.info("Rescored file '%s'.", os.path.basename(filename))
+                outf.write(output_list)
+                document_log.document(filename, output_list)
+            if progress is not None:
+                progress(filename, output_list, error)
+    return failed
+
+def _tmle_xml_rows(
+        xml_files: List[str],
+        index_list: List[str],
+        tag_categories: dict,
+        refined_index_list: List[str],
+        tt_dict: Dict[str, str],
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE
+    ) -> Iterator[tuple]:
+    """
+    Analyze TMLE xml texts, yielding one `(filename, csv_row, error)` tuple per file in input order (`csv_row` is `None` for skipped files).
+    """
+    def discipline_fixer(discipline: str):
+        typo_dict = {"natural_sciences": "natural_science", "natual_science": "natural_science", "anthropology": "humanities", "social_sciences": "social_science", "marketing": "business", "astronomy": "natural_science", "english": "humanities", "chemistry": "natural_science", "pnatural_science": "natural_science", "n/a": "service_encounters"}
+        return typo_dict.get(discipline.lower().split(" ")[0], discipline.lower())
 
-        def cleaner(thingy: str):
-            return thingy.replace(",", "_").replace(" ", "_")
+    def cleaner(thingy: str):
+        return thingy.replace(",", "_").replace(" ", "_")
 
-        for filename in xml_files:
-            simple_fname = os.path.basename(filename)
-            logger.info(f"Generated file '{simple_fname}'.")
+    for filename in xml_files:
+        simple_fname = os.path.basename(filename)
+        logger.info("Generated file '%s'.", simple_fname)
+        try:
             tree = ET.parse(filename)
             root = tree.getroot()
             le = root[0].attrib.get("learning_environment", "tmle")
             if le != "traditional" and root[0].attrib["provided_by"] == "student":
+                yield filename, None, None
                 continue
 
             sdp = cleaner(root[0].attrib.get("subdiscipline", root[0].attrib.get("subject", "n/a")))
@@ -1205,29 +2768,103 @@ def LGR_XML(
             output_list = [simple_fname, le, root[0].attrib["mode"], discipline_fixer(root[0].attrib["discipline"]), sdp, tt_dict[pre_tt]]
 
             text = root[2].text if root[1].attrib["text_type"] not in ["plain_text", "plaintext"] and len(root) > 2 else root[1].text
-            output = LGR_Analysis(text, index_list, tag_categories)
+            output = LGR_Analysis(text, index_list, tag_categories, output=False, model=model, exclude=exclude)
             no_norming = ["nwords", "wrd_length", "mattr", "mean_nominal_deps", "relcl_nominal", "amod_nominal", "det_nominal", "prep_nominal", "poss_nominal", "cc_nominal", "mean_verbal_deps", "mlc", "mltu", "dc_c", "ccomp_c", "relcl_c", "infinitive_prop", "nonfinite_prop"]
             output_list += [str(output[x]) if x in no_norming else str((output[x] / output["nwords"]) * 10000) for x in refined_index_list]
-            outf.write("\n" + ",".join(output_list))
+        except Exception as e:
+            yield filename, None, _error_message(e)
+            continue
+        yield filename, output_list, None
+
+def _tmle_xml_rows_chunk(args: tuple) -> List[tuple]:
+    return list(_tmle_xml_rows(*args))
+
+# Raw counts left out of the `LGR_XML` results
+TMLE_IGNORED_INDICES = ["np", "np_deps", "relcl_dep", "amod_dep", "det_dep", "prep_dep", "poss_dep", "cc_dep", "all_clauses", "finite_clause", "finite_ind_clause", "finite_dep_clause", "finite_compl_clause", "finite_relative_clause", "nonfinite_clause", "vp_deps"]
+
+@typechecked
+def LGR_XML(
+        xml_files,
+        outname,
+        index_list: List[str],
+        tag_categories: dict,
+        n_process: int = 1,
+        model: str = DEFAULT_MODEL,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        progress: Optional[Callable] = None
+    ) -> Dict[str, str]:
+    """
+    LGR XML analysis for TMLE xml texts.\n
+    With `n_process > 1` the files are analyzed by a pool of worker processes; the CSV rows are still written in input order.\n
+    ---
+    ### Args
+    - `xml_files` (`list`): the TMLE xml files.
+    - `outname` (`str`): the output file: CSV, or columnar if it ends with `.parquet`, `.arrow` or `.feather` (the
+    metadata columns are strings).
+    - `index_list` (`List[str]`): the indices to compute.
+    - `tag_categories` (`dict`): the tag categories.
+    - `n_process` (`int`): the number of worker processes.
+    - `model` (`str`): the spaCy model (see `load_model`).
+    - `exclude` (`Sequence[str]`): the pipeline components not to load.
+    - `progress` (`Callable`): called with `(filename, csv_row, error)` once each file is done (optional, `csv_row` is
+    `None` for skipped files).\n
+    ---
+    ### Returns
+    - `Dict[str, str]`: the files that could not be analyzed, with their error.
+    """
+    failed = {}
+    refined_index_list = [x for x in index_list if x not in TMLE_IGNORED_INDICES]
+    with open_results(outname, ["filename", "learning_environment", "mode", "discipline", "subdiscipline", "text_type"] + refined_index_list) as outf:
+
+        tt_list = open(f"{DATA_PATH}/lists_LGR/text_type_map_2020-5-24.txt").read().split("\n")
+        tt_dict = {x.split("\t")[0] + "\t" + x.split("\t")[1] + "\t" + x.split("\t")[2]: x.split("\t")[3] for x in tt_list}
+        xml_files = list(xml_files)
+
+        def results():
+            if n_process <= 1:
+                yield from _tmle_xml_rows(xml_files, index_list, tag_categories, refined_index_list, tt_dict, model, exclude)
+                return
+            chunks = _chunks(xml_files, DEFAULT_CHUNK_SIZE)
+            with _process_pool(n_process, model, exclude) as pool:
+                futures = [pool.submit(_tmle_xml_rows_chunk, (chunk, index_list, tag_categories, refined_index_list, tt_dict, model, exclude)) for chunk in chunks]
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        yield from future.result()
+                    except Exception as e:
+                        yield from ((filename, None, _error_message(e)) for filename in chunk)
+
+        document_log = _DocumentLog("tmle", 6 + refined_index_list.index("nwords") if "nwords" in refined_index_list else None)
+        for filename, output_list, error in results():
+            if error is not None:
+                logger.error("Failed to analyze file '%s': %s", filename, error)
+                failed[filename] = error
+            elif output_list is not None:
+                outf.write(output_list)
+                document_log.document(filename, output_list)
+            if progress is not None:
+                progress(filename, output_list, error)
+    return failed
 
 @typechecked
 def Simple_XML_Reader(
         xml_files,
         index_list: List[str],
         tag_categories: dict,
-        target
+        target,
+        model: str = DEFAULT_MODEL
     ) -> list:
     """
-    Find and return example sentences containing the target tag.
+    Find and return example sentences containing the target tag.\n
+    The texts are parsed again for every query: to query tagged outputs repeatedly, index them once with `TagIndex`.
     """
     ex_sents = []
     for filename in xml_files:
         simple_fname = os.path.basename(filename)
-        logger.info(f"Generated file '{simple_fname}'.")
+        logger.info("Generated file '%s'.", simple_fname)
         tree = ET.parse(filename)
         root = tree.getroot()
         text = root[2].text if root[1].attrib["text_type"] not in ["plain_text", "plaintext"] and len(root) > 2 else root[1].text
-        ex_sents += sent_exampler(LGR_Analysis(text, index_list, tag_categories, output=True)["tagged_text"], target)
+        ex_sents += sent_exampler(LGR_Analysis(text, index_list, tag_categories, output=True, model=model)["tagged_text"], target)
     return ex_sents
 
 @typechecked
@@ -1247,7 +2884,7 @@ def LGR_tt_find(xml_files) -> None:
         root = tree.getroot()
         file_type = cleaner(root[0].attrib["file_type"])
         if file_type not in tt_dict:
-            logger.info(f"File type: '{file_type}'")
+            logger.info("File type: '%s'", file_type)
 
 @typechecked
 def LGR_discipline_check(xml_files) -> dict:
@@ -0,0 +1,234 @@
+"""
+Columnar storage of tagged texts.
+
+A tagged text used to be a list of sentences of per-token dicts (the basic token information plus the tag categories).
+`TaggedText` keeps the same information as columns: shared strings for the token attributes, integer arrays for the
+positions and small integer codes for the tags. Tokens are exposed as read-only dict-like views, so that code reading
+`tagged_text[sent_id][token_id]["spec_tag1"]` keeps working.
+"""
+
+# Standard Library
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterable, Iterator, List, Tuple
+
+# Token information, in the order of the former per-token dicts (after the tag categories)
+BASIC_KEYS = ("word", "lemma", "pos", "tag", "idx", "dep_rel", "head", "head idx")
+
+
+class TaggedText(Sequence):
+    """
+    Tagged text of a document, as a sequence of sentences of token views.\n
+    ---
+    ### Args
+    - `sents` (`Iterable[Tuple[int, int]]`): the `(start, end)` token positions of the sentences.
+    - `words` (`List[str]`): the token texts.
+    - `lemmas` (`List[str]`): the (lowercased) lemmas.
+    - `pos` (`List[str]`): the universal POS tags.
+    - `tags` (`List[str]`): the fine-grained POS tags.
+    - `deps` (`List[str]`): the dependency relations.
+    - `heads` (`Iterable[int]`): the positions of the heads.
+    - `categories` (`Iterable[str]`): the tag categories (`main_tag`, `spec_tag1`, ...).
+    """
+    def __init__(
+            self,
+            sents: Iterable[Tuple[int, int]],
+            words: List[str],
+            lemmas: List[str],
+            pos: List[str],
+            tags: List[str],
+            deps: List[str],
+            heads: Iterable[int],
+            categories: Iterable[str]
+        ) -> None:
+        self.sents = list(sents)
+        self.words = words
+        self.lemmas = lemmas
+        self.pos = pos
+        self.tags = tags
+        self.deps = deps
+        self.heads = array("l", heads)
+        self.categories = tuple(categories)
+        # Tag codes (0 is no tag), one column per category
+        self.tag_names = [None]
+        self._codes = {None: 0}
+        self._columns = {x: array("H", bytes(2 * len(words))) for x in self.categories}
+        # Tags outside the categories, by token position
+        self._extra = {}
+
+    @classmethod
+    def concatenate(cls, texts: Sequence["TaggedText"]) -> "TaggedText":
+        """
+        Concatenate tagged texts (e.g. of the chunks of a document), shifting their token positions.\n
+        ---
+        ### Args
+        - `texts` (`Sequence[TaggedText]`): the tagged texts, with the same categories.\n
+        ---
+        ### Returns
+        - `TaggedText`: the concatenated tagged text.
+        """
+        sents, words, lemmas, pos, tags, deps, heads = [], [], [], [], [], [], []
+        offset = 0
+        for text in texts:
+            sents.extend((start + offset, end + offset) for start, end in text.sents)
+            words += text.words
+            lemmas += text.lemmas
+            pos += text.pos
+            tags += text.tags
+            deps += text.deps
+            heads.extend(x + offset for x in text.heads)
+            offset += len(text.words)
+
+        merged = cls(sents, words, lemmas, pos, tags, deps, heads, texts[0].categories if texts else ())
+        offset = 0
+        for text in texts:
+            codes = [merged._code(x) for x in text.tag_names]
+            for category, column in text._columns.items():
+                merged._columns[category][offset:offset + len(column)] = array("H", [codes[x] for x in column])
+            merged._extra.update((i + offset, dict(x)) for i, x in text._extra.items())
+            offset += len(text.words)
+        return merged
+
+    def _code(self, tag: Any) -> int:
+        code = self._codes.get(tag)
+        if code is None:
+            code = self._codes[tag] = len(self.tag_names)
+            self.tag_names.append(tag)
+        return code
+
+    def set_tags(
+            self,
+            i: int,
+            tags: dict
+        ) -> None:
+        """
+        Set the tags of the token at position `i`.\n
+        ---
+        ### Args
+        - `i` (`int`): the token position.
+        - `tags` (`dict`): the tags, by category.
+        """
+        for category, tag in tags.items():
+            column = self._columns.get(category)
+            if column is None:
+                self._extra.setdefault(i, {})[category] = tag
+                continue
+            column[i] = self._code(tag)
+
+    def value(
+            self,
+            i: int,
+            key: str
+        ) -> Any:
+        """
+        Return an attribute (see `keys`) of the token at position `i`.
+        """
+        column = self._columns.get(key)
+        if column is not None:
+            return self.tag_names[column[i]]
+        if key == "word":
+            return self.words[i]
+        if key == "lemma":
+            return self.lemmas[i]
+        if key == "pos":
+            return self.pos[i]
+        if key == "tag":
+            return self.tags[i]
+        if key == "idx":
+            return str(i)
+        if key == "dep_rel":
+            return self.deps[i]
+        if key == "head":
+            return self.words[self.heads[i]]
+        if key == "head idx":
+            return str(self.heads[i])
+        return self._extra.get(i, {})[key]
+
+    def keys(self, i: int) -> tuple:
+        """
+        Return the attribute names of the token at position `i`: the tag categories, `BASIC_KEYS` and any other tag.
+        """
+        extra = self._extra.get(i)
+        return self.categories + BASIC_KEYS + (tuple(extra) if extra else ())
+
+    def to_list(self) -> List[List[dict]]:
+        """
+        Return the tagged text as a list of sentences of per-token dicts.
+        """
+        return [[dict(token) for token in sent] for sent in self]
+
+    def __len__(self) -> int:
+        return len(self.sents)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TaggedSentence(self, *x) for x in self.sents[index]]
+        return TaggedSentence(self, *self.sents[index])
+
+    def __iter__(self) -> Iterator["TaggedSentence"]:
+        return (TaggedSentence(self, start, end) for start, end in self.sents)
+
+    def __repr__(self) -> str:
+        return f"<TaggedText: {len(self.sents)} sentences, {len(self.words)} tokens>"
+
+
+class TaggedSentence(Sequence):
+    """
+    Sentence of a `TaggedText`, as a sequence of token views.
+    """
+    __slots__ = ("text", "start", "end")
+
+    def __init__(
+            self,
+            text: TaggedText,
+            start: int,
+            end: int
+        ) -> None:
+        self.text = text
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TaggedToken(self.text, i) for i in range(self.start, self.end)[index]]
+        return TaggedToken(self.text, range(self.start, self.end)[index])
+
+    def __iter__(self) -> Iterator["TaggedToken"]:
+        text = self.text
+        return (TaggedToken(text, i) for i in range(self.start, self.end))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class TaggedToken(Mapping):
+    """
+    Read-only dict-like view of a token of a `TaggedText`.
+    """
+    __slots__ = ("text", "i")
+
+    def __init__(
+            self,
+            text: TaggedText,
+            i: int
+        ) -> None:
+        self.text = text
+        self.i = i
+
+    def __getitem__(self, key: str) -> Any:
+        return self.text.value(self.i, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.text.keys(self.i))
+
+    def __len__(self) -> int:
+        return len(self.text.keys(self.i))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.text.keys(self.i)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -0,0 +1,237 @@
+"""
+Persistent inverted index of the tags of tagged texts, for concordance queries.
+
+The index maps each tag (`pp1`, `nn_all`, ...) to the sentences containing it, by document and sentence id, and keeps
+the words and tagged token positions of each sentence, so that example sentences can be found and marked up as
+`sent_exampler` does without reading (or parsing) the texts again. It is stored as an SQLite database; documents are
+added from tagged texts or from saved `xml`/`vertical` outputs, which are only indexed again when the file changed.
+"""
+
+# Standard Library
+import os
+import json
+import heapq
+import sqlite3
+import itertools
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Local Modules
+from .tagged import BASIC_KEYS
+
+logger = logging.getLogger('TAASSC')
+
+# Bump when the schema changes
+TAG_INDEX_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE documents (doc_id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, size INTEGER, mtime_ns INTEGER);
+CREATE TABLE sentences (doc_id INTEGER, sent_id INTEGER, words TEXT, tags TEXT, PRIMARY KEY (doc_id, sent_id)) WITHOUT ROWID;
+CREATE TABLE postings (tag TEXT, doc_id INTEGER, sent_id INTEGER, tokens INTEGER, PRIMARY KEY (tag, doc_id, sent_id)) WITHOUT ROWID;
+"""
+_TABLES = ("documents", "sentences", "postings")
+
+
+class TagIndex:
+    """
+    Inverted index of tags, stored in an SQLite database.\n
+    ---
+    ### Args
+    - `path` (`str`): the database file (created if needed).
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != TAG_INDEX_FORMAT_VERSION:
+            if version:
+                logger.warning(f"Rebuilding tag index '{path}' (format {version}, expected {TAG_INDEX_FORMAT_VERSION}).")
+            with self.connection:
+                for table in _TABLES:
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self.connection.executescript(_SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {TAG_INDEX_FORMAT_VERSION}")
+
+    def __enter__(self) -> "TagIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def __contains__(self, name: object) -> bool:
+        return self.connection.execute("SELECT 1 FROM documents WHERE name = ?", (name,)).fetchone() is not None
+
+    def add(
+            self,
+            name: str,
+            tagged_text,
+            size: Optional[int] = None,
+            mtime_ns: Optional[int] = None
+        ) -> None:
+        """
+        Index a tagged text, replacing any document with the same name.\n
+        ---
+        ### Args
+        - `name` (`str`): the document name.
+        - `tagged_text`: the tagged text (a `TaggedText`, or a list of sentences of per-token dicts).
+        - `size` (`int`): the size of the source file (to detect changes, see `add_files`).
+        - `mtime_ns` (`int`): the modification time of the source file.
+        """
+        sentences = []
+        postings = []
+        for sent_id, sent in enumerate(tagged_text):
+            if not sent:
+                continue
+            words = []
+            positions = {}
+            for position, token in enumerate(sent):
+                words.append(token["word"])
+                for key in token:
+                    if key not in BASIC_KEYS:
+                        value = token[key]
+                        # A token can carry the same tag in two categories
+                        if value and position not in positions.setdefault(value, []):
+                            positions[value].append(position)
+            sentences.append((sent_id, json.dumps(words), json.dumps(positions)))
+            postings.extend((tag, sent_id, len(x)) for tag, x in positions.items())
+
+        with self.connection:
+            self._remove(name)
+            doc_id = self.connection.execute("INSERT INTO documents (name, size, mtime_ns) VALUES (?, ?, ?)", (name, size, mtime_ns)).lastrowid
+            self.connection.executemany(f"INSERT INTO sentences VALUES ({doc_id}, ?, ?, ?)", sentences)
+            self.connection.executemany(f"INSERT INTO postings VALUES (?, {doc_id}, ?, ?)", postings)
+
+    def add_files(self, filenames: Iterable[str]) -> Dict[str, str]:
+        """
+        Index saved `xml` or `vertical` outputs (see `read_tagged`), skipping the files already indexed and unchanged.\n
+        Documents are named by the absolute path of their file.\n
+        ---
+        ### Args
+        - `filenames` (`Iterable[str]`): the saved outputs.\n
+        ---
+        ### Returns
+        - `Dict[str, str]`: the files that could not be indexed, with their error.
+        """
+        from .taassc import read_tagged
+
+        failed = {}
+        added = 0
+        for filename in filenames:
+            name = os.path.abspath(filename)
+            try:
+                stat = os.stat(filename)
+                row = self.connection.execute("SELECT size, mtime_ns FROM documents WHERE name = ?", (name,)).fetchone()
+                if row == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                self.add(name, read_tagged(filename), stat.st_size, stat.st_mtime_ns)
+                added += 1
+            except Exception as e:
+                failed[filename] = f"{type(e).__name__}: {e}"
+                logger.error("Failed to index file '%s': %s", filename, failed[filename])
+        logger.info(f"Indexed {added} files in tag index '{self.path}'.")
+        return failed
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a document from the index.
+        """
+        with self.connection:
+            self._remove(name)
+
+    def _remove(self, name: str) -> None:
+        row = self.connection.execute("SELECT doc_id FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is not None:
+            for table in _TABLES:
+                self.connection.execute(f"DELETE FROM {table} WHERE doc_id = ?", row)
+
+    def tag_counts(self) -> Dict[str, int]:
+        """
+        Return the number of tokens carrying each tag.
+        """
+        return dict(self.connection.execute("SELECT tag, SUM(tokens) FROM postings GROUP BY tag ORDER BY tag"))
+
+    def _hits(
+            self,
+            tags: List[str],
+            match: str
+        ) -> Iterator[Tuple[int, int]]:
+        """
+        Yield the `(doc_id, sent_id)` of the sentences containing all (or any of) the tags, in order.
+        """
+        if match == "any":
+            # Merge the (ordered) sentences of each tag
+            cursors = [self.connection.execute("SELECT doc_id, sent_id FROM postings WHERE tag = ? ORDER BY doc_id, sent_id", (x,)) for x in tags]
+            last = None
+            for hit in heapq.merge(*cursors):
+                if hit != last:
+                    yield hit
+                    last = hit
+            return
+        # Scan the sentences of the first tag, looking up the others by primary key
+        joins = "".join(
+            f" JOIN postings p{i} ON p{i}.tag = ? AND p{i}.doc_id = p0.doc_id AND p{i}.sent_id = p0.sent_id"
+            for i in range(1, len(tags))
+        )
+        yield from self.connection.execute(
+            f"SELECT p0.doc_id, p0.sent_id FROM postings p0{joins} WHERE p0.tag = ? ORDER BY p0.doc_id, p0.sent_id",
+            tags[1:] + tags[:1]
+        )
+
+    def query(
+            self,
+            tags: Sequence[str],
+            match: str = "all",
+            limit: Optional[int] = None
+        ) -> List[Tuple[str, int, str]]:
+        """
+        Find the sentences containing the tags, in document and sentence order.\n
+        The tokens carrying one of the tags are marked up as `sent_exampler` does (`word <--tag<<<`).\n
+        ---
+        ### Args
+        - `tags` (`Sequence[str]`): the tags.
+        - `match` (`str`): `"all"` for the sentences containing all the tags, `"any"` for those containing one of them.
+        - `limit` (`int`): the maximum number of sentences.\n
+        ---
+        ### Returns
+        - `List[Tuple[str, int, str]]`: the document name, sentence id and marked up sentence of each match.
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"Unknown match '{match}' (expected 'all' or 'any')")
+        tags = list(dict.fromkeys(tags))
+        hits = itertools.islice(self._hits(tags, match), limit) if tags else ()
+
+        names = {}
+        results = []
+        for doc_id, sent_id in list(hits):
+            name = names.get(doc_id)
+            if name is None:
+                name = names[doc_id] = self.connection.execute("SELECT name FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()[0]
+            words, positions = self.connection.execute("SELECT words, tags FROM sentences WHERE doc_id = ? AND sent_id = ?", (doc_id, sent_id)).fetchone()
+            words = json.loads(words)
+            marks = [[] for _ in words]
+            positions = json.loads(positions)
+            for tag in tags:
+                for position in positions.get(tag, ()):
+                    marks[position].append(f"<--{tag}<<<")
+            results.append((name, sent_id, " ".join(x for word, mark in zip(words, marks) for x in [word] + mark)))
+        return results
+
+    def examples(
+            self,
+            tags: Sequence[str],
+            match: str = "all",
+            limit: Optional[int] = None
+        ) -> List[str]:
+        """
+        Return the marked up sentences containing the tags (see `query`), as `sent_exampler` does.
+        """
+        return [sentence for _, _, sentence in self.query(tags, match, limit)]
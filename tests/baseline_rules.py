@@ -0,0 +1,425 @@
+"""
+Reference implementation of the tagging rules, reading the spaCy tokens directly (`token.children`, `token.head`,
+`document[token.i ± k]`), as they were before the rules read `DocTables` columns. Used by the tests to check that the
+table-based rules tag and count the same.
+"""
+
+# Local Modules
+from taassc import taassc
+
+_resources = taassc.load_resources()
+nominal_stop = _resources["nominal_stop"]
+noun_dict = _resources["noun_dict"]
+verb_dict = _resources["verb_dict"]
+that_verb_dict = _resources["that_verb_dict"]
+to_verb_dict = _resources["to_verb_dict"]
+phrasal_verb_dict = _resources["phrasal_verb_dict"]
+adj_dict = _resources["adj_dict"]
+adv_dict = _resources["adv_dict"]
+categories = taassc.categories
+
+
+def wrd_nchar(token, features):
+    if token.pos_ not in ["PUNCT", "SYM", "SPACE", "X"]:
+        features["wrd_length"] += len(token.text)
+        features["nwords"] += 1
+        lemma = token.text.lower() if token.lemma_ == "-PRON-" else token.lemma_
+        features["lemma_text"].append(f"{lemma}_{token.pos_}")
+
+
+def noun_phrase_complexity(token, features):
+    if token.pos_ == "NOUN":
+        features["np"] += 1
+        deps = [child.dep_ for child in token.children]
+        features["np_deps"] += len(deps)
+        for x in deps:
+            if x == "relcl": features["relcl_dep"] += 1
+            if x == "amod": features["amod_dep"] += 1
+            if x == "det": features["det_dep"] += 1
+            if x == "prep": features["prep_dep"] += 1
+            if x == "poss": features["poss_dep"] += 1
+            if x == "cc": features["cc_dep"] += 1
+
+
+def clausal_complexity(token, features):
+    if token.pos_ == "VERB" and token.dep_ != "aux":
+        features["all_clauses"] += 1
+        deps = [child.dep_ for child in token.children]
+        if "nsubj" in deps or "nsubjpass" in deps:
+            features["finite_clause"] += 1
+            features["finite_ind_clause" if token.dep_ in ["ROOT", "conj"] else "finite_dep_clause"] += 1
+            if token.dep_ == "ccomp": features["finite_compl_clause"] += 1
+            if token.dep_ == "relcl": features["finite_relative_clause"] += 1
+        else:
+            features["nonfinite_clause"] += 1
+        features["vp_deps"] += len(deps)
+
+
+def basic_info(token, tokens):
+    tokens.update({
+        "word": token.text,
+        "lemma": token.lemma_.lower(),
+        "pos": token.pos_,
+        "tag": token.tag_,
+        "idx": str(token.i),
+        "dep_rel": token.dep_,
+        "head": token.head.text,
+        "head idx": str(token.head.i)
+    })
+
+
+def pronoun_analysis(token, tokens, features):
+    pp1 = "i we our us my me ourselves myself".split()
+    pp2 = "you your yourself ya thy thee thine".split()
+    pp3 = "he she they their his them her him themselves himself herself".split()
+    pp3_it = ["it"]
+    pp_all = pp1 + pp2 + pp3 + pp3_it
+
+    if token.text.lower() in pp_all:
+        features["pp_all"] += 1
+        tokens["main_tag"] = "pp_all"
+
+    if token.text.lower() in pp1:
+        features["pp1"] += 1
+        tokens["spec_tag1"] = "pp1"
+    elif token.text.lower() in pp2:
+        features["pp2"] += 1
+        tokens["spec_tag1"] = "pp2"
+    elif token.text.lower() in pp3:
+        features["pp3"] += 1
+        tokens["spec_tag1"] = "pp3"
+    elif token.text.lower() in pp3_it:
+        features["pp3_it"] += 1
+        tokens["spec_tag1"] = "pp3_it"
+
+
+def advanced_pronoun(token, document, tokens, features):
+    demonstrative_list = ["this", "that", "these", "those"]
+    indefinite_l = "everybody everyone everything somebody someone something anybody anyone anything nobody noone none nothing one ones".split()
+
+    if token.text.lower() in indefinite_l and token.dep_ in ["nsubj", "nsubjpass", "dobj", "pobj"]:
+        features["pp_indefinite"] += 1
+        tokens["spec_tag1"] = "pp_indefinite"
+    elif token.text.lower() in demonstrative_list:
+        if token.dep_ == "advmod" or (
+            token.i + 1 < len(document) and document[token.i + 1].text.lower() in ["who", ".", "!", "?", ":"]
+        ) or (
+            token.dep_ == "nsubjpass" and token.head.dep_ != "relcl"
+        ) or (
+            token.dep_ == "pobj"
+        ) or (
+            token.dep_ in ["nsubj", "dobj"] and token.head.dep_ != "relcl" and token.head.pos_ != "NOUN"
+        ):
+            features["pp_demonstrative"] += 1
+            tokens["spec_tag1"] = "pp_demonstrative"
+
+
+def pro_verb(token, tokens, features):
+    if token.lemma_ == "do" and token.pos_ == "VERB" and token.dep_ != "aux":
+        if not any(child.dep_ in ["dobj", "ccomp"] for child in token.children):
+            features["pv_do"] += 1
+            tokens["spec_tag2"] = "pv_do"
+
+
+def contraction_check(token, tokens, features):
+    if token.text.lower() in "'m 'll n't 're 's".split() and token.dep_ != "case":
+        features["contraction"] += 1
+        tokens["spec_tag4"] = "contraction"
+
+
+def split_aux_check(token, tokens, features):
+    if token.pos_ == "VERB" and token.dep_ not in ["aux", "aux_pass"]:
+        end = token.i
+        start = next((x.i for x in token.children if x.dep_ in ["aux", "aux_pass"]), None)
+        adv = next((x.i for x in token.children if x.dep_ == "advmod"), None)
+        if start is not None and adv is not None and start < adv < end:
+            features["split_aux"] += 1
+            tokens["spec_tag2"] = "split_aux"
+
+
+def prep_analysis(token, tokens, features):
+    if token.dep_ == "mark":
+        if token.text.lower() == "because":
+            features["adverbial_subordinator_causitive"] += 1
+            tokens["spec_tag3"] = "adverbial_subordinator_causitive"
+        elif token.text.lower() in ["if", "unless"]:
+            features["adverbial_subordinator_conditional"] += 1
+            tokens["spec_tag3"] = "adverbial_subordinator_conditional"
+        elif token.text.lower() not in ["that"]:
+            features["adverbial_subordinator_other"] += 1
+            tokens["spec_tag3"] = "adverbial_subordinator_other"
+    elif token.dep_ == "prep":
+        if any(child.dep_ in ["pobj", "pcomp", "prep", "amod", "cc"] for child in token.children):
+            features["prep_phrase"] += 1
+            tokens["main_tag"] = "prep_phrase"
+
+
+def coordination_analysis(token, words_count, tokens, features):
+    if token.text.lower() in ["and", "or"]:
+        if words_count == 0:
+            features["cc_clause"] += 1
+            tokens["spec_tag1"] = "cc_clause"
+        elif token.head.pos_ in ["NOUN", "ADJ", "ADV", "PRON", "PROPN", "PART"]:
+            features["cc_phrase"] += 1
+            tokens["spec_tag1"] = "cc_phrase"
+        elif token.head.pos_ == "VERB":
+            l = sorted(
+                [(child.i, "cc_clause" if child.dep_ == "conj" and "nsubj" in [chld.dep_ for chld in child.children] else "cc_phrase") for child in token.head.children if child.dep_ in ["cc", "conj"]],
+                key=lambda x: x[0]
+            )
+            for i, (idx, relation) in enumerate(l):
+                if idx == token.i:
+                    next_relation = l[i + 1][1] if i + 1 < len(l) else "cc_clause"
+                    features[next_relation] += 1
+                    tokens["spec_tag1"] = next_relation
+                    break
+
+
+def noun_analysis(token, tokens, features):
+    if token.pos_ in ["NOUN", "PROPN"]:
+        features["nn_all"] += 1
+        tokens["main_tag"] = "nn_all"
+        nominal_suffixes = {
+            6: ["nesses"],
+            5: ["ician", "ities", "ances", "ences", "ments", "tions", "ships", "esses", "ettes", "hoods"],
+            4: ["ance", "ence", "ment", "ness", "tion", "ship", "ette", "hood", "cies", "ries", "ants", "ents", "doms", "ings", "ages", "fuls", "isms", "ists", "ites", "lets", "eses", "ates"],
+            3: ["ant", "ent", "dom", "ing", "ity", "ure", "age", "ese", "ess", "ful", "ism", "ist", "ite", "let", "als", "ees", "ers", "ors", "ate"],
+            2: ["al", "cy", "ee", "er", "or", "ry"],
+        }
+        proper_suffixes = {
+            4: ["ians"],
+            3: ["ian", "ans"],
+            2: ["an"],
+        }
+        if token.lemma_.lower() not in nominal_stop:
+            for length, suffixes in nominal_suffixes.items():
+                if len(token.text) > length and token.text.lower()[-length:] in suffixes:
+                    features["nominalization"] += 1
+                    tokens["spec_tag1"] = "nominalization"
+                    break
+            else:
+                for length, suffixes in proper_suffixes.items():
+                    if len(token.text) > length and token.pos_ == "PROPN" and token.text.lower()[-length:] in suffixes:
+                        features["nominalization"] += 1
+                        tokens["spec_tag1"] = "nominalization"
+                        break
+
+
+def semantic_analysis_noun(token, tokens, features):
+    if token.pos_ in ["NOUN", "PROPN"]:
+        lemma = token.lemma_.lower()
+        if lemma in noun_dict and noun_dict[lemma] in categories:
+            features[noun_dict[lemma]] += 1
+            tokens["semantic_tag1"] = noun_dict[lemma]
+
+
+def be_analysis(token, tokens, features):
+    if token.lemma_.lower() == "be" and token.dep_ not in ["aux", "auxpass"]:
+        features["be_mv"] += 1
+        tokens["spec_tag2"] = "be_mv"
+
+
+def verb_analysis(token, document, tokens, features):
+    that0_list = "check consider ensure illustrate fear say assume understand hold appreciate insist feel reveal indicate wish decide express follow suggest saw direct pray observe record imagine see think show confirm ask meant acknowledge recognize need accept contend come maintain believe claim verify demonstrate learn hope thought reflect deduce prove find deny wrote read repeat remember admit adds advise compute reach trust yield state describe realize expect mean report know stress note told held explain hear gather establish suppose found use fancy submit doubt felt".split()
+    to_verb_list = "to_speech_act_verb cognition_verb desire_verb to_causative_verb probability_verb".split()
+    to_adj_list = "certainty_adj ability_willingness_adj personal_affect_adj ease_difficulty_adj evaluative_adj".split()
+
+    if token.pos_ == "VERB":
+        features["verb"] += 1
+        tokens["main_tag"] = "verb"
+        if token.dep_ == "aux":
+            if token.text in "can may might could".split():
+                features["modal_possibility"] += 1
+                tokens["spec_tag5"] = "modal_possibility"
+            elif token.text in "ought must should".split():
+                features["modal_necessity"] += 1
+                tokens["spec_tag5"] = "modal_necessity"
+            elif token.text in "will would shall".split():
+                features["modal_predictive"] += 1
+                tokens["spec_tag5"] = "modal_predictive"
+            elif token.tag_ == "VBD":
+                features["past_tense"] += 1
+                tokens["spec_tag4"] = "past_tense"
+            else:
+                features["non_past_tense"] += 1
+                tokens["spec_tag1"] = "non_past_tense"
+        else:
+            if token.head.lemma_ in that0_list and token.dep_ == "ccomp" and token.i > token.head.i:
+                if all(
+                    x.text.lower() not in ["that", "who", "what", "how", "where", "why", "when", "whose", "whom", "whomever"] and x.dep_ != "det"
+                    for x in token.children
+                ) and not any(
+                    x.dep_ == "mark" or x.dep_ in ["nsubj", "csubj"] for x in token.children
+                ) and token.tag_ != "VBG":
+                    if document[token.head.i - 1].text not in ["that", "who", "what", "how", "where", "why", "when", "whose", "whom", "whomever", "whatever", "which"]:
+                        if document[token.head.i + 1].text not in ["that", "who", "what", "how", "where", "why", "when", "whose", "whom", "whomever", "whatever", "which", '"', "'", ",", ":", "myself", "itself", "herself", "ourself", "ourselves", "themselves", "themself"]:
+                            if " ".join([document[token.head.i + 1].text, document[token.head.i + 2].text]) not in ["' ,", '" ,']:
+                                features["complementizer_that0"] += 1
+                                tokens["spec_tag6"] = "complementizer_that0"
+            if token.dep_ == "acl" and token.tag_ == "VBN":
+                features["past_participial_clause"] += 1
+                tokens["spec_tag6"] = "past_participial_clause"
+            if document[token.i - 1].text.lower() == "to" and document[token.i - 1].dep_ == "aux" and document[token.i - 1].head.i == token.i:
+                contr_token = document[token.i - 2]
+                if contr_token.text.lower() not in ["able", "ought"]:
+                    features["to_clause"] += 1
+                    tokens["spec_tag4"] = "to_clause"
+                    if contr_token.pos_ == "NOUN":
+                        features["to_clause_noun"] += 1
+                        tokens["spec_tag5"] = "to_clause_noun"
+                    if contr_token.pos_ == "VERB":
+                        features["to_clause_verb"] += 1
+                        tokens["spec_tag5"] = "to_clause_verb"
+                        if contr_token.lemma_ in to_verb_dict and to_verb_dict[contr_token.lemma_] in to_verb_list:
+                            features[f"to_clause_verb_{to_verb_dict[contr_token.lemma_][:-5]}"] += 1
+                            tokens["semantic_tag2"] = f"to_clause_verb_{to_verb_dict[contr_token.lemma_][:-5]}"
+                    if contr_token.pos_ == "ADJ":
+                        features["to_clause_adjective"] += 1
+                        tokens["spec_tag5"] = "to_clause_adjective"
+                        if contr_token.lemma_ in adj_dict and adj_dict[contr_token.lemma_] in to_adj_list:
+                            features[f"to_clause_adjective_{adj_dict[contr_token.lemma_][:-4]}"] += 1
+                            tokens["semantic_tag2"] = f"to_clause_adjective_{adj_dict[contr_token.lemma_][:-4]}"
+            if token.tag_ == "VBD":
+                features["past_tense"] += 1
+                tokens["spec_tag1"] = "past_tense"
+            elif token.tag_ in ["VBN", "VBG"]:
+                if any(x.lemma_ == "have" and x.dep_ == "aux" for x in token.children):
+                    features["perfect_aspect"] += 1
+                    tokens["spec_tag1"] = "perfect_aspect"
+            else:
+                features["non_past_tense"] += 1
+                tokens["spec_tag1"] = "non_past_tense"
+
+
+def passive_analysis(token, tokens, features):
+    if token.pos_ == "VERB" and any(x.dep_ == "auxpass" for x in token.children):
+        if any(x.dep_ == "agent" for x in token.children):
+            features["by_passive"] += 1
+            tokens["spec_tag3"] = "by_passive"
+        else:
+            features["agentless_passive"] += 1
+            tokens["spec_tag3"] = "agentless_passive"
+
+
+def semantic_analysis_verb(token, tokens, features):
+    var_list = "activity_verb communication_verb mental_verb causation_verb occurrence_verb existence_verb aspectual_verb that_nonfactive_verb attitudinal_verb factive_verb likelihood_verb".split()
+    intransitive_phrasal_list = "intransitive_activity_phrasal_verb intransitive_occurence_phrasal_verb copular_phrasal_verb intransitive_aspectual_phrasal_verb".split()
+    transitive_phrasal_list = "transitive_activity_phrasal_verb transitive_mental_phrasal_verb transitive_communication_phrasal_verb".split()
+
+    lemma = token.lemma_.lower()
+    if token.pos_ == "VERB":
+        if "prt" in [chld.dep_ for chld in token.children]:
+            for x in token.children:
+                if x.dep_ == "prt":
+                    phrasal = f"{lemma} {x.text}"
+                    if phrasal in phrasal_verb_dict:
+                        features["all_phrasal_verbs"] += 1
+                        tokens["main_tag2"] = "all_phrasal_verbs"
+                        if "dobj" in [chld.dep_ for chld in token.children]:
+                            if phrasal in phrasal_verb_dict and phrasal_verb_dict[phrasal] in transitive_phrasal_list:
+                                features[phrasal_verb_dict[phrasal]] += 1
+                                tokens["semantic_tag1"] = phrasal_verb_dict[phrasal]
+                        else:
+                            if phrasal in phrasal_verb_dict and phrasal_verb_dict[phrasal] in intransitive_phrasal_list:
+                                features[phrasal_verb_dict[phrasal]] += 1
+                                tokens["semantic_tag1"] = phrasal_verb_dict[phrasal]
+        else:
+            if lemma in verb_dict and verb_dict[lemma] in var_list:
+                features[verb_dict[lemma]] += 1
+                tokens["semantic_tag1"] = verb_dict[lemma]
+
+
+def adjective_analysis(token, tokens, features):
+    attr_list = "size_attributive_adj time_attributive_adj color_attributive_adj evaluative_attributive_adj relational_attributive_adj topical__attributive_adj".split()
+
+    if token.dep_ in ["acomp"]:
+        features["jj_predicative"] += 1
+        tokens["spec_tag1"] = "jj_predicative"
+        if token.lemma_.lower() in adj_dict and adj_dict[token.lemma_.lower()] in attr_list:
+            features[adj_dict[token.lemma_.lower()]] += 1
+            tokens["semantic_tag1"] = adj_dict[token.lemma_.lower()]
+    elif token.dep_ == "amod":
+        features["jj_attributive"] += 1
+        tokens["spec_tag1"] = "jj_attributive"
+
+
+def adverb_analysis(token, words_count, tokens, features):
+    var_list = "discourse_particle place_adverbials time_adverbials conjuncts_adverb downtoners_adverb hedges_adverb amplifiers_adverb emphatics".split()
+    var_list2 = "attitudinal_adverb factive_adverb likelihood_adverb nonfactive_adverb".split()
+
+    lemma = token.lemma_.lower()
+    if token.pos_ == "ADV" or token.dep_ in ["npadvmod", "advmod", "intj"]:
+        if lemma in adv_dict and adv_dict[lemma] in var_list:
+            features[adv_dict[lemma]] += 1
+            tokens["spec_tag1"] = adv_dict[lemma]
+        if words_count == 0 and token.text.lower() in "well now anyway anyhow anyways".split():
+            features["discourse_particle"] += 1
+            tokens["spec_tag1"] = "discourse_particle"
+        elif lemma in adv_dict and adv_dict[lemma] in var_list2:
+            features[adv_dict[lemma]] += 1
+            tokens["semantic_tag1"] = adv_dict[lemma]
+
+
+def wh_analysis(token, words_count, document, document_sentence, tokens, features):
+    if token.tag_ in ["WDT", "WP", "WP$", "WRB"] and token.text.lower() != "that":
+        if token.head.dep_ not in ["csubj", "ccomp", "pcomp"] and (words_count == 0 or document[token.i - 1].text in ['"', "'", ":"]) and "?" in [t.text for t in document_sentence]:
+            features["wh_question"] += 1
+            tokens["spec_tag1"] = "wh_question"
+        if document[token.i - 1].pos_ == "VERB" and document[token.i - 1].lemma_ != "be":
+            if token.head.dep_ != "advcl":
+                features["wh_clause"] += 1
+                tokens["spec_tag1"] = "wh_clause"
+        if token.dep_ == "pobj" and token.head.head.dep_ == "relcl":
+            features["wh_relative_clause"] += 1
+            tokens["main_tag"] = "wh_relative_clause"
+            features["wh_relative_prep_clause"] += 1
+            tokens["spec_tag1"] = "wh_relative_prep_clause"
+        if token.head.dep_ == "relcl":
+            if token.dep_ in ["nsubj", "nsubjpass"]:
+                features["wh_relative_clause"] += 1
+                tokens["main_tag"] = "wh_relative_clause"
+                features["wh_relative_subj_clause"] += 1
+                tokens["spec_tag1"] = "wh_relative_subj_clause"
+            if token.dep_ in ["dobj"]:
+                features["wh_relative_clause"] += 1
+                tokens["main_tag"] = "wh_relative_clause"
+                features["wh_relative_obj_clause"] += 1
+                tokens["spec_tag1"] = "wh_relative_obj_clause"
+
+
+def that_analysis(token, document, tokens, features):
+    that_verb_list = "nonfactive_verb attitudinal_verb factive_verb likelihood_verb".split()
+    that_noun_list = "nn_nonfactive nn_attitudinal nn_factive_noun nn_likelihood".split()
+
+    if token.text.lower() == "that":
+        if token.dep_ in ["nsubj", "nsubjpass", "dobj", "pobj"] and token.head.dep_ == "relcl":
+            features["that_relative_clause"] += 1
+            tokens["spec_tag1"] = "that_relative_clause"
+        if token.dep_ in ["mark", "nsubj"] and token.head.dep_ in ["ccomp", "acl"]:
+            features["that_complement_clause"] += 1
+            tokens["spec_tag1"] = "that_complement_clause"
+            if document[token.i - 1].pos_ == "VERB":
+                features["that_verb_clause"] += 1
+                tokens["spec_tag2"] = "that_verb_clause"
+                verb_lemma = document[token.i - 1].lemma_.lower()
+                if verb_lemma in that_verb_dict and that_verb_dict[verb_lemma] in that_verb_list:
+                    features[f"that_verb_clause_{that_verb_dict[verb_lemma][:-5]}"] += 1
+                    tokens["semantic_tag1"] = f"that_verb_clause_{that_verb_dict[verb_lemma][:-5]}"
+            if document[token.i - 1].pos_ == "NOUN":
+                features["that_noun_clause"] += 1
+                tokens["spec_tag2"] = "that_noun_clause"
+                noun_lemma = document[token.i - 1].lemma_.lower()
+                if noun_lemma in noun_dict and noun_dict[noun_lemma] in that_noun_list:
+                    features[f"that_noun_clause_{noun_dict[noun_lemma][3:]}"] += 1
+                    tokens["semantic_tag1"] = f"that_noun_clause_{noun_dict[noun_lemma][3:]}"
+            if document[token.i - 1].pos_ == "ADJ":
+                features["that_adjective_clause"] += 1
+                tokens["spec_tag2"] = "that_adjective_clause"
+                adj_lemma = document[token.i - 1].lemma_.lower()
+                if adj_lemma in adj_dict:
+                    if adj_dict[adj_lemma] == "attitudinal_adj":
+                        features["that_adjective_clause_attitudinal"] += 1
+                        tokens["semantic_tag1"] = "that_adjective_clause_attitudinal"
+                    if adj_dict[adj_lemma] == "likelihood_adj":
+                        features["that_adjective_clause_likelihood"] += 1
+                        tokens["semantic_tag1"] = "that_adjective_clause_likelihood"
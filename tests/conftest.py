@@ -0,0 +1,11 @@
+"""
+Run the tests against the package in `src` (without installing it).
+"""
+
+# Standard Library
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
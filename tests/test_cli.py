@@ -0,0 +1,62 @@
+"""
+The command-line inputs (`expand_inputs`) must expand `@list` files, folders and glob patterns in argument order.
+"""
+
+# Standard Library
+import os
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc.cli import build_parser, expand_inputs
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for name in ["b.txt", "a.txt", "c.xml", "sub/d.txt", "sub/deep/e.txt"]:
+        os.makedirs(os.path.dirname(tmp_path / name), exist_ok=True)
+        (tmp_path / name).write_text(name)
+    return tmp_path
+
+
+def test_folders(corpus):
+    # Sorted, and not recursive
+    assert expand_inputs([str(corpus)], "*.txt") == [str(corpus / "a.txt"), str(corpus / "b.txt")]
+    assert expand_inputs([str(corpus)], "*.xml") == [str(corpus / "c.xml")]
+    assert expand_inputs([str(corpus / "sub")], "*.xml") == []
+
+
+def test_globs(corpus):
+    assert expand_inputs([str(corpus / "*.t?t")], "*.xml") == [str(corpus / "a.txt"), str(corpus / "b.txt")]
+    assert expand_inputs([str(corpus / "[bc].*")], "*.txt") == [str(corpus / "b.txt"), str(corpus / "c.xml")]
+    assert expand_inputs([str(corpus / "**" / "*.txt")], "*.txt") == [
+        str(corpus / x) for x in ["a.txt", "b.txt", "sub/d.txt", "sub/deep/e.txt"]]
+    assert expand_inputs([str(corpus / "*.csv")], "*.txt") == []
+
+
+def test_list_files(corpus):
+    # One path per line, blank lines and surrounding spaces ignored, in file order
+    (corpus / "list").write_text(f"{corpus / 'b.txt'}\n\n  {corpus / 'missing.txt'}  \n{corpus / 'a.txt'}")
+    assert expand_inputs([f"@{corpus / 'list'}"], "*.txt") == [str(corpus / x) for x in ["b.txt", "missing.txt", "a.txt"]]
+    with pytest.raises(FileNotFoundError):
+        expand_inputs([f"@{corpus / 'missing'}"], "*.txt")
+
+
+def test_argument_order(corpus):
+    # Files are kept as given, even missing ones (reported when analyzed)
+    (corpus / "list").write_text(str(corpus / "c.xml"))
+    inputs = [str(corpus / "sub/d.txt"), str(corpus), f"@{corpus / 'list'}", str(corpus / "sub" / "*" / "*.txt"), "missing.txt"]
+    assert expand_inputs(inputs, "*.txt") == [
+        str(corpus / x) for x in ["sub/d.txt", "a.txt", "b.txt", "c.xml", "sub/deep/e.txt"]] + ["missing.txt"]
+    assert expand_inputs([], "*.txt") == []
+
+
+def test_parser():
+    parser = build_parser()
+    args = parser.parse_args(["rescore-from-xml", "in", "-o", "out.csv"])
+    assert args.inputs == ["in"] and args.pattern == "*.xml" and args.output == "out.csv"
+    # The aliases of one subcommand are not shared with the others
+    assert parser.parse_args(["analyze", "in", "-o", "out.csv"]).pattern == "*.txt"
+    with pytest.raises(SystemExit):
+        parser.parse_args(["analyze-from-xml", "in", "-o", "out.csv"])
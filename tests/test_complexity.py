@@ -0,0 +1,84 @@
+"""
+The bulk complexity counts (`_complexity_counts`) must equal the per-token counts of words, noun phrases and clauses.
+"""
+
+# Standard Library
+import random
+import collections
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc import taassc
+
+POS = ["NOUN", "VERB", "ADJ", "PRON", "PROPN", "AUX", "PUNCT", "SYM", "SPACE", "X"]
+DEPS = ["ROOT", "conj", "ccomp", "relcl", "amod", "det", "prep", "poss", "cc", "nsubj", "nsubjpass", "aux", "dobj", "punct"]
+LEMMAS = ["cat", "-PRON-", "be", "run", "Rome", "quick"]
+
+
+def synthetic_tables(seed, n):
+    rng = random.Random(seed)
+    words = [rng.choice(["Cats", "I", "is", "ran", "Rome", "quickly", ".", "$", " "]) for _ in range(n)]
+    lemmas = [rng.choice(LEMMAS) for _ in range(n)]
+    pos = [rng.choice(POS) for _ in range(n)]
+    deps = [rng.choice(DEPS) for _ in range(n)]
+    heads = [rng.randrange(n) for _ in range(n)]
+    cuts = sorted(set([0, n] + rng.sample(range(1, n), min(3, n - 1))))
+    return taassc.DocTables.from_columns(words, lemmas, pos, ["XX"] * n, deps, heads, list(zip(cuts, cuts[1:])))
+
+
+def token_counts(tables):
+    # Straightforward per-token counts
+    counts = collections.Counter()
+    lemma_text = []
+    for i in range(len(tables)):
+        pos, dep = tables.pos[i], tables.dep[i]
+        children = [x for x in range(len(tables)) if tables.head[x] == i and x != i]
+        child_deps = [tables.dep[x] for x in children]
+        if pos not in ["PUNCT", "SYM", "SPACE", "X"]:
+            counts["wrd_length"] += len(tables.text[i])
+            counts["nwords"] += 1
+            lemma = tables.lower[i] if tables.lemma[i] == "-PRON-" else tables.lemma[i]
+            lemma_text.append(f"{lemma}_{pos}")
+        if pos == "NOUN":
+            counts["np"] += 1
+            counts["np_deps"] += len(children)
+            for x in child_deps:
+                if x in ["relcl", "amod", "det", "prep", "poss", "cc"]:
+                    counts[f"{x}_dep"] += 1
+        if pos == "VERB" and dep != "aux":
+            counts["all_clauses"] += 1
+            if "nsubj" in child_deps or "nsubjpass" in child_deps:
+                counts["finite_clause"] += 1
+                counts["finite_ind_clause" if dep in ["ROOT", "conj"] else "finite_dep_clause"] += 1
+                if dep == "ccomp":
+                    counts["finite_compl_clause"] += 1
+                if dep == "relcl":
+                    counts["finite_relative_clause"] += 1
+            else:
+                counts["nonfinite_clause"] += 1
+            counts["vp_deps"] += len(children)
+    return counts, lemma_text
+
+
+@pytest.mark.parametrize("seed, n", [(0, 1), (1, 2), (2, 10), (3, 200), (4, 1000)])
+def test_complexity_counts(seed, n):
+    tables = synthetic_tables(seed, n)
+    counts = taassc._complexity_counts(tables, lemma_text=True)
+    expected, lemma_text = token_counts(tables)
+    assert counts.pop("lemma_text") == lemma_text
+    assert set(expected) <= set(counts)
+    assert counts == {x: expected[x] for x in counts}
+
+
+@pytest.mark.parametrize("seed, n", [(5, 300)])
+def test_rule_counts(seed, n):
+    # The per-token rules count the same
+    tables = synthetic_tables(seed, n)
+    features = collections.defaultdict(int, lemma_text=[])
+    for i in range(n):
+        for rule in (taassc._wrd_nchar, taassc._noun_phrase_complexity, taassc._clausal_complexity):
+            rule(i, 0, tables, None, features)
+    counts = taassc._complexity_counts(tables)
+    assert counts == {x: features[x] for x in counts}
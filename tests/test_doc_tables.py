@@ -0,0 +1,151 @@
+"""
+The tagging rules read `DocTables` columns: they must tag and count as the rules reading the spaCy tokens did.
+
+The documents are built without a model: from the XML outputs of the repository, and by hand for the edge cases
+(`-PRON-` lemmas, wrap-around of `document[token.i - 1]` on the first token, questions in one sentence of several).
+"""
+
+# Standard Library
+import os
+import glob
+import xml.etree.ElementTree as ET
+
+# Third Party
+import spacy
+import pytest
+from spacy.tokens import Doc
+
+# Local Modules
+import baseline_rules
+from taassc import taassc
+
+XML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "output", "full_data", "xml")
+VOCAB = spacy.blank("en").vocab
+
+
+def xml_doc(filename):
+    words, lemmas, pos, tags, deps, heads = [], [], [], [], [], []
+    for word in ET.parse(filename).iter("word"):
+        words.append(word.findtext("raw"))
+        lemmas.append(word.findtext("lemma"))
+        pos.append(word.findtext("UPOS"))
+        tags.append(word.findtext("POS"))
+        deps.append(word.findtext("DEP"))
+        heads.append(int(word.find("DEP").get("head_id")))
+    return Doc(VOCAB, words=words, lemmas=lemmas, pos=pos, tags=tags, deps=deps, heads=heads)
+
+
+def hand_doc(tokens):
+    # One "word lemma POS tag dep head" string per token
+    words, lemmas, pos, tags, deps, heads = zip(*(x.split() for x in tokens))
+    return Doc(VOCAB, words=list(words), lemmas=list(lemmas), pos=list(pos), tags=list(tags), deps=list(deps), heads=[int(x) for x in heads])
+
+
+HAND_DOCS = {
+    # spaCy 2 pronoun lemmas, "that" complement and "to" clause
+    "pron_lemmas": hand_doc([
+        "I -PRON- PRON PRP nsubj 1", "think think VERB VBP ROOT 1", "that that SCONJ IN mark 4",
+        "he -PRON- PRON PRP nsubj 4", "wanted want VERB VBD ccomp 1", "to to PART TO aux 6",
+        "leave leave VERB VB xcomp 4", ". . PUNCT . punct 1"]),
+    # The token before the first one is the last one (a verb)
+    "wrap_around": hand_doc([
+        "Who who PRON WP nsubj 1", "knows know VERB VBZ ROOT 1", "what what PRON WP dobj 4",
+        "he he PRON PRP nsubj 4", "wants want VERB VBZ ccomp 1"]),
+    # A question, then a sentence that is not one
+    "question": hand_doc([
+        "Where where ADV WRB advmod 3", "did do AUX VBD aux 3", "he he PRON PRP nsubj 3", "go go VERB VB ROOT 3",
+        "? ? PUNCT . punct 3", "I I PRON PRP nsubj 6", "know know VERB VBP ROOT 6", "where where ADV WRB advmod 9",
+        "he he PRON PRP nsubj 9", "went go VERB VBD ccomp 6", ". . PUNCT . punct 6"]),
+}
+DOCS = {**{os.path.basename(x): xml_doc(x) for x in sorted(glob.glob(os.path.join(XML_DIR, "*.xml")))}, **HAND_DOCS}
+
+
+def analyze(rules, document):
+    # The per-token loop of the analysis before the tables, with the given rule functions
+    features = {x: 0 for x in taassc.load_resources()["index_list"]}
+    features["lemma_text"] = []
+    tagged_text = []
+    for sent in document.sents:
+        tagged_text.append([])
+        for words_count, token in enumerate(sent):
+            tokens = {x: None for x in taassc.tag_categories}
+            rules.basic_info(token, tokens)
+            rules.pronoun_analysis(token, tokens, features)
+            rules.advanced_pronoun(token, document, tokens, features)
+            rules.pro_verb(token, tokens, features)
+            rules.contraction_check(token, tokens, features)
+            rules.split_aux_check(token, tokens, features)
+            rules.prep_analysis(token, tokens, features)
+            rules.coordination_analysis(token, words_count, tokens, features)
+            rules.wh_analysis(token, words_count, document, sent, tokens, features)
+            rules.noun_analysis(token, tokens, features)
+            rules.semantic_analysis_noun(token, tokens, features)
+            rules.be_analysis(token, tokens, features)
+            rules.verb_analysis(token, document, tokens, features)
+            rules.passive_analysis(token, tokens, features)
+            rules.semantic_analysis_verb(token, tokens, features)
+            rules.adjective_analysis(token, tokens, features)
+            rules.adverb_analysis(token, words_count, tokens, features)
+            rules.that_analysis(token, document, tokens, features)
+            rules.wrd_nchar(token, features)
+            rules.noun_phrase_complexity(token, features)
+            rules.clausal_complexity(token, features)
+            tagged_text[-1].append(tokens)
+    return features, tagged_text
+
+
+@pytest.mark.parametrize("name", list(DOCS))
+def test_count_tables(name):
+    document = DOCS[name]
+    features, tagged_text = analyze(baseline_rules, document)
+    counts = taassc._count_tables(taassc.DocTables(document), taassc.load_resources()["index_list"], taassc.tag_categories, True)
+    assert counts.pop("tagged_text").to_list() == tagged_text
+    assert counts == features
+
+
+@pytest.mark.parametrize("name", list(DOCS))
+def test_public_rules(name):
+    document = DOCS[name]
+    assert analyze(taassc, document) == analyze(baseline_rules, document)
+
+
+def test_tagged_edge_cases():
+    _, tagged_text = analyze(taassc, HAND_DOCS["wrap_around"])
+    assert tagged_text[0][0]["spec_tag1"] == "wh_clause"
+    _, tagged_text = analyze(taassc, HAND_DOCS["question"])
+    assert tagged_text[0][0]["spec_tag1"] == "wh_question"
+    # Not a question: "where" follows a verb
+    assert tagged_text[1][2]["spec_tag1"] == "wh_clause"
+    features, _ = analyze(taassc, HAND_DOCS["pron_lemmas"])
+    assert features["lemma_text"][0] == "i_PRON"
+
+
+def test_wh_analysis_sentence():
+    # The question flag comes from the sentence passed, not from the sentence of the token
+    document = HAND_DOCS["question"]
+    for sent, expected in [(document[0:5], "wh_question"), (document[0:4], None)]:
+        tokens = {"spec_tag1": None}
+        taassc.wh_analysis(document[0], 0, document, sent, tokens, {x: 0 for x in taassc.load_resources()["index_list"]})
+        assert tokens["spec_tag1"] == expected
+
+
+def test_from_columns():
+    # Saved lemmas are lowercased: proper noun lemmas are restored from their text
+    document = hand_doc([
+        "Maria Maria PROPN NNP nsubj 1", "said say VERB VBD ROOT 1", "that that SCONJ IN mark 4",
+        "Rome Rome PROPN NNP nsubj 4", "is be AUX VBZ ccomp 1", "old old ADJ JJ acomp 4", "? ? PUNCT . punct 1",
+        "Yes yes INTJ UH ROOT 7", ". . PUNCT . punct 7"])
+    tables = taassc.DocTables(document)
+    saved = taassc.DocTables.from_columns(
+        [x.text for x in document], [x.lemma_.lower() for x in document], [x.pos_ for x in document],
+        [x.tag_ for x in document], [x.dep_ for x in document], [x.head.i for x in document],
+        [(x.start, x.end) for x in document.sents])
+    for column in ["text", "lower", "lemma", "lemma_lower", "pos", "tag", "dep", "head", "children", "child_deps", "sents", "question"]:
+        assert getattr(saved, column) == getattr(tables, column), column
+    for column in ["pos_ids", "dep_ids", "lemma_ids", "heads", "lengths"]:
+        assert getattr(saved, column).tolist() == getattr(tables, column).tolist(), column
+    assert tables.question == [True] * 7 + [False] * 2
+    index_list = taassc.load_resources()["index_list"]
+    counts = [taassc._count_tables(x, index_list, taassc.tag_categories, True) for x in (tables, saved)]
+    assert counts[0].pop("tagged_text").to_list() == counts[1].pop("tagged_text").to_list()
+    assert counts[0] == counts[1]
@@ -0,0 +1,140 @@
+"""
+The run manifest (`RunManifest`) must only hash changed files, only skip files whose outputs exist, and let an
+interrupted `LGR_Full` run resume where it stopped.
+
+`LGR_Full` runs without a model: texts are "parsed" into one noun per word.
+"""
+
+# Standard Library
+import os
+import glob
+
+# Third Party
+import spacy
+import pytest
+from spacy.tokens import Doc
+
+# Local Modules
+from taassc import taassc
+from taassc.manifest import RunManifest, settings_key, MANIFEST_FORMAT_VERSION
+
+VOCAB = spacy.blank("en").vocab
+SETTINGS = {"model": "en_core_web_sm", "indices": ["nwords"]}
+
+
+def test_file_state(tmp_path):
+    filename = str(tmp_path / "a.txt")
+    with open(filename, "w") as outf:
+        outf.write("Cats sleep.")
+    with RunManifest(str(tmp_path / "manifest.db")) as manifest:
+        state = manifest.file_state(filename)
+        assert state[1:] == (11, os.stat(filename).st_mtime_ns)
+        manifest.record(filename, state, SETTINGS, {}, ["a.txt", "2"])
+        # Same size and modification time: the recorded hash, even if the content changed
+        with open(filename, "w") as outf:
+            outf.write("Dogs sleep.")
+        os.utime(filename, ns=(state[2], state[2]))
+        assert manifest.file_state(filename) == state
+        # A new modification time: hashed again
+        os.utime(filename, ns=(state[2], state[2] + 1000))
+        new_state = manifest.file_state(filename)
+        assert new_state[0] != state[0] and new_state[1:] == (11, state[2] + 1000)
+        # Same content as another file: same hash
+        other = str(tmp_path / "b.txt")
+        with open(other, "w") as outf:
+            outf.write("Dogs sleep.")
+        assert manifest.file_state(other)[0] == new_state[0]
+
+
+def test_completed(tmp_path):
+    filename = str(tmp_path / "a.txt")
+    outputs = {"xml": str(tmp_path / "a.xml"), "vertical": str(tmp_path / "a.tsv")}
+    for path in [filename, *outputs.values()]:
+        with open(path, "w") as outf:
+            outf.write("Cats sleep.")
+    key = settings_key(SETTINGS)
+    with RunManifest(str(tmp_path / "manifest.db")) as manifest:
+        state = manifest.file_state(filename)
+        assert not manifest.completed(filename, state, key) and manifest.row(filename) is None
+        manifest.record(filename, state, SETTINGS, outputs, ["a.txt", "2"])
+        assert len(manifest) == 1 and manifest.row(filename) == ["a.txt", "2"]
+        assert manifest.completed(filename, state, key)
+        assert not manifest.completed(filename, state, settings_key({**SETTINGS, "indices": ["nwords", "mattr"]}))
+        assert not manifest.completed(filename, ("other hash",) + state[1:], key)
+        # An output is missing
+        os.remove(outputs["vertical"])
+        assert not manifest.completed(filename, state, key)
+        manifest.discard(filename)
+        assert len(manifest) == 0 and manifest.row(filename) is None
+
+
+def test_format_version(tmp_path):
+    path = str(tmp_path / "manifest.db")
+    with RunManifest(path) as manifest:
+        manifest.record(str(tmp_path / "a.txt"), ("hash", 1, 1), SETTINGS, {}, ["a.txt"])
+        manifest.connection.execute(f"PRAGMA user_version = {MANIFEST_FORMAT_VERSION + 1}")
+    # A manifest of another format is reset
+    with RunManifest(path) as manifest:
+        assert len(manifest) == 0
+
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    # The texts analyzed, with one noun per word in place of a parse
+    analyzed = []
+
+    def analysis_many(texts, indices_dict, tag_categories_d, output, as_tuples, **kwargs):
+        for text, filename in texts:
+            analyzed.append(os.path.basename(filename))
+            words = text.split()
+            document = Doc(VOCAB, words=words, lemmas=[x.lower() for x in words], pos=["NOUN"] * len(words), deps=["ROOT"] * len(words), heads=list(range(len(words))))
+            yield taassc.LGR_Doc_Analysis(document, indices_dict, tag_categories_d, output), filename
+
+    monkeypatch.setattr(taassc, "LGR_Analysis_many", analysis_many)
+    monkeypatch.setattr(taassc, "_model_version", lambda model: "1.0")
+    return analyzed
+
+
+def test_resume(tmp_path, analyzed):
+    os.mkdir(tmp_path / "in")
+    for i in range(5):
+        with open(tmp_path / "in" / f"{i}.txt", "w") as outf:
+            outf.write("Cats sleep " * (i + 1))
+    filenames = sorted(glob.glob(str(tmp_path / "in" / "*.txt")))
+    outname = str(tmp_path / "results.csv")
+
+    def interrupt(filename, row, error):
+        if filename == filenames[2]:
+            raise KeyboardInterrupt
+
+    def run(progress=None):
+        analyzed.clear()
+        with RunManifest(str(tmp_path / "manifest.db")) as manifest:
+            assert taassc.LGR_Full(filenames, outname, output=["xml"], outdirname=str(tmp_path), manifest=manifest, progress=progress) == {}
+        return analyzed
+
+    def fresh_run():
+        # The results of an uninterrupted run
+        analyzed.clear()
+        taassc.LGR_Full(filenames, str(tmp_path / "fresh.csv"), output=["xml"], outdirname=str(tmp_path / "fresh"))
+        assert len(analyzed) == 5
+        with open(tmp_path / "fresh.csv") as inf:
+            return inf.read()
+
+    os.mkdir(tmp_path / "fresh")
+    # The files done before the interruption are recorded, the CSV is not written
+    with pytest.raises(KeyboardInterrupt):
+        run(interrupt)
+    assert not os.path.exists(outname) and sorted(os.listdir(tmp_path / "xml")) == ["0.xml", "1.xml", "2.xml"]
+    assert run() == ["3.txt", "4.txt"]
+    with open(outname) as inf:
+        assert inf.read() == fresh_run()
+    assert run() == []
+    # A missing output or a changed file is analyzed again
+    os.remove(tmp_path / "xml" / "1.xml")
+    with open(filenames[3], "a") as outf:
+        outf.write("Dogs")
+    assert run() == ["1.txt", "3.txt"]
+    with open(outname) as inf:
+        assert inf.read() == fresh_run()
+    assert sorted(os.listdir(tmp_path / "xml")) == sorted(os.listdir(tmp_path / "fresh" / "xml"))
@@ -0,0 +1,77 @@
+"""
+The incremental MATTR (`mattr`, `_mattr_codes`) must equal the window-by-window MATTR of `lexical_diversity` to the last
+bit, for short (at most one window) and empty texts too.
+
+`lexical_diversity` is not a dependency: its algorithm is repeated here, and compared with the package when installed.
+"""
+
+# Standard Library
+import random
+
+# Third Party
+import numpy
+import pytest
+
+# Local Modules
+from taassc import taassc
+
+
+def reference_mattr(text, window_length=50):
+    # `lexical_diversity.lex_div.mattr`
+    if len(text) < window_length + 1:
+        return len(set(text)) / len(text) if text else 0
+    sum_ttr = 0
+    denom = 0
+    for x in range(len(text)):
+        small_text = text[x:x + window_length]
+        if len(small_text) < window_length:
+            break
+        denom += 1
+        sum_ttr += len(set(small_text)) / float(window_length)
+    return sum_ttr / denom
+
+
+def random_text(seed, n, n_types):
+    rng = random.Random(seed)
+    return [f"lemma{rng.randrange(n_types)}_{rng.choice(['NOUN', 'VERB'])}" for _ in range(n)]
+
+
+@pytest.mark.parametrize("text, window_length, expected", [
+    ([], 50, 0),
+    (["a_NOUN"], 50, 1),
+    # At most one window: the type-token ratio
+    (["a", "b", "a"], 3, 2 / 3),
+    (["a", "b", "a", "a"], 50, 0.5),
+    # Windows "a b a", "b a c" and "a c a"
+    (["a", "b", "a", "c", "a"], 3, (2 / 3 + 1 + 2 / 3) / 3),
+    (["a", "a", "a", "a"], 2, 0.5),
+    (["a", "b", "c", "d"], 1, 1),
+])
+def test_fixed_values(text, window_length, expected):
+    assert taassc.mattr(text, window_length) == pytest.approx(expected)
+    assert taassc.mattr(text, window_length) == reference_mattr(text, window_length)
+
+
+@pytest.mark.parametrize("n", [0, 1, 10, 49, 50, 51, 52, 100, 1000])
+@pytest.mark.parametrize("n_types", [1, 5, 40, 500])
+def test_reference(n, n_types):
+    text = random_text(n * n_types, n, n_types)
+    expected = reference_mattr(text)
+    assert taassc.mattr(text) == expected
+    # Coded as integers
+    types = {x: i for i, x in enumerate(dict.fromkeys(text))}
+    assert taassc._mattr_codes(numpy.array([types[x] for x in text], dtype=numpy.int64)) == expected
+    assert taassc._mattr_codes(numpy.array([types[x] * 7 + 3 for x in text], dtype=numpy.int64)) == expected
+
+
+@pytest.mark.parametrize("window_length", [1, 2, 7, 50, 200])
+def test_window_lengths(window_length):
+    text = random_text(window_length, 300, 30)
+    assert taassc.mattr(text, window_length) == reference_mattr(text, window_length)
+
+
+def test_lexical_diversity():
+    lex_div = pytest.importorskip("lexical_diversity.lex_div")
+    for n in [1, 30, 50, 51, 400]:
+        text = random_text(n, n, 60)
+        assert taassc.mattr(text) == lex_div.mattr(text)
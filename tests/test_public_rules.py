@@ -0,0 +1,47 @@
+"""
+The public rule functions must work right after `import taassc`, before any analysis has loaded the word lists.
+"""
+
+# Standard Library
+import os
+import sys
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Run in a fresh interpreter: the word lists are loaded once per process
+SCRIPT = """
+import collections
+import spacy
+from spacy.tokens import Doc
+import taassc
+
+doc = Doc(
+    spacy.blank("en").vocab,
+    words=["The", "decision", "was", "made", "quickly"],
+    pos=["DET", "NOUN", "AUX", "VERB", "ADV"],
+    tags=["DT", "NN", "VBD", "VBN", "RB"],
+    lemmas=["the", "decision", "be", "make", "quickly"],
+    deps=["det", "nsubjpass", "auxpass", "ROOT", "advmod"],
+    heads=[1, 3, 3, 3, 3],
+)
+for name, args in [
+        ("noun_analysis", (doc[1],)),
+        ("semantic_analysis_noun", (doc[1],)),
+        ("verb_analysis", (doc[3], doc)),
+        ("semantic_analysis_verb", (doc[3],)),
+        ("adjective_analysis", (doc[4],)),
+        ("adverb_analysis", (doc[4], 4)),
+        ("that_analysis", (doc[0], doc))]:
+    getattr(taassc, name)(*args, {}, collections.defaultdict(int))
+
+tokens = {}
+taassc.semantic_analysis_noun(doc[1], tokens, collections.defaultdict(int))
+assert tokens == {"semantic_tag1": "nn_cognitive"}, tokens
+"""
+
+
+def test_rules_after_import():
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, "-c", SCRIPT], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
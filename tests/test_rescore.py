@@ -0,0 +1,71 @@
+"""
+Rescoring a saved `xml` or `vertical` output (`LGR_Rescore`) must give the indices of the analysis of the same parse.
+
+The documents are built without a model from the XML outputs of the repository, with the lemmas a spaCy parse has
+(lowercase, proper nouns as their text).
+"""
+
+# Standard Library
+import os
+import glob
+import xml.etree.ElementTree as ET
+
+# Third Party
+import spacy
+import pytest
+from spacy.tokens import Doc
+
+# Local Modules
+from taassc import taassc
+
+XML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "output", "full_data", "xml")
+XML_FILES = sorted(glob.glob(os.path.join(XML_DIR, "*.xml")))
+VOCAB = spacy.blank("en").vocab
+
+
+def parsed_doc(filename):
+    words, lemmas, pos, tags, deps, heads = [], [], [], [], [], []
+    for word in ET.parse(filename).iter("word"):
+        words.append(word.findtext("raw"))
+        pos.append(word.findtext("UPOS"))
+        lemmas.append(words[-1] if pos[-1] == "PROPN" and word.findtext("lemma") == words[-1].lower() else word.findtext("lemma"))
+        tags.append(word.findtext("POS"))
+        deps.append(word.findtext("DEP"))
+        heads.append(int(word.find("DEP").get("head_id")))
+    return Doc(VOCAB, words=words, lemmas=lemmas, pos=pos, tags=tags, deps=deps, heads=heads)
+
+
+def save(tag_output, path):
+    if path.endswith(".xml"):
+        taassc.output_xml(tag_output["tagged_text"], path)
+    else:
+        taassc.output_vertical(tag_output["tagged_text"], path, ordered_output="full", header=True)
+
+
+@pytest.mark.parametrize("extension", [".xml", ".tsv", ".tsv.gz"])
+@pytest.mark.parametrize("filename", XML_FILES, ids=os.path.basename)
+def test_round_trip(filename, extension, tmp_path):
+    analysis = taassc.LGR_Doc_Analysis(parsed_doc(filename))
+    path = str(tmp_path / f"saved{extension}")
+    save(analysis, path)
+    rescored = taassc.LGR_Rescore(path, output=True)
+    assert rescored.pop("tagged_text").to_list() == analysis.pop("tagged_text").to_list()
+    assert rescored == analysis
+    # Counts only
+    assert taassc.LGR_Rescore(path) == {x: y for x, y in analysis.items() if x != "lemma_text"}
+
+
+def test_lemma_case(tmp_path):
+    # Lemmas with uppercase letters (other than proper nouns) come back lowercased
+    document = Doc(
+        VOCAB, words=["I", "met", "Ann", "and", "i", "left", "."], lemmas=["I", "meet", "Ann", "and", "i", "leave", "."],
+        pos=["PRON", "VERB", "PROPN", "CCONJ", "PRON", "VERB", "PUNCT"], tags=["PRP", "VBD", "NNP", "CC", "PRP", "VBD", "."],
+        deps=["nsubj", "ROOT", "dobj", "cc", "nsubj", "conj", "punct"], heads=[1, 1, 1, 1, 5, 1, 1])
+    analysis = taassc.LGR_Doc_Analysis(document)
+    save(analysis, str(tmp_path / "saved.xml"))
+    rescored = taassc.LGR_Rescore(str(tmp_path / "saved.xml"), output=True)
+    assert analysis["lemma_text"] == ["I_PRON", "meet_VERB", "Ann_PROPN", "and_CCONJ", "i_PRON", "leave_VERB"]
+    assert rescored["lemma_text"] == ["i_PRON", "meet_VERB", "Ann_PROPN", "and_CCONJ", "i_PRON", "leave_VERB"]
+    assert rescored.pop("tagged_text").to_list() == analysis.pop("tagged_text").to_list()
+    # "I_PRON" and "i_PRON" are one lemma for `mattr`
+    assert {x for x in analysis if analysis[x] != rescored[x]} == {"lemma_text", "mattr"}
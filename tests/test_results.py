@@ -0,0 +1,144 @@
+"""
+The results writers must write what the `csv` module would (`csv_line`, `CsvResults`), store the CSV rows with the column
+types in Parquet and Arrow IPC files (`ColumnarResults`), and turn tagged texts into token tables (`tagged_table`).
+"""
+
+# Standard Library
+import io
+import csv
+import random
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc import taassc
+from taassc.tagged import TaggedText
+from taassc.results import csv_line, open_results, tagged_table, write_table, CsvResults, ColumnarResults
+from test_tagged import tagged_text
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet  # noqa: E402
+
+
+def csv_module_line(fields):
+    outf = io.StringIO()
+    csv.writer(outf).writerow(fields)
+    return outf.getvalue()[:-2]
+
+
+@pytest.mark.parametrize("fields", [
+    [], [""], ["", ""], ["a"], ["text.txt", "12", "0.5"], ["a,b", "c"], ['say "hi"', '"'], ["line\nbreak", "\r", "a\r\nb"],
+    [" spaced ", "tab\t", "semi;colon", "'quote'"], ["", "x", ""], [",", '""', "\n"],
+])
+def test_csv_line(fields):
+    assert csv_line(fields) == csv_module_line(fields)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_csv_line_random(seed):
+    rng = random.Random(seed)
+    for _ in range(2000):
+        fields = ["".join(rng.choice('ab1.,"\n\r \t') for _ in range(rng.randrange(5))) for _ in range(rng.randrange(1, 6))]
+        assert csv_line(fields) == csv_module_line(fields), fields
+
+
+ROWS = [
+    ["a,b.txt", "12", "0.1", "1e-300", "0"],
+    ['say "hi".txt', "0", "0.30000000000000004", "-2.5", "nan"],
+    ["line\nbreak.txt", "3", "1", "123456789.123", "inf"],
+]
+COLUMNS = ["filename", "nwords", "mattr", "wrd_length", "mlc"]
+
+
+def test_csv_results(tmp_path):
+    outname = str(tmp_path / "results.csv")
+    with open_results(outname, COLUMNS) as outf:
+        assert isinstance(outf, CsvResults)
+        for row in ROWS:
+            outf.write(row)
+    with open(outname, newline="") as inf:
+        content = inf.read()
+    assert not content.endswith("\n")
+    assert list(csv.reader(io.StringIO(content))) == [COLUMNS] + ROWS
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".arrow", ".feather", ".PARQUET"])
+def test_columnar_results(extension, tmp_path):
+    outname = str(tmp_path / f"results{extension}")
+    with open_results(outname, COLUMNS + ["mode"], row_group_size=2) as outf:
+        assert isinstance(outf, ColumnarResults)
+        for row in ROWS:
+            outf.write(row + ["12"])
+    if extension.lower() == ".parquet":
+        parquet_file = pyarrow.parquet.ParquetFile(outname)
+        assert parquet_file.metadata.num_row_groups == 2
+        table = parquet_file.read()
+    else:
+        with pa.ipc.open_file(outname) as reader:
+            assert reader.num_record_batches == 2
+            table = reader.read_all()
+    assert table.schema.types == [pa.string(), pa.int64(), pa.float64(), pa.float64(), pa.float64(), pa.string()]
+    columns = table.to_pydict()
+    assert columns["filename"] == [x[0] for x in ROWS] and columns["mode"] == ["12"] * 3
+    assert columns["nwords"] == [12, 0, 3]
+    # Floats round-trip exactly
+    for i, name in enumerate(COLUMNS[2:], 2):
+        assert [repr(x) for x in columns[name]] == [repr(float(row[i])) for row in ROWS]
+
+
+def test_columnar_errors(tmp_path):
+    with pytest.raises(ValueError):
+        with open_results(str(tmp_path / "results.parquet"), COLUMNS) as outf:
+            outf.write(["a.txt", "1.5", "0.1", "0.2", "0.3"])
+    # The rows written before are kept
+    with open_results(str(tmp_path / "results.arrow"), COLUMNS, row_group_size=1) as outf:
+        outf.write(ROWS[0])
+        with pytest.raises(ValueError):
+            outf.write(["a.txt", "1", "not a number", "0", "0"])
+    with pa.ipc.open_file(str(tmp_path / "results.arrow")) as reader:
+        assert reader.read_all().column("filename").to_pylist() == [ROWS[0][0]]
+
+
+def expected_rows(text, columns):
+    return [
+        {"sent_id": sent_id, **{x: int(token[x]) if x in ("idx", "head idx") else token.get(x) for x in columns}}
+        for sent_id, sent in enumerate(text.to_list()) for token in sent
+    ]
+
+
+@pytest.mark.parametrize("columns", [taassc.VERTICAL_COLUMNS["full"], taassc.VERTICAL_COLUMNS["simple"], ["word", "other_tag", "head"]])
+def test_tagged_table(columns):
+    text = tagged_text(list(taassc.tag_categories))
+    table = tagged_table(text, columns)
+    assert table.column_names == ["sent_id"] + columns
+    assert table.to_pylist() == expected_rows(text, columns)
+    # From the list of dicts
+    assert tagged_table(text.to_list(), columns).to_pylist() == table.to_pylist()
+    types = dict(zip(table.column_names, table.schema.types))
+    assert types["sent_id"] == pa.int32()
+    for name in columns:
+        if name in ("idx", "head idx"):
+            assert types[name] == pa.int32()
+        elif name in ("pos", "tag", "dep_rel") or name in taassc.tag_categories:
+            assert pa.types.is_dictionary(types[name]), name
+        else:
+            assert types[name] == pa.string(), name
+
+
+def test_tagged_table_document(tmp_path):
+    text = tagged_text(list(taassc.tag_categories))
+    columns = taassc.VERTICAL_COLUMNS["full"]
+    table = tagged_table(text, columns, "doc.txt")
+    assert table.column_names[0] == "document" and table.column("document").to_pylist() == ["doc.txt"] * 6
+    for name in ["tokens.parquet", "tokens.arrow"]:
+        write_table(table, str(tmp_path / name))
+    assert pyarrow.parquet.read_table(str(tmp_path / "tokens.parquet")).to_pylist() == table.to_pylist()
+    with pa.ipc.open_file(str(tmp_path / "tokens.arrow")) as reader:
+        assert reader.read_all().equals(table)
+    # `output_table` writes the full columns
+    taassc.output_table(text, str(tmp_path / "output.parquet"), "doc.txt")
+    assert pyarrow.parquet.read_table(str(tmp_path / "output.parquet")).to_pylist() == table.to_pylist()
+    # An empty text
+    assert tagged_table(TaggedText([], [], [], [], [], [], [], taassc.tag_categories), columns).num_rows == 0
+    assert tagged_table([], columns).num_rows == 0
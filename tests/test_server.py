@@ -0,0 +1,168 @@
+"""
+The server must collect requests into micro-batches (`MicroBatcher`), fall back to analyzing the texts of a failed
+batch one by one, and answer invalid requests and failed texts with the right status (`_Handler`).
+
+The analysis is a stub counting the words of the texts, so no model is loaded.
+"""
+
+# Standard Library
+import json
+import time
+import threading
+import urllib.error
+import urllib.request
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc import server
+
+
+class StubAnalysis:
+    """
+    Stand-in for `LGR_Analysis_many` and `LGR_Analysis`: texts containing "bad" fail, texts containing "block" wait
+    for `release`.
+    """
+    def __init__(self) -> None:
+        self.batches = []
+        self.single = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    @staticmethod
+    def result(text):
+        if "bad" in text:
+            raise ValueError(f"Cannot analyze '{text}'")
+        return {"nwords": len(text.split())}
+
+    def many(self, texts, output, batch_size, as_tuples, **kwargs):
+        texts = list(texts)
+        self.batches.append([text for text, _ in texts])
+        if any("block" in text for text, _ in texts):
+            self.entered.set()
+            self.release.wait(10)
+        for text, context in texts:
+            yield self.result(text), context
+
+    def analysis(self, text, output, **kwargs):
+        self.single.append(text)
+        return self.result(text)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubAnalysis()
+    monkeypatch.setattr(server, "LGR_Analysis_many", stub.many)
+    monkeypatch.setattr(server, "LGR_Analysis", stub.analysis)
+    monkeypatch.setattr(server, "load_model", lambda model, exclude: None)
+    return stub
+
+
+def started(**kwargs):
+    batcher = server.MicroBatcher(**kwargs)
+    batcher.start()
+    return batcher
+
+
+def submit(batcher, texts, results):
+    thread = threading.Thread(target=lambda: results.append(batcher.analyze(texts)))
+    thread.start()
+    return thread
+
+
+def test_max_batch_size(stub):
+    batcher = started(max_batch_size=3, max_wait=0)
+    results = []
+    # The requests queued while a batch is analyzed make the next batches
+    threads = [submit(batcher, ["block"], results)]
+    assert stub.entered.wait(10)
+    threads += [submit(batcher, [f"text {i}"], results) for i in range(5)]
+    while batcher._queue.qsize() < 5:
+        time.sleep(0.001)
+    stub.release.set()
+    for thread in threads:
+        thread.join()
+    batcher.stop()
+    assert [len(x) for x in stub.batches] == [1, 3, 2]
+    assert sorted(x for batch in stub.batches[1:] for x in batch) == [f"text {i}" for i in range(5)]
+    assert sorted(x[0]["nwords"] for x in results) == [1, 2, 2, 2, 2, 2]
+    stats = batcher.stats.snapshot()
+    assert stats["requests"] == stats["texts"] == 6 and stats["batches"] == 3 and stats["mean_batch_size"] == 2
+
+
+def test_max_wait(stub):
+    batcher = started(max_batch_size=10, max_wait=0.5)
+    results = []
+    threads = [submit(batcher, ["one"], results)]
+    time.sleep(0.05)
+    threads.append(submit(batcher, ["two words", "three words here"], results))
+    for thread in threads:
+        thread.join()
+    # A request larger than the batch is analyzed at once
+    assert batcher.analyze(["a"] * 12) == [{"nwords": 1}] * 12
+    batcher.stop()
+    assert stub.batches == [["one", "two words", "three words here"], ["a"] * 12]
+    assert sorted(results, key=len) == [[{"nwords": 1}], [{"nwords": 2}, {"nwords": 3}]]
+
+
+def test_fallback(stub):
+    batcher = server.MicroBatcher(max_wait=0)
+    with pytest.raises(RuntimeError):
+        batcher.analyze(["text"])
+    batcher.start()
+    # Only the texts after the failure are analyzed again, one by one
+    outputs = batcher.analyze(["one", "a bad text", "three words here"], return_errors=True)
+    assert stub.single == ["a bad text", "three words here"]
+    assert outputs[0] == {"nwords": 1} and isinstance(outputs[1], ValueError) and outputs[2] == {"nwords": 3}
+    with pytest.raises(ValueError):
+        batcher.analyze(["one", "bad"])
+    with pytest.raises(TimeoutError):
+        stub.entered.clear()
+        batcher.analyze(["block"], timeout=0.05)
+    stub.release.set()
+    batcher.stop()
+    assert batcher.stats.snapshot()["errors"] == 2
+    with pytest.raises(ValueError):
+        server.MicroBatcher(max_batch_size=0)
+
+
+@pytest.fixture
+def url(stub):
+    batcher = started(max_wait=0)
+    httpd = server.AnalysisServer(("127.0.0.1", 0), batcher)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    batcher.stop()
+
+
+def request(url, data=None):
+    if data is not None and not isinstance(data, bytes):
+        data = json.dumps(data).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_handler(url, monkeypatch):
+    assert request(url + "/health") == (200, {"status": "ok"})
+    assert request(url + "/analyze", {"text": "Cats sleep"}) == (200, {"result": {"nwords": 2}})
+    assert request(url + "/analyze", {"texts": ["Cats sleep", "bad", "One"]}) == (
+        200, {"results": [{"nwords": 2}, {"error": "ValueError: Cannot analyze 'bad'"}, {"nwords": 1}]})
+    assert request(url + "/analyze", {"texts": []}) == (200, {"results": []})
+    # Invalid requests
+    for data in [b"not json", {"other": "key"}, {"texts": "Cats sleep"}, {"texts": ["Cats", 1]}, {"text": 1}, [1, 2]]:
+        status, response = request(url + "/analyze", data)
+        assert status == 400 and response["error"].startswith("Invalid request"), data
+    # A single text that cannot be analyzed
+    assert request(url + "/analyze", {"text": "bad"}) == (422, {"error": "ValueError: Cannot analyze 'bad'"})
+    monkeypatch.setattr(server, "MAX_REQUEST_SIZE", 10)
+    assert request(url + "/analyze", {"text": "Cats sleep"})[0] == 413
+    assert request(url + "/other", {"text": "Cats sleep"})[0] == request(url + "/other")[0] == 404
+    status, stats = request(url + "/stats")
+    assert status == 200 and stats["requests"] == 3 and stats["texts"] == 5 and stats["errors"] == 2
@@ -0,0 +1,90 @@
+"""
+Long texts are split into chunks (`split_text`) whose counts are merged (`_merge_counts`): the chunks must add up to
+the text, and the merged results must be those of a single analysis except in the sentences cut by a chunk boundary.
+"""
+
+# Standard Library
+import random
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc import taassc
+from test_rescore import XML_FILES, parsed_doc
+
+
+@pytest.mark.parametrize("text, max_chars, expected", [
+    ("", 10, [""]),
+    ("Short text.", 11, ["Short text."]),
+    # Paragraph boundaries first, in the second half of the chunk
+    ("One. Two.\n\nThree four five.", 16, ["One. Two.\n\n", "Three four five."]),
+    ("One.\n\nTwo three. Four five six.", 20, ["One.\n\nTwo three. ", "Four five six."]),
+    # Then lines, sentences and words
+    ("One two three\nfour. Five", 16, ["One two three\n", "four. Five"]),
+    # Boundaries in the first half of the chunk are not used
+    ("One two\nthree. Four five", 16, ["One two\nthree. ", "Four five"]),
+    ("One two. Three four", 12, ["One two. ", "Three four"]),
+    ("Don't \"stop.\" Now go", 15, ["Don't \"stop.\" ", "Now go"]),
+    ("One two three four", 10, ["One two ", "three four"]),
+    # No break point
+    ("abcdefghij", 4, ["abcd", "efgh", "ij"]),
+    ("ab cdefghij", 4, ["ab ", "cdef", "ghij"]),
+])
+def test_split_text(text, max_chars, expected):
+    assert taassc.split_text(text, max_chars) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_split_text_random(seed):
+    rng = random.Random(seed)
+    text = "".join(rng.choice(["word", "a", " ", ". ", "\n", "\n\n", "?\" "]) for _ in range(rng.randrange(300)))
+    max_chars = rng.randrange(1, 40)
+    chunks = taassc.split_text(text, max_chars)
+    assert "".join(chunks) == text
+    assert all(len(x) <= max_chars for x in chunks)
+    assert all(x for x in chunks[1:])
+
+
+def test_split_text_invalid():
+    with pytest.raises(ValueError):
+        taassc.split_text("Text.", 0)
+
+
+def merged_analysis(document, cuts):
+    # Count the parts of a document separately, then merge them
+    bounds = [0] + cuts + [len(document)]
+    parts = [
+        taassc._count_tables(taassc.DocTables(document[a:b].as_doc()), taassc.load_resources()["index_list"], taassc.tag_categories, True)
+        for a, b in zip(bounds, bounds[1:])
+    ]
+    return taassc._finish_indices(taassc._merge_counts(parts), True)
+
+
+@pytest.mark.parametrize("filename", XML_FILES)
+def test_merge_sentences(filename):
+    # Chunks made of whole sentences: the results of a single analysis
+    document = parsed_doc(filename)
+    starts = [x.start for x in document.sents][1:]
+    single = taassc.LGR_Doc_Analysis(document)
+    for cuts in [starts[:1], starts[::2], starts]:
+        merged = merged_analysis(document, cuts)
+        assert merged.pop("tagged_text").to_list() == single["tagged_text"].to_list()
+        assert merged == {x: y for x, y in single.items() if x != "tagged_text"}
+
+
+@pytest.mark.parametrize("filename", XML_FILES)
+def test_merge_seam(filename):
+    # A chunk boundary inside a sentence: only the tokens of that sentence, and the counts of their dependencies and
+    # tags, can differ
+    document = parsed_doc(filename)
+    cut = len(document) // 2
+    seam = next(x for x in document.sents if x.start <= cut < x.end)
+    single = taassc.LGR_Doc_Analysis(document)
+    merged = merged_analysis(document, [cut])
+    tokens = [[x for sent in y["tagged_text"].to_list() for x in sent] for y in (single, merged)]
+    assert len(tokens[0]) == len(tokens[1]) == len(document)
+    assert tokens[0][:seam.start] == tokens[1][:seam.start] and tokens[0][seam.end:] == tokens[1][seam.end:]
+    assert [x["idx"] for x in tokens[1]] == [str(x) for x in range(len(document))]
+    for index in ["nwords", "wrd_length", "lemma_text", "mattr"]:
+        assert merged[index] == single[index], index
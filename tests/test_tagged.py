@@ -0,0 +1,110 @@
+"""
+`TaggedText` must read as the former list of sentences of per-token dicts.
+"""
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc.tagged import TaggedText, TaggedToken, BASIC_KEYS
+
+CATEGORIES = ["main_tag", "spec_tag1", "semantic_tag1"]
+
+
+def tagged_text(categories=CATEGORIES):
+    # "Cats sleep . I know ." as two sentences
+    text = TaggedText(
+        [(0, 3), (3, 6)], ["Cats", "sleep", ".", "I", "know", "."], ["cat", "sleep", ".", "i", "know", "."],
+        ["NOUN", "VERB", "PUNCT", "PRON", "VERB", "PUNCT"], ["NNS", "VBP", ".", "PRP", "VBP", "."],
+        ["nsubj", "ROOT", "punct", "nsubj", "ROOT", "punct"], [1, 1, 1, 4, 4, 4], categories)
+    text.set_tags(0, {"main_tag": "nn_all", "semantic_tag1": "nn_animate"})
+    text.set_tags(1, {"main_tag": "verb", "spec_tag1": "non_past_tense"})
+    text.set_tags(3, {"main_tag": "pp_all", "spec_tag1": "pp1"})
+    text.set_tags(4, {"main_tag": "verb", "spec_tag1": "non_past_tense", "other_tag": "extra"})
+    return text
+
+
+def expected_list():
+    def token(i, word, lemma, pos, tag, dep, head, head_idx, **tags):
+        return {
+            **{x: None for x in CATEGORIES}, **tags, "word": word, "lemma": lemma, "pos": pos, "tag": tag,
+            "idx": str(i), "dep_rel": dep, "head": head, "head idx": str(head_idx)}
+    return [
+        [
+            token(0, "Cats", "cat", "NOUN", "NNS", "nsubj", "sleep", 1, main_tag="nn_all", semantic_tag1="nn_animate"),
+            token(1, "sleep", "sleep", "VERB", "VBP", "ROOT", "sleep", 1, main_tag="verb", spec_tag1="non_past_tense"),
+            token(2, ".", ".", "PUNCT", ".", "punct", "sleep", 1),
+        ],
+        [
+            token(3, "I", "i", "PRON", "PRP", "nsubj", "know", 4, main_tag="pp_all", spec_tag1="pp1"),
+            token(4, "know", "know", "VERB", "VBP", "ROOT", "know", 4, main_tag="verb", spec_tag1="non_past_tense", other_tag="extra"),
+            token(5, ".", ".", "PUNCT", ".", "punct", "know", 4),
+        ],
+    ]
+
+
+def test_to_list():
+    text = tagged_text()
+    assert text.to_list() == expected_list()
+    assert [[dict(x) for x in sent] for sent in text] == expected_list()
+    assert repr(text) == "<TaggedText: 2 sentences, 6 tokens>"
+
+
+def test_token_views():
+    text = tagged_text()
+    assert len(text) == 2 and len(text[1]) == 3
+    token = text[1][1]
+    assert isinstance(token, TaggedToken)
+    assert token["spec_tag1"] == "non_past_tense" and token["word"] == "know" and token["idx"] == "4"
+    assert list(token) == CATEGORIES + list(BASIC_KEYS) + ["other_tag"]
+    assert "other_tag" in token and "other_tag" not in text[1][0]
+    assert token.get("missing") is None
+    with pytest.raises(KeyError):
+        text[1][0]["other_tag"]
+    assert text[-1][-1]["word"] == "."
+    assert [x["word"] for x in text[0][1:]] == ["sleep", "."]
+    assert [len(x) for x in text[0:2]] == [3, 3]
+
+
+def test_columnar_storage():
+    text = tagged_text()
+    # One code per distinct tag, shared by the categories
+    assert text.tag_names == [None, "nn_all", "nn_animate", "verb", "non_past_tense", "pp_all", "pp1"]
+    assert list(text._columns["main_tag"]) == [1, 3, 0, 5, 3, 0]
+    assert text._extra == {4: {"other_tag": "extra"}}
+    # Setting a tag again replaces it
+    text.set_tags(2, {"spec_tag1": "pp1"})
+    text.set_tags(2, {"spec_tag1": None})
+    assert text[0][2]["spec_tag1"] is None
+
+
+def test_concatenate():
+    text = tagged_text()
+    other = TaggedText([(0, 2)], ["Dogs", "bark"], ["dog", "bark"], ["NOUN", "VERB"], ["NNS", "VBP"], ["nsubj", "ROOT"], [1, 1], CATEGORIES)
+    other.set_tags(0, {"main_tag": "nn_all", "spec_tag1": "nominalization"})
+    other.set_tags(1, {"other_tag": "more"})
+    merged = TaggedText.concatenate([text, other])
+    assert merged.sents == [(0, 3), (3, 6), (6, 8)]
+    tail = [dict(x) for x in merged[2]]
+    assert tail[0]["idx"] == "6" and tail[0]["head idx"] == "7" and tail[0]["head"] == "bark"
+    assert tail[0]["spec_tag1"] == "nominalization" and tail[1]["other_tag"] == "more"
+    assert merged.to_list()[:2] == expected_list()
+    assert TaggedText.concatenate([]).to_list() == []
+
+
+def test_outputs(tmp_path):
+    # The writers give the same output for a `TaggedText` and for its list of dicts
+    from taassc import taassc
+    from taassc.server import json_result
+
+    text = tagged_text(list(taassc.tag_categories))
+    for name, write in [
+            ("vertical_full.tsv", lambda x, y: taassc.output_vertical(x, y, "full", header=True)),
+            ("vertical_simple.tsv", lambda x, y: taassc.output_vertical(x, y)),
+            ("tagged.xml", lambda x, y: taassc.output_xml(x, y))]:
+        write(text, str(tmp_path / f"columns_{name}"))
+        write(text.to_list(), str(tmp_path / f"list_{name}"))
+        assert (tmp_path / f"columns_{name}").read_bytes() == (tmp_path / f"list_{name}").read_bytes(), name
+    assert taassc.sent_exampler(text, "pp1") == taassc.sent_exampler(text.to_list(), "pp1") == ["I <--pp1<<< know ."]
+    assert json_result({"nwords": 4, "tagged_text": tagged_text(), "lemma_text": ["cat_NOUN"]}, tagged=True) == {
+        "nwords": 4, "lemma_text": ["cat_NOUN"], "tagged_text": expected_list()}
@@ -0,0 +1,114 @@
+"""
+The tag index (`TagIndex`) must find the sentences carrying tags and mark them up as `sent_exampler` does.
+"""
+
+# Standard Library
+import os
+import sqlite3
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc import taassc
+from taassc.tagged import TaggedText
+from taassc.tagindex import TagIndex, TAG_INDEX_FORMAT_VERSION
+
+
+def tagged_text(words=("Cats", "sleep", ".", "I", "know", ".", "We", "know", "them", ".")):
+    # Three sentences: pronouns in the last two, `pp1` twice in the last one
+    text = TaggedText(
+        [(0, 3), (3, 6), (6, 10)], list(words), [x.lower() for x in words],
+        ["NOUN", "VERB", "PUNCT", "PRON", "VERB", "PUNCT", "PRON", "VERB", "PRON", "PUNCT"], ["XX"] * 10,
+        ["nsubj", "ROOT", "punct", "nsubj", "ROOT", "punct", "nsubj", "ROOT", "dobj", "punct"],
+        [1, 1, 1, 4, 4, 4, 7, 7, 7, 7], taassc.tag_categories)
+    text.set_tags(0, {"main_tag": "nn_all"})
+    text.set_tags(1, {"main_tag": "verb", "spec_tag1": "non_past_tense"})
+    text.set_tags(3, {"main_tag": "pp_all", "spec_tag1": "pp1"})
+    text.set_tags(4, {"main_tag": "verb", "spec_tag1": "non_past_tense"})
+    text.set_tags(6, {"main_tag": "pp_all", "spec_tag1": "pp1"})
+    # The same tag in two categories marks the token once
+    text.set_tags(7, {"main_tag": "verb", "spec_tag1": "non_past_tense", "spec_tag2": "verb"})
+    text.set_tags(8, {"main_tag": "pp_all", "spec_tag1": "pp1"})
+    return text
+
+
+@pytest.fixture
+def index(tmp_path):
+    with TagIndex(str(tmp_path / "tags.db")) as index:
+        index.add("a", tagged_text())
+        index.add("b", tagged_text().to_list()[:2])
+        yield index
+
+
+def test_add(index, tmp_path):
+    assert len(index) == 2 and "a" in index and "c" not in index
+    assert index.tag_counts() == {"nn_all": 2, "non_past_tense": 5, "pp1": 4, "pp_all": 4, "verb": 5}
+    # Adding a document again replaces it
+    index.add("b", tagged_text().to_list()[:1])
+    assert index.tag_counts()["pp1"] == 3
+    index.remove("b")
+    index.remove("missing")
+    assert len(index) == 1 and index.tag_counts()["pp1"] == 3
+    index.close()
+    # The index is kept
+    with TagIndex(str(tmp_path / "tags.db")) as reopened:
+        assert len(reopened) == 1 and reopened.query(["nn_all"]) == [("a", 0, "Cats <--nn_all<<< sleep .")]
+
+
+def test_queries(index):
+    assert index.query(["pp1"]) == [
+        ("a", 1, "I <--pp1<<< know ."), ("a", 2, "We <--pp1<<< know them <--pp1<<< ."), ("b", 1, "I <--pp1<<< know .")]
+    assert index.query(["nn_all", "pp1"]) == []
+    assert index.query(["pp1", "verb"]) == [
+        ("a", 1, "I <--pp1<<< know <--verb<<< ."), ("a", 2, "We <--pp1<<< know <--verb<<< them <--pp1<<< ."),
+        ("b", 1, "I <--pp1<<< know <--verb<<< .")]
+    # The sentences with any of the tags, once each and in order
+    assert [x[:2] for x in index.query(["pp1", "nn_all", "pp_all"], match="any")] == [("a", 0), ("a", 1), ("a", 2), ("b", 0), ("b", 1)]
+    assert index.query(["nn_all", "pp1"], match="any", limit=2) == [
+        ("a", 0, "Cats <--nn_all<<< sleep ."), ("a", 1, "I <--pp1<<< know .")]
+    assert index.query(["pp1", "pp1"]) == index.query(["pp1"])
+    assert index.query(["missing"]) == index.query([]) == []
+    with pytest.raises(ValueError):
+        index.query(["pp1"], match="some")
+
+
+@pytest.mark.parametrize("tag", ["nn_all", "verb", "non_past_tense", "pp1", "missing"])
+def test_sent_exampler(index, tag):
+    text = tagged_text()
+    assert index.examples([tag]) == taassc.sent_exampler(text, tag) + taassc.sent_exampler(text.to_list()[:2], tag)
+
+
+def test_add_files(tmp_path, monkeypatch):
+    filenames = [str(tmp_path / "a.xml"), str(tmp_path / "b.tsv")]
+    taassc.output_xml(tagged_text(), filenames[0])
+    taassc.output_vertical(tagged_text(), filenames[1], ordered_output="full", header=True)
+    read = []
+    read_tagged = taassc.read_tagged
+    monkeypatch.setattr(taassc, "read_tagged", lambda x: read.append(x) or read_tagged(x))
+    with TagIndex(str(tmp_path / "tags.db")) as index:
+        assert index.add_files(filenames) == {}
+        assert read == filenames and os.path.abspath(filenames[1]) in index
+        assert [x[0] for x in index.query(["pp1"])] == [os.path.abspath(filenames[0])] * 2 + [os.path.abspath(filenames[1])] * 2
+        # Unchanged files are skipped, changed ones indexed again
+        assert index.add_files(filenames) == {}
+        assert len(read) == 2
+        taassc.output_xml(tagged_text(("Dogs", "sleep", ".", "I", "know", ".", "We", "know", "them", ".")), filenames[0])
+        missing = str(tmp_path / "missing.xml")
+        failed = index.add_files(filenames + [missing])
+        assert read == filenames + filenames[:1]
+        assert list(failed) == [missing] and failed[missing].startswith("FileNotFoundError")
+        # The document indexed again comes last
+        assert index.examples(["nn_all"]) == ["Cats <--nn_all<<< sleep .", "Dogs <--nn_all<<< sleep ."]
+
+
+def test_format_version(tmp_path):
+    path = str(tmp_path / "tags.db")
+    with TagIndex(path) as index:
+        index.add("a", tagged_text())
+    connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA user_version = {TAG_INDEX_FORMAT_VERSION + 1}")
+    connection.close()
+    # An index of another format is rebuilt
+    with TagIndex(path) as index:
+        assert len(index) == 0 and index.tag_counts() == {}
@@ -0,0 +1,90 @@
+"""
+The streamed XML output (`_write_xml`) must be byte-identical to the former `prettify(output_xml(list_text))` output,
+and be read back by `calcFromXml`.
+"""
+
+# Standard Library
+import os
+import glob
+import collections
+
+# Third Party
+import pytest
+
+# Local Modules
+from taassc import taassc
+from taassc.tagged import TaggedText
+
+XML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "output", "full_data", "xml")
+XML_FILES = sorted(glob.glob(os.path.join(XML_DIR, "*.xml")))
+
+
+def saved_tagged_text(filename):
+    # Tag the token columns of a saved output again
+    columns, sents, _ = taassc._read_xml_tokens(filename)
+    tables = taassc.DocTables.from_columns(*columns, sents)
+    return taassc._count_tables(tables, taassc.load_resources()["index_list"], taassc.tag_categories, True)["tagged_text"]
+
+
+def special_tagged_text():
+    # Characters escaped in text and attributes, line ends, and an empty sentence
+    words = ["Tom", "&", "Jerry", "<said>", '"hi"', "\n", "a\r\nb", "'>'"]
+    text = TaggedText(
+        [(0, 5), (5, 5), (5, 8)], words, [x.lower() for x in words], ["PROPN", "CCONJ", "PROPN", "VERB", "INTJ", "SPACE", "X", "PUNCT"],
+        ["NNP", "CC", "NNP", "VBD", "UH", "_SP", "XX", "''"], ["nsubj", "cc", "conj", "ROOT", "dobj", "dep", "dep", "punct"],
+        [3, 0, 0, 3, 3, 3, 3, 3], taassc.tag_categories)
+    text.set_tags(0, {"main_tag": "nn_all", "semantic_tag1": 'a&b<"c">'})
+    text.set_tags(3, {"main_tag": "verb", "spec_tag1": "past_tense"})
+    return text
+
+
+def old_xml(list_text):
+    return taassc.prettify(taassc.output_xml(list_text))
+
+
+@pytest.mark.parametrize("filename", XML_FILES, ids=os.path.basename)
+def test_saved_outputs(filename, tmp_path):
+    text = saved_tagged_text(filename)
+    taassc.output_xml(text, str(tmp_path / "new.xml"))
+    assert (tmp_path / "new.xml").read_text() == old_xml(text)
+    # The repository outputs were written by the former path
+    with open(filename) as inf:
+        assert (tmp_path / "new.xml").read_text() == inf.read()
+
+
+@pytest.mark.parametrize("list_text", [special_tagged_text(), []], ids=["special", "empty"])
+def test_special_text(list_text, tmp_path):
+    taassc.output_xml(list_text, str(tmp_path / "new.xml"))
+    assert (tmp_path / "new.xml").read_bytes() == old_xml(list_text).encode()
+
+
+def test_calc_from_xml(tmp_path):
+    text = special_tagged_text()
+    taassc.output_xml(text, str(tmp_path / "new.xml"))
+    counts = taassc.calcFromXml(str(tmp_path / "new.xml"))
+    assert counts["nwords"] == 5
+    assert counts["nn_all"] == counts["verb"] == counts["past_tense"] == 1
+    for filename in XML_FILES:
+        text = saved_tagged_text(filename)
+        # Only the `LGR_ATTR_LIST` categories are written
+        expected = collections.Counter(token[x] for sent in text for token in sent for x in taassc.LGR_ATTR_LIST if token[x])
+        taassc.output_xml(text, str(tmp_path / "saved.xml"))
+        counts = taassc.calcFromXml(str(tmp_path / "saved.xml"))
+        assert {x: y for x, y in counts.items() if x != "nwords" and y} == dict(expected)
+        columns, _, _ = taassc._read_xml_tokens(str(tmp_path / "saved.xml"))
+        assert columns[0] == text.words
+
+
+def test_failed_writes(tmp_path):
+    # A file that cannot be opened raises its own error
+    with pytest.raises(FileNotFoundError):
+        taassc.output_xml(special_tagged_text(), str(tmp_path / "missing" / "new.xml"))
+    # A failed write leaves the previous file, and no temporary file
+    outname = tmp_path / "new.xml"
+    outname.write_text("previous")
+    text = special_tagged_text()
+    text.words[1] = "\x00"
+    with pytest.raises(ValueError):
+        taassc.output_xml(text, str(outname))
+    assert os.listdir(tmp_path) == ["new.xml"]
+    assert outname.read_text() == "previous"